@@ -0,0 +1,3 @@
+from purchasing_manager import create_asgi_app
+
+app = create_asgi_app()
@@ -0,0 +1,141 @@
+"""Per-request cost of the logging pipeline.
+
+Sends the same requests through the Flask test client in one subprocess per mode, with stdout written to a file:
+
+- disabled: logging turned off, the baseline
+- sync: handlers writing to stdout in the request thread, as before the log queue
+- queue: records formatted in the request thread and written to stdout by the QueueListener thread
+- sampled: the queue, keeping the request and response logs of --sample-rate of the requests
+
+The overhead of a mode is its time per request minus the one of the disabled mode. The queue modes also report
+how long the listener took to write the remaining records after the last request. Run it from the ``src``
+directory:
+
+    python -m benchmarks.logging_overhead --clients 1000 --requests 5000 --output logging.json
+"""
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.throughput import SCENARIOS, SRC_PATH, seed_database
+
+MODES = {
+    "disabled": dict(LOGS_QUEUE_ENABLED="false"),
+    "sync": dict(LOGS_QUEUE_ENABLED="false"),
+    "queue": dict(LOGS_QUEUE_ENABLED="true"),
+    "sampled": dict(LOGS_QUEUE_ENABLED="true"),
+}
+
+
+def run_mode(mode: str, ids: list[str], requests: int, scenarios: list[str]) -> dict:
+    from purchasing_manager import create_app
+    from purchasing_manager.logs import stop_pipelines
+
+    app = create_app()
+    client = app.test_client()
+
+    if mode == "disabled":
+        logging.disable(logging.CRITICAL)
+
+    results = {}
+
+    for scenario in scenarios:
+        paths = [SCENARIOS[scenario](ids) for _ in range(requests)]
+
+        for path in paths[:200]:
+            client.get(path)
+
+        started = time.perf_counter()
+
+        for path in paths:
+            client.get(path)
+
+        elapsed = time.perf_counter() - started
+        results[scenario] = dict(us_per_request=round(elapsed / requests * 1_000_000, 1))
+
+    started = time.perf_counter()
+    stop_pipelines()
+    results["drain_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+    return results
+
+
+def _run_child(mode: str, env: dict, args: argparse.Namespace, ids_path: str, directory: str) -> dict:
+    result_path = os.path.join(directory, f"{mode}.json")
+    command = [sys.executable, "-m", "benchmarks.logging_overhead", "--run", mode, "--ids", ids_path]
+    command += ["--result", result_path, "--requests", str(args.requests), "--scenarios", *args.scenarios]
+
+    with open(os.path.join(directory, f"{mode}.log"), "w") as stdout:
+        subprocess.run(command, cwd=SRC_PATH, env=env, stdout=stdout, check=True)
+
+    with open(result_path) as file:
+        return json.load(file)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=1000, help="Number of seeded clients")
+    parser.add_argument("--requests", type=int, default=5000, help="Requests of each scenario in each mode")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--sample-rate", type=float, default=0.1, help="Request log sample rate of the sampled mode")
+    parser.add_argument("--output", help="Path of the JSON results. Printed to stdout when missing")
+    parser.add_argument("--run", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--ids", help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        with open(args.ids) as file:
+            ids = json.load(file)
+
+        with open(args.result, "w") as file:
+            json.dump(run_mode(args.run, ids, args.requests, args.scenarios), file)
+
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_uri = f"sqlite:///{os.path.join(directory, 'benchmark.db')}"
+        ids_path = os.path.join(directory, "ids.json")
+
+        with open(ids_path, "w") as file:
+            json.dump(seed_database(database_uri, args.clients), file)
+
+        env = {
+            **os.environ,
+            "DEPLOY_ENV": "Production",
+            "SQLALCHEMY_DATABASE_URI": database_uri,
+            "CLIENT_CACHE_MAX_SIZE": "0",
+        }
+        results = {}
+
+        for mode in args.modes:
+            mode_env = {**env, **MODES[mode]}
+
+            if mode == "sampled":
+                mode_env["REQUEST_LOG_SAMPLE_RATE"] = str(args.sample_rate)
+
+            results[mode] = _run_child(mode, mode_env, args, ids_path, directory)
+
+    if "disabled" in results:
+        for mode, result in results.items():
+            for scenario in args.scenarios:
+                overhead = result[scenario]["us_per_request"] - results["disabled"][scenario]["us_per_request"]
+                result[scenario]["overhead_us"] = round(overhead, 1)
+
+    output = json.dumps(dict(config=vars(args), results=results), indent=2)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
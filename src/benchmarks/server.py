@@ -0,0 +1,120 @@
+"""Throughput of the gunicorn worker classes of the production server, gthread and gevent.
+
+Seeds a SQLite database, starts gunicorn with gunicorn.conf.py and --workers processes of each worker class and
+drives it with the load generator of the throughput benchmark. Every statement first sleeps --db-latency
+milliseconds, a stand-in for the round trip to a database on another host: the sleep blocks a gthread thread, while
+a gevent worker serves other requests meanwhile, as it does for psycopg2 queries patched by psycogreen. Run it from
+the ``src`` directory:
+
+    python -m benchmarks.server --workers 2 --concurrency 64 --db-latency 5 --duration 10 --output server.json
+
+Pass --database-uri to load an existing PostgreSQL database instead, with --db-latency 0 for its real latency, and
+--redis-url to serve the client cache from Redis, whose connections are shared by the threads or greenlets of a worker.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.throughput import (
+    SCENARIOS,
+    _free_port,
+    run_load,
+    seed_database,
+    start_server,
+)
+
+SERVERS = {
+    worker_class: [
+        sys.executable,
+        "-m",
+        "gunicorn",
+        "--bind",
+        "127.0.0.1:{port}",
+        "--workers",
+        "{workers}",
+        "benchmarks.server:create_latency_app()",
+    ]
+    for worker_class in ("gthread", "gevent")
+}
+
+
+def create_latency_app():
+    """The app, with a sleep of BENCHMARK_DB_LATENCY seconds before each statement. It is a gevent sleep in the
+    gevent workers, which are patched by gunicorn.conf.py before this module is imported."""
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    from purchasing_manager import create_app
+
+    latency = float(os.environ.get("BENCHMARK_DB_LATENCY", 0))
+
+    if latency:
+        event.listen(Engine, "before_cursor_execute", lambda *args: time.sleep(latency))
+
+    return create_app()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=10000, help="Number of seeded clients")
+    parser.add_argument("--concurrency", type=int, default=64, help="Number of concurrent keep-alive connections")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds of load for each mode and scenario")
+    parser.add_argument("--workers", type=int, default=2, help="Worker processes of each mode")
+    parser.add_argument("--db-latency", type=float, default=5, help="Milliseconds slept before each statement")
+    parser.add_argument("--database-uri", help="Database to seed and load. A temporary SQLite one when missing")
+    parser.add_argument("--modes", nargs="+", choices=SERVERS, default=list(SERVERS))
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--cache", action="store_true", help="Keep the client cache enabled in the servers")
+    parser.add_argument("--redis-url", help="Redis of the client cache, which is then enabled. In memory when missing")
+    parser.add_argument("--output", help="Path of the JSON results. Printed to stdout when missing")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_uri = args.database_uri or f"sqlite:///{os.path.join(directory, 'benchmark.db')}"
+        ids = seed_database(database_uri, args.clients)
+        env = {
+            **os.environ,
+            "DEPLOY_ENV": "Production",
+            "SQLALCHEMY_DATABASE_URI": database_uri,
+            "BENCHMARK_DB_LATENCY": str(args.db_latency / 1000),
+            "METRICS_MULTIPROCESS_DIR": os.path.join(directory, "metrics"),
+        }
+
+        if args.redis_url:
+            env.update(CLIENT_CACHE_BACKEND="redis", CLIENT_CACHE_REDIS_URL=args.redis_url)
+        elif not args.cache:
+            env["CLIENT_CACHE_MAX_SIZE"] = "0"
+
+        servers = {
+            mode: [arg.replace("{workers}", str(args.workers)) for arg in command] for mode, command in SERVERS.items()
+        }
+        results = {}
+
+        for mode in args.modes:
+            port = _free_port()
+            server = start_server(mode, port, {**env, "SERVER_WORKER_CLASS": mode}, servers)
+
+            try:
+                results[mode] = {
+                    scenario: asyncio.run(run_load(port, SCENARIOS[scenario], ids, args.concurrency, args.duration))
+                    for scenario in args.scenarios
+                }
+            finally:
+                server.terminate()
+                server.wait()
+
+    output = json.dumps(dict(config=vars(args), results=results), indent=2)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
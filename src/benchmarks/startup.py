@@ -0,0 +1,149 @@
+"""Cold start of the app in each serving mode.
+
+Starts one fresh interpreter per run and mode and measures, in the child:
+
+- import_ms: importing the ``purchasing_manager`` package
+- create_app_ms: importing the ``wsgi`` or ``asgi`` module, which creates the app
+- first_request_ms: the first request, a client retrieve, with its lazy imports and connections
+- ready_ms: from the spawn of the interpreter to the end of the first request, the time to first request
+
+The modes are the WSGI app with the lazy startup (wsgi) and without it (wsgi-eager), the ASGI app (asgi) and the
+app loaded by the ``flask`` CLI (cli). The medians of --runs runs are reported, along with the ``-X importtime``
+self time of the --top top level packages imported by each mode. Run it from the ``src`` directory:
+
+    python -m benchmarks.startup --runs 5 --top 15 --output startup.json
+"""
+import argparse
+import importlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.throughput import SCENARIOS, SRC_PATH, seed_database
+
+MODES = {
+    "wsgi": dict(module="wsgi", env={}),
+    "wsgi-eager": dict(module="wsgi", env=dict(LAZY_STARTUP="false")),
+    "asgi": dict(module="asgi", env={}),
+    "cli": dict(module="wsgi", env=dict(FLASK_RUN_FROM_CLI="true")),
+}
+
+
+def run_mode(mode: str, path: str) -> dict:
+    started = time.perf_counter()
+    importlib.import_module("purchasing_manager")
+    imported = time.perf_counter()
+    app = importlib.import_module(MODES[mode]["module"]).app
+    created = time.perf_counter()
+
+    if mode == "asgi":
+        from tests.doubles.asgi import AsgiTestClient
+
+        status = AsgiTestClient(app).get(path).status_code
+    else:
+        status = app.test_client().get(path).status_code
+
+    finished = time.perf_counter()
+
+    return dict(
+        import_ms=round((imported - started) * 1000, 1),
+        create_app_ms=round((created - imported) * 1000, 1),
+        first_request_ms=round((finished - created) * 1000, 1),
+        first_request_status=status,
+        ready_at=time.time(),
+    )
+
+
+def import_breakdown(mode: str, env: dict, top: int) -> dict:
+    """Self time of the modules imported by the mode, summed by top level package, from ``-X importtime``."""
+    command = [sys.executable, "-X", "importtime", "-c", f"import {MODES[mode]['module']}"]
+    process = subprocess.run(command, cwd=SRC_PATH, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    packages = {}
+
+    for line in process.stderr.decode().splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+
+        self_us, _, name = (column.strip() for column in line.removeprefix("import time:").split("|"))
+
+        if self_us.isdigit():
+            package = name.split(".")[0]
+            packages[package] = packages.get(package, 0) + int(self_us)
+
+    ranked = sorted(packages.items(), key=lambda item: item[1], reverse=True)
+
+    return dict(
+        total_ms=round(sum(packages.values()) / 1000, 1),
+        packages=len(packages),
+        top_ms={package: round(self_us / 1000, 1) for package, self_us in ranked[:top]},
+    )
+
+
+def _run_child(mode: str, env: dict, path: str, directory: str) -> dict:
+    result_path = os.path.join(directory, f"{mode}.json")
+    command = [sys.executable, "-m", "benchmarks.startup", "--run", mode, "--path", path, "--result", result_path]
+
+    with open(os.path.join(directory, f"{mode}.log"), "w") as stdout:
+        spawned = time.time()
+        subprocess.run(command, cwd=SRC_PATH, env=env, stdout=stdout, check=True)
+
+    with open(result_path) as file:
+        result = json.load(file)
+
+    result["ready_ms"] = round((result.pop("ready_at") - spawned) * 1000, 1)
+
+    return result
+
+
+def _medians(runs: list[dict]) -> dict:
+    return {
+        key: round(statistics.median(run[key] for run in runs), 1) if key.endswith("_ms") else runs[-1][key]
+        for key in runs[0]
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=100, help="Number of seeded clients")
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts of each mode")
+    parser.add_argument("--top", type=int, default=15, help="Number of packages of the import time breakdown")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--output", help="Path of the JSON results. Printed to stdout when missing")
+    parser.add_argument("--run", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        with open(args.result, "w") as file:
+            json.dump(run_mode(args.run, args.path), file)
+
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_uri = f"sqlite:///{os.path.join(directory, 'benchmark.db')}"
+        path = SCENARIOS["retrieve"](seed_database(database_uri, args.clients))
+        env = {**os.environ, "DEPLOY_ENV": "Production", "SQLALCHEMY_DATABASE_URI": database_uri}
+        env.pop("FLASK_RUN_FROM_CLI", None)
+        results = {}
+
+        for mode in args.modes:
+            mode_env = {**env, **MODES[mode]["env"]}
+            runs = [_run_child(mode, mode_env, path, directory) for _ in range(args.runs)]
+            results[mode] = dict(**_medians(runs), imports=import_breakdown(mode, mode_env, args.top))
+
+    output = json.dumps(dict(config=vars(args), results=results), indent=2)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,430 @@
+"""Benchmark suite of the client repository and the client API.
+
+Seeds a database with --clients clients, then times every ClientRepository method in process and every
+/api/client route through the Flask test client and through a WSGI server started in a subprocess. The data an
+operation needs is built before its timer starts, e.g. the clients removed by the delete benchmarks are inserted
+beforehand, so every iteration does the same work. Run it from the ``src`` directory:
+
+    python -m benchmarks.suite --clients 100000 --output baseline.json
+    python -m benchmarks.suite --clients 100000 --baseline baseline.json --threshold 0.2
+
+With --baseline, the run exits with status 1 when the median time of a benchmark is more than --threshold slower
+than in the baseline. It runs on a temporary SQLite database unless --database-uri is given, e.g. a PostgreSQL
+one. The client table of that database is dropped and seeded again, so it must be a disposable database.
+
+Logging is disabled in the benchmark process and the server output is discarded: the cost of the logs is measured
+by ``benchmarks.logging_overhead``.
+"""
+import argparse
+import csv
+import http.client
+import io
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable
+
+from werkzeug.datastructures import FileStorage
+from werkzeug.test import encode_multipart
+
+from benchmarks.throughput import _free_port, seed_database, start_server
+
+GROUPS = ("repository", "test_client", "wsgi")
+BATCH_SIZE = 100
+FIELDS = ("id", "name")
+
+
+class Benchmark:
+    """An operation timed once per iteration, with the arguments ``prepare`` builds before the timer starts."""
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[Any], Any],
+        prepare: Callable[[int], list] = None,
+        max_iterations: int = None,
+    ):
+        self.name = name
+        self.run = run
+        self.prepare = prepare or (lambda iterations: [None] * iterations)
+        self.max_iterations = max_iterations
+
+    def measure(self, iterations: int, warmup: int, after_each: Callable[[], None]) -> dict:
+        iterations = min(iterations, self.max_iterations or iterations)
+        warmup = min(warmup, iterations)
+        arguments = self.prepare(warmup + iterations)
+        timings = []
+
+        for index, argument in enumerate(arguments):
+            started = time.perf_counter()
+            self.run(argument)
+            elapsed = time.perf_counter() - started
+            after_each()
+
+            if index >= warmup:
+                timings.append(elapsed)
+
+        return _summary(timings)
+
+
+class Dataset:
+    """The seeded clients, and the new clients built for the benchmarks which insert some."""
+
+    def __init__(self, clients: int, ids: list[str]):
+        self.clients = clients
+        self.ids = ids
+        self._next_index = clients
+
+    def random_ids(self, qtd: int) -> list[str]:
+        return [random.choice(self.ids) for _ in range(qtd)]
+
+    def random_documents(self, qtd: int) -> list[str]:
+        return [str(random.randrange(self.clients)).zfill(11) for _ in range(qtd)]
+
+    def random_prefixes(self, qtd: int) -> list[str]:
+        """Three letter prefixes of the current names of random seeded clients, so every search matches."""
+        from sqlalchemy import select
+
+        from purchasing_manager import db
+        from purchasing_manager.domain.models.client import Client
+
+        names = db.session.execute(select(Client.name).where(Client.id.in_(self.ids))).scalars().all()
+
+        return [random.choice(names)[:3].lower() for _ in range(qtd)]
+
+    def new_rows(self, qtd: int) -> list[dict]:
+        from tests.doubles.stub import generate_clients_rows
+
+        rows = generate_clients_rows(qtd, self._next_index)
+        self._next_index += qtd
+
+        return rows
+
+    def existing_rows(self, qtd: int) -> list[dict]:
+        """New values for the clients of distinct random documents, to update them by document."""
+        documents = [str(index).zfill(11) for index in random.sample(range(self.clients), qtd)]
+
+        return [{**row, "document": document} for row, document in zip(self.new_rows(qtd), documents)]
+
+    def inserted_ids(self, qtd: int) -> list[str]:
+        from sqlalchemy import insert
+
+        from purchasing_manager import db
+        from purchasing_manager.domain.models.client import Client
+
+        rows = self.new_rows(qtd)
+        db.session.execute(insert(Client.__table__), rows)
+        db.session.commit()
+
+        return [row["id"] for row in rows]
+
+
+def repository_benchmarks(data: Dataset) -> list[Benchmark]:
+    from purchasing_manager.application.adapters.client import ClientRepository
+    from purchasing_manager.domain.models.client import Client
+
+    def clients(rows: list[dict]) -> list[Client]:
+        return [Client(**row) for row in rows]
+
+    return [
+        Benchmark("list", lambda _: ClientRepository.list(limit=20)),
+        Benchmark("list_fields", lambda _: ClientRepository.list(limit=20, fields=FIELDS)),
+        Benchmark(
+            "list_by_document",
+            lambda document: ClientRepository.list(document=document),
+            data.random_documents,
+        ),
+        Benchmark("list_by_cursor", lambda _: ClientRepository.list_by_cursor(limit=20)),
+        Benchmark("search", ClientRepository.search, data.random_prefixes),
+        Benchmark("stream", lambda _: sum(len(batch) for batch in ClientRepository.stream()), max_iterations=5),
+        Benchmark("retrieve", ClientRepository.retrieve, data.random_ids),
+        Benchmark("retrieve_fields", lambda id: ClientRepository.retrieve(id, FIELDS), data.random_ids),
+        Benchmark("create", ClientRepository.create, lambda n: clients(data.new_rows(n))),
+        Benchmark(
+            "bulk_create",
+            ClientRepository.bulk_create,
+            lambda n: [clients(data.new_rows(BATCH_SIZE)) for _ in range(n)],
+        ),
+        Benchmark("upsert", ClientRepository.upsert, lambda n: clients(data.existing_rows(n))),
+        Benchmark(
+            "bulk_upsert",
+            ClientRepository.bulk_upsert,
+            lambda n: [clients(data.existing_rows(BATCH_SIZE)) for _ in range(n)],
+        ),
+        Benchmark(
+            "update", ClientRepository.update, lambda n: [Client(id=id, name="Updated") for id in data.random_ids(n)]
+        ),
+        Benchmark("delete", ClientRepository.delete, data.inserted_ids),
+        Benchmark(
+            "bulk_delete", ClientRepository.bulk_delete, lambda n: [data.inserted_ids(BATCH_SIZE) for _ in range(n)]
+        ),
+    ]
+
+
+def route_benchmarks(data: Dataset, send: Callable[[tuple], None]) -> list[Benchmark]:
+    """The /api/client routes, sent by ``send`` as (method, path, body, headers) requests."""
+
+    def get(path: str) -> Callable[[int], list]:
+        return lambda n: [("GET", path, None, {})] * n
+
+    def json_request(method: str, path: str, payload) -> tuple:
+        return method, path, json.dumps(payload).encode(), {"Content-Type": "application/json"}
+
+    return [
+        Benchmark("GET /api/client", send, get("/api/client?limit=20")),
+        Benchmark("GET /api/client?fields", send, get(f"/api/client?limit=20&fields={','.join(FIELDS)}")),
+        Benchmark("GET /api/client?cursor", send, get("/api/client?limit=20&cursor=")),
+        Benchmark(
+            "GET /api/client?document",
+            send,
+            lambda n: [("GET", f"/api/client?document={document}", None, {}) for document in data.random_documents(n)],
+        ),
+        Benchmark(
+            "GET /api/client?q",
+            send,
+            lambda n: [("GET", f"/api/client?q={prefix}&limit=20", None, {}) for prefix in data.random_prefixes(n)],
+        ),
+        Benchmark("GET /api/client/export", send, get("/api/client/export"), max_iterations=5),
+        Benchmark(
+            "GET /api/client/<id>",
+            send,
+            lambda n: [("GET", f"/api/client/{id}", None, {}) for id in data.random_ids(n)],
+        ),
+        Benchmark(
+            "GET /api/client/<id>?fields",
+            send,
+            lambda n: [("GET", f"/api/client/{id}?fields={','.join(FIELDS)}", None, {}) for id in data.random_ids(n)],
+        ),
+        Benchmark(
+            "POST /api/client",
+            send,
+            lambda n: [json_request("POST", "/api/client", _payload(row)) for row in data.new_rows(n)],
+        ),
+        Benchmark(
+            "POST /api/client/bulk",
+            send,
+            lambda n: [
+                json_request("POST", "/api/client/bulk", _payloads(data.new_rows(BATCH_SIZE))) for _ in range(n)
+            ],
+        ),
+        Benchmark(
+            "POST /api/client/import",
+            send,
+            lambda n: [_import_request(data.new_rows(BATCH_SIZE)) for _ in range(n)],
+        ),
+        Benchmark(
+            "PUT /api/client/by-document/<document>",
+            send,
+            lambda n: [
+                json_request(
+                    "PUT",
+                    f"/api/client/by-document/{row['document']}",
+                    dict(full_name=row["name"], phone=row["phone"], email=row["email"]),
+                )
+                for row in data.existing_rows(n)
+            ],
+        ),
+        Benchmark(
+            "PUT /api/client/by-document",
+            send,
+            lambda n: [
+                json_request("PUT", "/api/client/by-document", _payloads(data.existing_rows(BATCH_SIZE)))
+                for _ in range(n)
+            ],
+        ),
+        Benchmark(
+            "PATCH /api/client/<id>",
+            send,
+            lambda n: [
+                json_request("PATCH", f"/api/client/{id}", dict(full_name="Updated")) for id in data.random_ids(n)
+            ],
+        ),
+        Benchmark(
+            "DELETE /api/client/<id>",
+            send,
+            lambda n: [("DELETE", f"/api/client/{id}", None, {}) for id in data.inserted_ids(n)],
+        ),
+        Benchmark(
+            "DELETE /api/client",
+            send,
+            lambda n: [json_request("DELETE", "/api/client", data.inserted_ids(BATCH_SIZE)) for _ in range(n)],
+        ),
+    ]
+
+
+def test_client_sender(app) -> Callable[[tuple], None]:
+    client = app.test_client()
+
+    def send(request: tuple) -> None:
+        method, path, body, headers = request
+        response = client.open(path, method=method, data=body, headers=headers)
+        response.get_data()
+        _check_status(request, response.status_code)
+
+    return send
+
+
+def server_sender(port: int) -> Callable[[tuple], None]:
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+
+    def send(request: tuple) -> None:
+        method, path, body, headers = request
+        connection.request(method, path, body, headers)
+        response = connection.getresponse()
+        response.read()
+        _check_status(request, response.status)
+
+        if response.will_close:
+            connection.close()
+
+    return send
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """The benchmarks whose median is more than ``threshold`` slower than the one of the baseline."""
+    regressions = []
+
+    for group, benchmarks in results.items():
+        for name, summary in benchmarks.items():
+            previous = baseline.get(group, {}).get(name)
+
+            if previous and summary["median_ms"] > previous["median_ms"] * (1 + threshold):
+                change = summary["median_ms"] / previous["median_ms"] - 1
+                regressions.append(
+                    f"{group} {name}: {previous['median_ms']} ms -> {summary['median_ms']} ms (+{change:.0%})"
+                )
+
+    return regressions
+
+
+def run(args: argparse.Namespace, database_uri: str) -> dict:
+    ids = seed_database(database_uri, args.clients)
+    logging.disable(logging.CRITICAL)
+
+    from purchasing_manager import create_app, db
+
+    app = create_app()
+    data = Dataset(args.clients, ids)
+    results = {}
+
+    def measure(benchmarks: list[Benchmark]) -> dict:
+        return {
+            benchmark.name: benchmark.measure(args.iterations, args.warmup, db.session.remove)
+            for benchmark in benchmarks
+            if not args.only or any(name in benchmark.name for name in args.only)
+        }
+
+    with app.app_context():
+        if "repository" in args.groups:
+            results["repository"] = measure(repository_benchmarks(data))
+
+        if "test_client" in args.groups:
+            results["test_client"] = measure(route_benchmarks(data, test_client_sender(app)))
+
+        if "wsgi" in args.groups:
+            port = _free_port()
+            env = {**os.environ, "DEPLOY_ENV": "Production", "SQLALCHEMY_DATABASE_URI": database_uri}
+            server = start_server("wsgi", port, env)
+
+            try:
+                results["wsgi"] = measure(route_benchmarks(data, server_sender(port)))
+            finally:
+                server.terminate()
+                server.wait()
+
+        db.engine.dispose()
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=10000, help="Number of seeded clients, e.g. 10000 to 1000000")
+    parser.add_argument("--iterations", type=int, default=200, help="Timed iterations of each benchmark")
+    parser.add_argument("--warmup", type=int, default=20, help="Untimed iterations run before the timed ones")
+    parser.add_argument("--groups", nargs="+", choices=GROUPS, default=list(GROUPS))
+    parser.add_argument("--only", nargs="+", help="Run the benchmarks whose name contains one of these strings")
+    parser.add_argument("--database-uri", help="Disposable database to run on instead of a temporary SQLite one")
+    parser.add_argument("--cache", action="store_true", help="Keep the client cache enabled")
+    parser.add_argument("--baseline", help="Results of a previous run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown of the median, 0.2 is 20%%")
+    parser.add_argument("--output", help="Path of the JSON results. Printed to stdout when missing")
+    args = parser.parse_args()
+
+    if not args.cache:
+        os.environ["CLIENT_CACHE_MAX_SIZE"] = "0"
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_uri = args.database_uri or f"sqlite:///{os.path.join(directory, 'benchmark.db')}"
+        results = run(args, database_uri)
+
+    environment = dict(
+        python=platform.python_version(),
+        platform=platform.platform(),
+        database=database_uri.split(":")[0],
+    )
+    output = json.dumps(dict(config=vars(args), environment=environment, results=results), indent=2)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output)
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file)["results"], args.threshold)
+
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+
+        if regressions:
+            sys.exit(1)
+
+
+def _summary(timings: list[float]) -> dict:
+    timings = sorted(timings)
+
+    return dict(
+        iterations=len(timings),
+        mean_ms=round(statistics.fmean(timings) * 1000, 3),
+        median_ms=round(statistics.median(timings) * 1000, 3),
+        p95_ms=round(timings[int(0.95 * (len(timings) - 1))] * 1000, 3),
+        min_ms=round(timings[0] * 1000, 3),
+        ops_per_second=round(len(timings) / sum(timings), 1),
+    )
+
+
+def _payload(row: dict) -> dict:
+    return dict(full_name=row["name"], document=row["document"], phone=row["phone"], email=row["email"])
+
+
+def _payloads(rows: list[dict]) -> list[dict]:
+    return [_payload(row) for row in rows]
+
+
+def _import_request(rows: list[dict]) -> tuple:
+    file = io.StringIO()
+    writer = csv.DictWriter(file, fieldnames=["full_name", "document", "phone", "email"])
+    writer.writeheader()
+    writer.writerows(_payloads(rows))
+    boundary, body = encode_multipart(
+        {"file": FileStorage(io.BytesIO(file.getvalue().encode()), filename="clients.csv")}
+    )
+
+    return "POST", "/api/client/import", body, {"Content-Type": f"multipart/form-data; boundary={boundary}"}
+
+
+def _check_status(request: tuple, status: int) -> None:
+    if status >= 400:
+        raise RuntimeError(f"{request[0]} {request[1]} returned {status}")
+
+
+if __name__ == "__main__":
+    main()
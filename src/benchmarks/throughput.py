@@ -0,0 +1,223 @@
+"""Throughput comparison between the WSGI and the ASGI serving modes.
+
+Seeds a SQLite database, starts each server in a subprocess and drives it with keep-alive connections from an
+asyncio load generator. Run it from the ``src`` directory:
+
+    python -m benchmarks.throughput --clients 10000 --concurrency 64 --duration 10 --output throughput.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVERS = {
+    "wsgi": [
+        sys.executable,
+        "-c",
+        "import sys; from werkzeug.serving import run_simple; from wsgi import app; "
+        "run_simple('127.0.0.1', int(sys.argv[1]), app, threaded=True)",
+        "{port}",
+    ],
+    "asgi": [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "asgi:app",
+        "--port",
+        "{port}",
+        "--log-level",
+        "warning",
+        "--no-access-log",
+    ],
+}
+SCENARIOS = {
+    "retrieve": lambda ids: f"/api/client/{random.choice(ids)}",
+    "list": lambda ids: "/api/client?limit=20",
+}
+
+
+def seed_database(database_uri: str, clients: int, chunk_size: int = 10000) -> list[str]:
+    """Recreate the tables and insert ``clients`` clients, with the documents 0 to clients - 1, in one transaction.
+    Returns the ids of up to 100 clients of each chunk."""
+    os.environ["DEPLOY_ENV"] = "Production"
+    os.environ["SQLALCHEMY_DATABASE_URI"] = database_uri
+
+    from sqlalchemy import insert
+
+    from purchasing_manager import create_app, db
+    from purchasing_manager.domain.models.client import Client
+    from tests.doubles.stub import generate_clients_rows
+
+    app = create_app()
+    ids = []
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+
+        if db.engine.dialect.name == "sqlite":
+            db.session.execute("PRAGMA synchronous = OFF")
+
+        for start in range(0, clients, chunk_size):
+            rows = generate_clients_rows(min(chunk_size, clients - start), start)
+            db.session.execute(insert(Client.__table__), rows)
+            ids.extend(row["id"] for row in rows[:100])
+
+        db.session.commit()
+        db.engine.dispose()
+
+    return ids
+
+
+def start_server(mode: str, port: int, env: dict, servers: dict = SERVERS) -> subprocess.Popen:
+    command = [arg.format(port=port) for arg in servers[mode]]
+    process = subprocess.Popen(command, cwd=SRC_PATH, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+
+    process.kill()
+    raise RuntimeError(f"The {mode} server did not start on port {port}")
+
+
+async def run_load(port: int, path_factory, ids: list[str], concurrency: int, duration: float) -> dict:
+    latencies, errors = [], 0
+    deadline = time.monotonic() + duration
+
+    async def worker():
+        nonlocal errors
+        connection = None
+
+        while time.monotonic() < deadline:
+            if connection is None:
+                connection = await asyncio.open_connection("127.0.0.1", port)
+
+            started = time.perf_counter()
+
+            try:
+                status, keep_alive = await _request(*connection, path_factory(ids))
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                errors += 1
+                connection = None
+                continue
+
+            latencies.append(time.perf_counter() - started)
+            errors += status != 200
+
+            if not keep_alive:
+                connection[1].close()
+                connection = None
+
+        if connection:
+            connection[1].close()
+
+    started = time.monotonic()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.monotonic() - started
+
+    return _summary(latencies, errors, elapsed)
+
+
+async def _request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, path: str) -> tuple[int, bool]:
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: keep-alive\r\n\r\n".encode())
+    await writer.drain()
+
+    status_line = await reader.readuntil(b"\r\n")
+    headers = {}
+
+    while (line := await reader.readuntil(b"\r\n")) != b"\r\n":
+        key, _, value = line.decode("latin-1").partition(":")
+        headers[key.strip().lower()] = value.strip().lower()
+
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+        keep_alive = headers.get("connection") != "close"
+    else:
+        await reader.read()
+        keep_alive = False
+
+    return int(status_line.split()[1]), keep_alive
+
+
+def _summary(latencies: list[float], errors: int, elapsed: float) -> dict:
+    latencies = sorted(latencies)
+    percentile = lambda value: round(latencies[int(value * (len(latencies) - 1))] * 1000, 3)  # noqa: E731
+
+    return dict(
+        requests=len(latencies),
+        errors=errors,
+        requests_per_second=round(len(latencies) / elapsed, 1),
+        latency_ms=dict(
+            mean=round(statistics.fmean(latencies) * 1000, 3) if latencies else None,
+            p50=percentile(0.5) if latencies else None,
+            p95=percentile(0.95) if latencies else None,
+            p99=percentile(0.99) if latencies else None,
+        ),
+    )
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=10000, help="Number of seeded clients")
+    parser.add_argument("--concurrency", type=int, default=64, help="Number of concurrent keep-alive connections")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds of load for each mode and scenario")
+    parser.add_argument("--modes", nargs="+", choices=SERVERS, default=list(SERVERS))
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--cache", action="store_true", help="Keep the client cache enabled in the servers")
+    parser.add_argument("--output", help="Path of the JSON results. Printed to stdout when missing")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_uri = f"sqlite:///{os.path.join(directory, 'benchmark.db')}"
+        ids = seed_database(database_uri, args.clients)
+        env = {**os.environ, "DEPLOY_ENV": "Production", "SQLALCHEMY_DATABASE_URI": database_uri}
+
+        if not args.cache:
+            env["CLIENT_CACHE_MAX_SIZE"] = "0"
+
+        results = {}
+
+        for mode in args.modes:
+            port = _free_port()
+            server = start_server(mode, port, env)
+
+            try:
+                results[mode] = {
+                    scenario: asyncio.run(run_load(port, SCENARIOS[scenario], ids, args.concurrency, args.duration))
+                    for scenario in args.scenarios
+                }
+            finally:
+                server.terminate()
+                server.wait()
+
+    output = json.dumps(dict(config=vars(args), results=results), indent=2)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Gunicorn settings of the production server, read by ``gunicorn wsgi:app`` run from the ``src`` directory.
+
+The settings come from ``purchasing_manager.server.gunicorn_settings`` and are tuned by the SERVER_* env vars, e.g.
+SERVER_WORKERS=4. With SERVER_WORKER_CLASS=gevent the standard library is patched here, before the app is
+preloaded, and psycopg2 waits for PostgreSQL through the gevent hub, so a worker serves other requests meanwhile.
+SQLite has no cooperative driver and blocks the worker for each statement.
+"""
+import os
+import tempfile
+
+if os.environ.get("SERVER_WORKER_CLASS") == "gevent":
+    from gevent import monkey
+
+    monkey.patch_all()
+
+    from psycogreen.gevent import patch_psycopg
+
+    patch_psycopg()
+
+    # The log listener thread would be a greenlet of the worker thread, so the queue would only add work
+    os.environ.setdefault("LOGS_QUEUE_ENABLED", "false")
+
+# Read by the app config on import, so the metrics endpoint of any worker reports the ones of every worker
+os.environ.setdefault("METRICS_MULTIPROCESS_DIR", os.path.join(tempfile.gettempdir(), "purchasing-manager-metrics"))
+
+from purchasing_manager import server  # noqa: E402
+
+_settings = server.gunicorn_settings(os.environ, server.cpu_count())
+
+bind = _settings["bind"]
+worker_class = _settings["worker_class"]
+workers = _settings["workers"]
+threads = _settings["threads"]
+worker_connections = _settings["worker_connections"]
+preload_app = _settings["preload_app"]
+max_requests = _settings["max_requests"]
+max_requests_jitter = _settings["max_requests_jitter"]
+timeout = _settings["timeout"]
+graceful_timeout = _settings["graceful_timeout"]
+keepalive = _settings["keepalive"]
+
+on_starting = server.on_starting
+when_ready = server.when_ready
+post_fork = server.post_fork
+worker_exit = server.worker_exit
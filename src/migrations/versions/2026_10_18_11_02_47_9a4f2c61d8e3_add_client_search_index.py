@@ -0,0 +1,81 @@
+"""Add client search index
+
+Revision ID: 9a4f2c61d8e3
+Revises: 5c0d8e7a41b2
+Create Date: 2026-10-18 11:02:47.318204
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9a4f2c61d8e3"
+down_revision = "5c0d8e7a41b2"
+branch_labels = None
+depends_on = None
+
+SQLITE_UPGRADE = [
+    "CREATE VIRTUAL TABLE client_search USING fts5("
+    "name, email, content='client', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER client_search_insert AFTER INSERT ON client BEGIN "
+    "INSERT INTO client_search(rowid, name, email) VALUES (new.rowid, new.name, new.email); END",
+    "CREATE TRIGGER client_search_delete AFTER DELETE ON client BEGIN "
+    "INSERT INTO client_search(client_search, rowid, name, email) VALUES ('delete', old.rowid, old.name, old.email); END",
+    "CREATE TRIGGER client_search_update AFTER UPDATE OF name, email ON client BEGIN "
+    "INSERT INTO client_search(client_search, rowid, name, email) VALUES ('delete', old.rowid, old.name, old.email); "
+    "INSERT INTO client_search(rowid, name, email) VALUES (new.rowid, new.name, new.email); END",
+    # Backfill: index the rows already in the client table
+    "INSERT INTO client_search(client_search) VALUES ('rebuild')",
+]
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER client_search_update",
+    "DROP TRIGGER client_search_delete",
+    "DROP TRIGGER client_search_insert",
+    "DROP TABLE client_search",
+]
+POSTGRESQL_UPGRADE = [
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE OR REPLACE FUNCTION client_search_text(name text, email text) RETURNS text AS "
+    "$$ SELECT lower(public.unaccent('public.unaccent'::regdictionary, name || ' ' || email)) $$ "
+    "LANGUAGE sql IMMUTABLE PARALLEL SAFE",
+    # Backfill: adding a stored generated column rewrites the table with the value of every row
+    "ALTER TABLE client ADD COLUMN search text GENERATED ALWAYS AS (client_search_text(name, email)) STORED",
+]
+POSTGRESQL_DOWNGRADE = [
+    "DROP INDEX IF EXISTS ix_client_search",
+    "ALTER TABLE client DROP COLUMN search",
+    "DROP FUNCTION client_search_text(text, text)",
+]
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == "sqlite":
+        for statement in SQLITE_UPGRADE:
+            op.execute(statement)
+    elif dialect == "postgresql":
+        for statement in POSTGRESQL_UPGRADE:
+            op.execute(statement)
+
+        # Built without locking the writes, which needs to run outside of the migration transaction
+        with op.get_context().autocommit_block():
+            op.create_index(
+                "ix_client_search",
+                "client",
+                [sa.text("search gin_trgm_ops")],
+                postgresql_using="gin",
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == "sqlite":
+        for statement in SQLITE_DOWNGRADE:
+            op.execute(statement)
+    elif dialect == "postgresql":
+        for statement in POSTGRESQL_DOWNGRADE:
+            op.execute(statement)
@@ -0,0 +1,42 @@
+"""Add client count
+
+Revision ID: e71b3c9f04a6
+Revises: 9a4f2c61d8e3
+Create Date: 2026-10-18 14:36:05.902117
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e71b3c9f04a6"
+down_revision = "9a4f2c61d8e3"
+branch_labels = None
+depends_on = None
+
+# PostgreSQL counts from the planner estimate, so only SQLite gets a counter
+SQLITE_UPGRADE = [
+    "CREATE TABLE client_count (id INTEGER PRIMARY KEY CHECK (id = 1), total INTEGER NOT NULL)",
+    # Backfill: count the rows already in the client table
+    "INSERT INTO client_count (id, total) SELECT 1, count(*) FROM client",
+    "CREATE TRIGGER client_count_insert AFTER INSERT ON client BEGIN "
+    "UPDATE client_count SET total = total + 1 WHERE id = 1; END",
+    "CREATE TRIGGER client_count_delete AFTER DELETE ON client BEGIN "
+    "UPDATE client_count SET total = total - 1 WHERE id = 1; END",
+]
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER client_count_delete",
+    "DROP TRIGGER client_count_insert",
+    "DROP TABLE client_count",
+]
+
+
+def upgrade():
+    if op.get_bind().dialect.name == "sqlite":
+        for statement in SQLITE_UPGRADE:
+            op.execute(statement)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == "sqlite":
+        for statement in SQLITE_DOWNGRADE:
+            op.execute(statement)
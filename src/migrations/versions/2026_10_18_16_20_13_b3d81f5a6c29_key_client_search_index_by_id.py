@@ -0,0 +1,71 @@
+"""Key client search index by id
+
+Revision ID: b3d81f5a6c29
+Revises: e71b3c9f04a6
+Create Date: 2026-10-18 16:20:13.540382
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b3d81f5a6c29"
+down_revision = "e71b3c9f04a6"
+branch_labels = None
+depends_on = None
+
+# The external content FTS5 table was keyed by the implicit rowid of the client table, which a VACUUM or a copy of
+# the table may renumber. The index now has its own rowids, mapped to the client ids by client_search_key.
+# PostgreSQL indexes a column of the client table, so only SQLite changes.
+SQLITE_UPGRADE = [
+    "DROP TRIGGER client_search_update",
+    "DROP TRIGGER client_search_delete",
+    "DROP TRIGGER client_search_insert",
+    "DROP TABLE client_search",
+    "CREATE TABLE client_search_key (rowid INTEGER PRIMARY KEY, id VARCHAR(36) NOT NULL UNIQUE)",
+    "CREATE VIRTUAL TABLE client_search USING fts5("
+    "name, email, tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER client_search_insert AFTER INSERT ON client BEGIN "
+    "INSERT INTO client_search_key(id) VALUES (new.id); "
+    "INSERT INTO client_search(rowid, name, email) "
+    "SELECT rowid, new.name, new.email FROM client_search_key WHERE id = new.id; END",
+    "CREATE TRIGGER client_search_delete AFTER DELETE ON client BEGIN "
+    "DELETE FROM client_search WHERE rowid = (SELECT rowid FROM client_search_key WHERE id = old.id); "
+    "DELETE FROM client_search_key WHERE id = old.id; END",
+    "CREATE TRIGGER client_search_update AFTER UPDATE OF name, email ON client BEGIN "
+    "UPDATE client_search SET name = new.name, email = new.email "
+    "WHERE rowid = (SELECT rowid FROM client_search_key WHERE id = new.id); END",
+    # Backfill: index the rows already in the client table
+    "INSERT INTO client_search_key(id) SELECT id FROM client",
+    "INSERT INTO client_search(rowid, name, email) "
+    "SELECT client_search_key.rowid, client.name, client.email FROM client "
+    "JOIN client_search_key ON client_search_key.id = client.id",
+]
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER client_search_update",
+    "DROP TRIGGER client_search_delete",
+    "DROP TRIGGER client_search_insert",
+    "DROP TABLE client_search",
+    "DROP TABLE client_search_key",
+    "CREATE VIRTUAL TABLE client_search USING fts5("
+    "name, email, content='client', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER client_search_insert AFTER INSERT ON client BEGIN "
+    "INSERT INTO client_search(rowid, name, email) VALUES (new.rowid, new.name, new.email); END",
+    "CREATE TRIGGER client_search_delete AFTER DELETE ON client BEGIN "
+    "INSERT INTO client_search(client_search, rowid, name, email) VALUES ('delete', old.rowid, old.name, old.email); END",
+    "CREATE TRIGGER client_search_update AFTER UPDATE OF name, email ON client BEGIN "
+    "INSERT INTO client_search(client_search, rowid, name, email) VALUES ('delete', old.rowid, old.name, old.email); "
+    "INSERT INTO client_search(rowid, name, email) VALUES (new.rowid, new.name, new.email); END",
+    "INSERT INTO client_search(client_search) VALUES ('rebuild')",
+]
+
+
+def upgrade():
+    if op.get_bind().dialect.name == "sqlite":
+        for statement in SQLITE_UPGRADE:
+            op.execute(statement)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == "sqlite":
+        for statement in SQLITE_DOWNGRADE:
+            op.execute(statement)
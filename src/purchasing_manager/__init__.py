@@ -1,71 +1,186 @@
 import logging
 import os
 import sys
+from functools import partial
 
-import json_logging
-from flask import Flask, request
-from flask_migrate import Migrate
-from flask_sqlalchemy import SQLAlchemy
+from flask import Flask, g, request
 
+from .async_database import AsyncSQLAlchemy
 from .config import set_app_config
+from .pool import SQLAlchemy
 
 app_path = os.path.dirname(os.path.abspath(__file__))
+async_db = AsyncSQLAlchemy()
 db = SQLAlchemy(session_options={"autoflush": False})
 logger = logging.getLogger("purchasing-manager")
-migrate = Migrate()
 
 
-def create_app() -> Flask:
+def create_app(blueprints: bool = True) -> Flask:
+    """Create the Flask app. ``blueprints=False`` leaves out the Flask-RESTX APIs and their Swagger docs, for the
+    ASGI mode, which routes the requests itself.
+
+    With LAZY_STARTUP, the default, Flask-Migrate and Alembic are only set up for the ``flask`` CLI, which runs the
+    ``flask db`` commands, so the workers don't import them on boot.
+    """
     app = Flask(__name__)
 
     set_app_config(app)
     _set_database_config(app)
+    _set_migrate_config(app)
+    _set_cache_config(app)
+    _set_metrics_config(app)
+    _set_compression_config(app)
     _configure_logger(app)
-    _register_blueprints(app)
+
+    if blueprints:
+        _register_blueprints(app)
+
+    _register_commands(app)
 
     return app
 
 
+def create_asgi_app():
+    from .presentation.asgi import AsgiApp
+
+    return AsgiApp(create_app(blueprints=False))
+
+
+def is_cli() -> bool:
+    """Whether the process was started by the ``flask`` command."""
+    return os.environ.get("FLASK_RUN_FROM_CLI") == "true"
+
+
 def _register_blueprints(app: Flask) -> None:
+    from .presentation.views import openapi
     from .presentation.views.api import health_bp
     from .presentation.views.client import client_bp
 
     app.register_blueprint(health_bp)
     app.register_blueprint(client_bp)
+    openapi.init_app(app)
+
+
+def _register_commands(app: Flask) -> None:
+    from .presentation.commands.client import client_cli
+    from .presentation.commands.openapi import openapi_cli
+
+    app.cli.add_command(client_cli)
+    app.cli.add_command(openapi_cli)
 
 
 def _set_database_config(app: Flask) -> None:
+    from . import routing
+    from .application.adapters import counts, search
+
+    search.install()
+    counts.install()
     db.init_app(app)
-    migrate.init_app(app=app, db=db, directory=os.path.join(app_path, "..", "migrations"))
+    routing.init_app(app)
+    async_db.init_app(app)
+
+
+def _set_migrate_config(app: Flask) -> None:
+    if app.config["LAZY_STARTUP"] and not is_cli():
+        return
+
+    from flask_migrate import Migrate
+
+    from .application.adapters import counts, search
+
+    Migrate(
+        app=app,
+        db=db,
+        directory=os.path.join(app_path, "..", "migrations"),
+        include_object=lambda *args: search.include_object(*args) and counts.include_object(*args),
+    )
+
+
+def _set_cache_config(app: Flask) -> None:
+    from .application.adapters.cache import (
+        ClientCache,
+        CountCache,
+        create_cache_backend,
+    )
+
+    backend = create_cache_backend(app.config)
+    app.extensions["client_cache"] = ClientCache(backend, ttl=app.config["CLIENT_CACHE_TTL"])
+    app.extensions["client_count_cache"] = CountCache(backend, ttl=app.config["CLIENT_COUNT_CACHE_TTL"])
+
+
+def _set_metrics_config(app: Flask) -> None:
+    from . import metrics
+
+    metrics.init_app(app)
+
+
+def _set_compression_config(app: Flask) -> None:
+    from . import compression
+
+    compression.init_app(app)
 
 
 def _configure_logger(app: Flask) -> None:
+    import json_logging
+
+    from .logs import (
+        LazyPropsFilter,
+        LogPipeline,
+        RequestLogSampler,
+        SampledRequestFilter,
+        start_pipeline,
+        stream_handler,
+    )
+    from .metrics import current_request_stats, current_route
+
     if not json_logging.ENABLE_JSON_LOGGING:
         json_logging.init_flask(enable_json=True)
         json_logging.init_request_instrument(app)
 
+        if app.config["LOGS_QUEUE_ENABLED"]:
+            pipeline = LogPipeline(sys.stdout)
+            create_handler = pipeline.handler
+            start_pipeline(pipeline)
+        else:
+            create_handler = partial(stream_handler, sys.stdout)
+
         logger.setLevel(app.config["LOGS_LEVEL"])
-        logger.addHandler(logging.StreamHandler(sys.stdout))
+        logger.addHandler(create_handler(json_logging.JSONLogWebFormatter(), LazyPropsFilter()))
+        json_logging.get_request_logger().handlers = [
+            create_handler(json_logging.JSONRequestLogFormatter(), SampledRequestFilter())
+        ]
+
+    sampler = RequestLogSampler(app.config["REQUEST_LOG_SAMPLE_RATE"], app.config["REQUEST_LOG_SAMPLE_RATES"])
+    app.extensions["request_log_sampler"] = sampler
 
     @app.before_request
     def log_request():
-        logger.info(
-            "Request received",
-            extra={"props": {"path": request.path, "method": request.method}},
-        )
+        g.log_sampled = sampler.sample(current_route())
+
+        if g.log_sampled:
+            logger.info(
+                "Request received",
+                extra={"props": {"path": request.path, "method": request.method}},
+            )
 
     @app.after_request
     def log_response(response):
-        logger = logging.getLogger("purhasing-manager")
-        logger.info(
-            "Request response",
-            extra={
-                "props": {
-                    "path": request.path,
-                    "method": request.method,
-                    "status": response.status_code,
-                }
-            },
-        )
+        if response.status_code >= 500:
+            g.log_sampled = True
+
+        if g.get("log_sampled", True):
+            stats = current_request_stats()
+            logger.info(
+                "Request response",
+                extra={
+                    "props": {
+                        "path": request.path,
+                        "method": request.method,
+                        "status": response.status_code,
+                        "db_time_ms": round(stats.db_time * 1000, 2) if stats else None,
+                        "db_statements": stats.statements if stats else None,
+                    }
+                },
+            )
 
         return response
@@ -0,0 +1,499 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import AsyncIterator, Callable
+
+from flask import current_app
+from sqlalchemy import delete, insert, select, tuple_
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
+
+from purchasing_manager import async_db
+from purchasing_manager.application.adapters.cache import (
+    InMemoryCacheBackend,
+    client_cache,
+    count_cache,
+)
+from purchasing_manager.application.adapters.counts import CAPPED, count_result
+from purchasing_manager.application.adapters.statements import (
+    capped_count_clients_statement,
+    chunks,
+    client_values,
+    count_clients_statement,
+    decode_cursor,
+    encode_cursor,
+    page_limit,
+    search_clients_statement,
+    select_fields,
+    update_client_statement,
+    upsert_clients_statement,
+)
+from purchasing_manager.application.exceptions import (
+    DatabaseException,
+    DuplicateError,
+    InvalidCursorException,
+    InvalidLimitException,
+    InvalidSearchException,
+    NotFoundException,
+)
+from purchasing_manager.domain.models.client import Client
+from purchasing_manager.domain.ports.client import ClientRepositoryABC
+
+logger = logging.getLogger(f"purchasing-manager.{__name__}")
+
+
+class AsyncClientRepository(ClientRepositoryABC):
+    """ClientRepository on top of an AsyncSession. Every method is a coroutine, except stream, which is an
+    async generator."""
+
+    @classmethod
+    async def list(cls, offset: int = 0, limit: int = 100, fields: tuple[str] = None, **kwargs) -> list[Client | Row]:
+        try:
+            logger.info(
+                "Trying to retrieve a list of clients from database",
+                extra={
+                    "props": lambda: {
+                        "table": "client",
+                        "filters": json.dumps(kwargs),
+                        "offset": offset,
+                        "limit": limit,
+                    }
+                },
+            )
+            statement = (select_fields(fields) if fields else select(Client)).filter_by(**kwargs)
+            result = await async_db.session.execute(statement.offset(offset).limit(limit))
+
+            return result.all() if fields else result.scalars().all()
+        except Exception as e:
+            message = "Error when trying to retrieve a list of clients from database"
+            logger.exception(
+                message, extra={"props": {"table": "client", "filters": json.dumps(kwargs), "exception": str(e)}}
+            )
+            raise DatabaseException(message)
+
+    @classmethod
+    async def list_by_cursor(
+        cls, cursor: str = None, limit: int = 100, fields: tuple[str] = None, **kwargs
+    ) -> tuple[list[Client | Row], str]:
+        try:
+            logger.info(
+                "Trying to retrieve a page of clients from database",
+                extra={
+                    "props": lambda: {
+                        "table": "client",
+                        "filters": json.dumps(kwargs),
+                        "cursor": cursor,
+                        "limit": limit,
+                    }
+                },
+            )
+            limit = page_limit(limit)
+            statement = select_fields(dict.fromkeys([*fields, "created_dt", "id"])) if fields else select(Client)
+            statement = statement.filter_by(**kwargs).order_by(Client.created_dt, Client.id)
+
+            if cursor:
+                statement = statement.filter(tuple_(Client.created_dt, Client.id) > decode_cursor(cursor))
+
+            result = await async_db.session.execute(statement.limit(limit + 1))
+            clients = result.all() if fields else result.scalars().all()
+
+            if len(clients) > limit:
+                clients = clients[:limit]
+                return clients, encode_cursor(clients[-1])
+
+            return clients, None
+        except (InvalidCursorException, InvalidLimitException) as e:
+            logger.exception(str(e), extra={"props": {"table": "client", "cursor": cursor, "exception": str(e)}})
+            raise e
+        except Exception as e:
+            message = "Error when trying to retrieve a page of clients from database"
+            logger.exception(
+                message,
+                extra={
+                    "props": {"table": "client", "filters": json.dumps(kwargs), "cursor": cursor, "exception": str(e)},
+                },
+            )
+            raise DatabaseException(message)
+
+    @classmethod
+    async def search(
+        cls, query: str, offset: int = 0, limit: int = 100, fields: tuple[str] = None, **kwargs
+    ) -> list[Client | Row]:
+        try:
+            logger.info(
+                "Trying to search clients in database",
+                extra={
+                    "props": lambda: {
+                        "table": "client",
+                        "query": query,
+                        "filters": json.dumps(kwargs),
+                        "offset": offset,
+                        "limit": limit,
+                    }
+                },
+            )
+            statement = search_clients_statement(query, fields, kwargs, async_db.engine.dialect.name)
+            result = await async_db.session.execute(statement.offset(offset).limit(limit))
+
+            return result.all() if fields else result.scalars().all()
+        except InvalidSearchException as e:
+            raise e
+        except Exception as e:
+            message = "Error when trying to search clients in database"
+            logger.exception(
+                message,
+                extra={
+                    "props": {"table": "client", "query": query, "filters": json.dumps(kwargs), "exception": str(e)}
+                },
+            )
+            raise DatabaseException(message)
+
+    @classmethod
+    async def count(cls, query: str = None, **kwargs) -> tuple[int, bool]:
+        cache = count_cache()
+        key = dict(query=query, filters=kwargs)
+        cached = await _run_cache(cache.get, key)
+
+        if cached:
+            return cached
+
+        try:
+            logger.info(
+                "Trying to count clients in database",
+                extra={"props": lambda: {"table": "client", "query": query, "filters": json.dumps(kwargs)}},
+            )
+            cap = current_app.config["CLIENT_COUNT_MAX"]
+            statement, kind = count_clients_statement(query, kwargs, async_db.engine.dialect.name, cap)
+            count = (await async_db.session.execute(statement)).scalar()
+
+            if count is None:
+                statement, kind = (
+                    capped_count_clients_statement(query, kwargs, async_db.engine.dialect.name, cap),
+                    CAPPED,
+                )
+                count = (await async_db.session.execute(statement)).scalar()
+        except InvalidSearchException as e:
+            raise e
+        except Exception as e:
+            message = "Error when trying to count clients in database"
+            logger.exception(
+                message,
+                extra={
+                    "props": {"table": "client", "query": query, "filters": json.dumps(kwargs), "exception": str(e)}
+                },
+            )
+            raise DatabaseException(message)
+
+        result = count_result(count, kind, cap)
+        await _run_cache(cache.set, key, *result)
+
+        return result
+
+    @classmethod
+    async def stream(cls, batch_size: int = None, **kwargs) -> AsyncIterator[list[Row]]:
+        batch_size = batch_size or current_app.config["CLIENT_EXPORT_BATCH_SIZE"]
+
+        try:
+            logger.info(
+                "Trying to stream clients from database",
+                extra={"props": lambda: {"table": "client", "filters": json.dumps(kwargs), "batch_size": batch_size}},
+            )
+            result = await async_db.session().stream(select(Client.__table__).filter_by(**kwargs))
+
+            async for partition in result.partitions(batch_size):
+                yield partition
+        except Exception as e:
+            message = "Error when trying to stream clients from database"
+            logger.exception(
+                message, extra={"props": {"table": "client", "filters": json.dumps(kwargs), "exception": str(e)}}
+            )
+            raise DatabaseException(message)
+
+    @classmethod
+    async def retrieve(cls, id: str, fields: tuple[str] = None) -> Client | Row:
+        try:
+            logger.info(
+                "Trying to retrieve a client from database", extra={"props": lambda: {"table": "client", "id": id}}
+            )
+            cache = client_cache()
+            cached_client, stamp = await _run_cache(cache.get, id)
+
+            if cached_client:
+                return Client(**cached_client)
+
+            if fields:
+                return (await async_db.session.execute(select_fields(fields).filter_by(id=id))).first()
+
+            client = await async_db.session.get(Client, id)
+
+            if client:
+                await _run_cache(cache.set, id, client_values(client), stamp)
+
+            return client
+        except Exception as e:
+            message = "Error when trying to retrieve a client from database"
+            logger.exception(message, extra={"props": {"table": "client", "id": id, "exception": str(e)}})
+            raise DatabaseException(message)
+
+    @classmethod
+    async def version(cls, id: str) -> datetime:
+        try:
+            logger.info(
+                "Trying to retrieve a client version from database",
+                extra={"props": lambda: {"table": "client", "id": id}},
+            )
+            cached_client, _ = await _run_cache(client_cache().get, id)
+
+            if cached_client:
+                return cached_client["updated_dt"]
+
+            return (await async_db.session.execute(select(Client.updated_dt).filter_by(id=id))).scalar()
+        except Exception as e:
+            message = "Error when trying to retrieve a client version from database"
+            logger.exception(message, extra={"props": {"table": "client", "id": id, "exception": str(e)}})
+            raise DatabaseException(message)
+
+    @classmethod
+    async def create(cls, client: Client) -> None:
+        try:
+            logger.info(
+                "Trying to save a new client in database",
+                extra={"props": lambda: {"table": "client", "client": client.dict}},
+            )
+
+            async_db.session.add(client)
+            await async_db.session.commit()
+        except IntegrityError as e:
+            await async_db.session.rollback()
+            message = "User already added in database"
+            logger.exception(message, extra={"props": {"table": "client", "client": client.dict, "exception": str(e)}})
+            raise DuplicateError(message)
+        except Exception as e:
+            await async_db.session.rollback()
+            message = "Error when trying to save a new client in database"
+            logger.exception(message, extra={"props": {"table": "client", "client": client.dict, "exception": str(e)}})
+            raise DatabaseException(message)
+
+    @classmethod
+    async def bulk_create(cls, clients: list[Client], batch_size: int = None) -> list[Client]:
+        batch_size = batch_size or current_app.config["CLIENT_BULK_BATCH_SIZE"]
+        duplicates = []
+
+        try:
+            logger.info(
+                "Trying to save a batch of new clients in database",
+                extra={"props": lambda: {"table": "client", "total": len(clients), "batch_size": batch_size}},
+            )
+
+            for batch in chunks(clients, batch_size):
+                duplicates.extend(await cls._insert_batch(batch))
+
+            return duplicates
+        except Exception as e:
+            await async_db.session.rollback()
+            message = "Error when trying to save a batch of new clients in database"
+            logger.exception(message, extra={"props": {"table": "client", "total": len(clients), "exception": str(e)}})
+            raise DatabaseException(message)
+
+    @classmethod
+    async def _insert_batch(cls, clients: list[Client]) -> list[Client]:
+        session = async_db.session
+        documents = [client.document for client in clients]
+        existing = set(
+            (await session.execute(select(Client.document).filter(Client.document.in_(documents)))).scalars()
+        )
+        new_clients = [client for client in clients if client.document not in existing]
+        duplicates = [client for client in clients if client.document in existing]
+
+        try:
+            if new_clients:
+                await session.execute(insert(Client.__table__), [client_values(client) for client in new_clients])
+
+            await session.commit()
+        except IntegrityError:
+            await session.rollback()
+            logger.warning(
+                "Batch insert conflicted with a concurrent write. Inserting clients one by one",
+                extra={"props": {"table": "client", "total": len(new_clients)}},
+            )
+            duplicates.extend(await cls._insert_one_by_one(new_clients))
+
+        return duplicates
+
+    @classmethod
+    async def _insert_one_by_one(cls, clients: list[Client]) -> list[Client]:
+        duplicates = []
+
+        for client in clients:
+            try:
+                async with async_db.session.begin_nested():
+                    await async_db.session.execute(insert(Client.__table__), client_values(client))
+            except IntegrityError:
+                duplicates.append(client)
+
+        await async_db.session.commit()
+
+        return duplicates
+
+    @classmethod
+    async def upsert(cls, client: Client) -> Client:
+        session = async_db.session
+        dialect = async_db.engine.dialect
+
+        try:
+            logger.info(
+                f"Trying to upsert a client with document '{client.document}' in database",
+                extra={"props": lambda: {"table": "client", "client": client.dict}},
+            )
+
+            statement = upsert_clients_statement([client_values(client)], dialect.name)
+
+            if dialect.full_returning:
+                row = (await session.execute(statement.returning(*Client.__table__.columns))).one()
+                await session.commit()
+                upserted_client = Client(**row._mapping)
+            else:
+                await session.execute(statement)
+                await session.commit()
+                query = select(Client).filter_by(document=client.document).execution_options(populate_existing=True)
+                upserted_client = (await session.execute(query)).scalars().one()
+
+            await _run_cache(client_cache().invalidate, upserted_client.id)
+
+            return upserted_client
+        except Exception as e:
+            await session.rollback()
+            message = f"Error when trying to upsert a client with document '{client.document}' in database"
+            logger.exception(message, extra={"props": {"table": "client", "client": client.dict, "exception": str(e)}})
+            raise DatabaseException(message)
+
+    @classmethod
+    async def bulk_upsert(cls, clients: list[Client], batch_size: int = None) -> None:
+        batch_size = batch_size or current_app.config["CLIENT_BULK_BATCH_SIZE"]
+        dialect_name = async_db.engine.dialect.name
+
+        try:
+            logger.info(
+                "Trying to upsert a batch of clients in database",
+                extra={"props": lambda: {"table": "client", "total": len(clients), "batch_size": batch_size}},
+            )
+
+            for batch in chunks(clients, batch_size):
+                await async_db.session.execute(
+                    upsert_clients_statement([client_values(client) for client in batch], dialect_name)
+                )
+                await async_db.session.commit()
+
+            await _run_cache(client_cache().invalidate_all)
+        except Exception as e:
+            await async_db.session.rollback()
+            message = "Error when trying to upsert a batch of clients in database"
+            logger.exception(message, extra={"props": {"table": "client", "total": len(clients), "exception": str(e)}})
+            raise DatabaseException(message)
+
+    @classmethod
+    async def update(cls, client: Client) -> Client:
+        session = async_db.session
+
+        try:
+            logger.info(
+                f"Trying to update a client with id '{client.id}' in database",
+                extra={"props": lambda: {"table": "client", "client": client.dict}},
+            )
+
+            statement = update_client_statement(client)
+
+            if async_db.engine.dialect.full_returning:
+                row = (await session.execute(statement.returning(*Client.__table__.columns))).one_or_none()
+
+                if not row:
+                    raise NotFoundException("Client not found")
+
+                await session.commit()
+                updated_client = Client(**row._mapping)
+            else:
+                if not (await session.execute(statement)).rowcount:
+                    raise NotFoundException("Client not found")
+
+                await session.commit()
+                updated_client = await session.get(Client, client.id, populate_existing=True)
+
+            await _run_cache(client_cache().invalidate, client.id)
+
+            return updated_client
+        except NotFoundException as e:
+            await session.rollback()
+            message = f"Error when trying to update a client with id '{client.id}' in database. Client not found."
+            logger.exception(message, extra={"props": {"table": "client", "client": client.dict, "exception": str(e)}})
+            raise e
+        except Exception as e:
+            await session.rollback()
+            message = f"Error when trying to update a client with id '{client.id}' in database"
+            logger.exception(message, extra={"props": {"table": "client", "client": client.dict, "exception": str(e)}})
+            raise DatabaseException(message)
+
+    @classmethod
+    async def delete(cls, id: str) -> None:
+        session = async_db.session
+
+        try:
+            logger.info(
+                f"Trying to delete a client with id '{id}' in database",
+                extra={"props": lambda: {"table": "client", "id": id}},
+            )
+
+            result = await session.execute(delete(Client.__table__).where(Client.__table__.c.id == id))
+
+            if not result.rowcount:
+                raise NotFoundException("Client not found")
+
+            await session.commit()
+            await _run_cache(client_cache().invalidate, id)
+        except NotFoundException as e:
+            await session.rollback()
+            message = f"Error when trying to delete a client with id '{id}' in database. Client not found."
+            logger.exception(message, extra={"props": {"table": "client", "id": id, "exception": str(e)}})
+            raise e
+        except Exception as e:
+            await session.rollback()
+            message = f"Error when trying to delete a client with id '{id}' in database"
+            logger.exception(message, extra={"props": {"table": "client", "id": id, "exception": str(e)}})
+            raise DatabaseException(message)
+
+    @classmethod
+    async def bulk_delete(cls, ids: list[str], batch_size: int = None) -> int:
+        batch_size = batch_size or current_app.config["CLIENT_BULK_BATCH_SIZE"]
+        session = async_db.session
+        deleted = 0
+
+        try:
+            logger.info(
+                "Trying to delete a batch of clients in database",
+                extra={"props": lambda: {"table": "client", "total": len(ids), "batch_size": batch_size}},
+            )
+
+            for batch in chunks(ids, batch_size):
+                result = await session.execute(delete(Client.__table__).where(Client.__table__.c.id.in_(batch)))
+                await session.commit()
+                deleted += result.rowcount
+
+            return deleted
+        except Exception as e:
+            await session.rollback()
+            message = "Error when trying to delete a batch of clients in database"
+            logger.exception(message, extra={"props": {"table": "client", "total": len(ids), "exception": str(e)}})
+            raise DatabaseException(message)
+        finally:
+            if deleted:
+                await _run_cache(client_cache().invalidate_all)
+
+
+async def _run_cache(method: Callable, *args):
+    """The in-memory backend never blocks, the network ones are moved off the event loop."""
+    if isinstance(method.__self__.backend, InMemoryCacheBackend):
+        return method(*args)
+
+    return await asyncio.to_thread(method, *args)
@@ -0,0 +1,342 @@
+import hashlib
+import json
+import logging
+import queue
+import socket
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from urllib.parse import urlparse
+
+from flask import current_app
+
+from purchasing_manager.application.exceptions import (
+    CacheException,
+    ConfigurationNotValid,
+)
+from purchasing_manager.domain.ports.cache import CacheBackendABC
+
+logger = logging.getLogger(f"purchasing-manager.{__name__}")
+
+DATETIME_FIELDS = ("created_dt", "updated_dt")
+
+
+class InMemoryCacheBackend(CacheBackendABC):
+    """LRU cache of up to ``max_size`` values of the process.
+
+    The counters of ``incr``, the generations of the client cache, are kept apart and never evicted by the LRU,
+    only once expired: a generation evicted before the values stamped with it would make them current again.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._counters = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: list[str]) -> list[str]:
+        with self._lock:
+            return [self._get(key) for key in keys]
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        with self._lock:
+            self._set(key, value, ttl)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._items.pop(key, None)
+                self._counters.pop(key, None)
+
+    def incr(self, key: str, ttl: float) -> int:
+        with self._lock:
+            self._purge_counters()
+            value = int(self._get(key) or 0) + 1
+            self._items.pop(key, None)
+            self._counters[key] = str(value), time.monotonic() + ttl
+            self._counters.move_to_end(key)
+
+            return value
+
+    def _get(self, key: str) -> str:
+        items = self._counters if key in self._counters else self._items
+        item = items.get(key)
+
+        if item is None:
+            return None
+
+        value, expires_at = item
+
+        if expires_at <= time.monotonic():
+            del items[key]
+            return None
+
+        if items is self._items:
+            self._items.move_to_end(key)
+
+        return value
+
+    def _set(self, key: str, value: str, ttl: float) -> None:
+        if self.max_size <= 0:
+            return
+
+        self._counters.pop(key, None)
+        self._items[key] = value, time.monotonic() + ttl
+        self._items.move_to_end(key)
+
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def _purge_counters(self) -> None:
+        """Drop the expired counters, the oldest ones as they are kept in the order of their last increment."""
+        now = time.monotonic()
+
+        while self._counters and next(iter(self._counters.values()))[1] <= now:
+            self._counters.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class RedisCacheBackend(CacheBackendABC):
+    """Client of the few Redis commands the caches use, MGET, SET, DEL and INCR with PEXPIRE, over the RESP
+    protocol. The redis package isn't a dependency of the service, and its connection pool and reply parsers aren't
+    needed for them. The connection of a command which failed in any way is closed, as its replies can't be trusted
+    to be in sync anymore.
+
+    Each command borrows a connection from a pool of idle ones and gives it back afterwards, up to
+    ``max_idle_connections`` kept open. Unlike one connection per thread, it is shared by the greenlets of a gevent
+    worker too, which run each request in a new greenlet.
+    """
+
+    def __init__(self, url: str, timeout: float = 0.5, max_idle_connections: int = 10):
+        parsed_url = urlparse(url)
+
+        self.host = parsed_url.hostname or "localhost"
+        self.port = parsed_url.port or 6379
+        self.db = int(parsed_url.path.lstrip("/") or 0)
+        self.password = parsed_url.password
+        self.timeout = timeout
+        self._idle_connections = queue.LifoQueue(maxsize=max_idle_connections)
+
+    def get_many(self, keys: list[str]) -> list[str]:
+        return self._execute(["MGET", *keys])[0]
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        self._execute(["SET", key, value, "PX", int(ttl * 1000)])
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self._execute(["DEL", *keys])
+
+    def incr(self, key: str, ttl: float) -> int:
+        value, _ = self._execute(["INCR", key], ["PEXPIRE", key, int(ttl * 1000)])
+        return value
+
+    def _execute(self, *commands: list) -> list:
+        connection = self._acquire()
+
+        try:
+            connection.send(b"".join(_encode_command(command) for command in commands))
+            replies = [connection.read_reply() for _ in commands]
+        except Exception:
+            connection.close()
+            raise
+
+        self._release(connection)
+
+        return replies
+
+    def _acquire(self) -> "_RedisConnection":
+        try:
+            return self._idle_connections.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    def _release(self, connection: "_RedisConnection") -> None:
+        try:
+            self._idle_connections.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    def _connect(self) -> "_RedisConnection":
+        connection = _RedisConnection(self.host, self.port, self.timeout)
+
+        try:
+            if self.password:
+                connection.send(_encode_command(["AUTH", self.password]))
+                connection.read_reply()
+            if self.db:
+                connection.send(_encode_command(["SELECT", self.db]))
+                connection.read_reply()
+        except Exception:
+            connection.close()
+            raise
+
+        return connection
+
+
+class _RedisConnection:
+    def __init__(self, host: str, port: int, timeout: float):
+        self._socket = socket.create_connection((host, port), timeout=timeout)
+        self._reader = self._socket.makefile("rb")
+
+    def send(self, data: bytes) -> None:
+        self._socket.sendall(data)
+
+    def read_reply(self):
+        line = self._reader.readline()
+
+        if not line:
+            raise ConnectionError("Connection closed by the cache server")
+
+        kind, payload = line[:1], line[1:-2]
+
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            raise CacheException(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            return None if payload == b"-1" else self._reader.read(int(payload) + 2)[:-2].decode()
+        if kind == b"*":
+            return None if payload == b"-1" else [self.read_reply() for _ in range(int(payload))]
+
+        raise CacheException(f"Unknown reply from the cache server: {line!r}")
+
+    def close(self) -> None:
+        self._reader.close()
+        self._socket.close()
+
+
+class ClientCache:
+    def __init__(self, backend: CacheBackendABC, ttl: float, namespace: str = "client"):
+        self.backend = backend
+        self.ttl = ttl
+        self.generation_ttl = ttl * 10
+        self.namespace = namespace
+        self._stats = dict(hit=0, miss=0, error=0)
+        self._stats_lock = threading.Lock()
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def get(self, id: str) -> tuple[dict, str]:
+        try:
+            generation, client_generation, value = self.backend.get_many(
+                [self._generation_key(), self._generation_key(id), self._key(id)]
+            )
+        except (OSError, CacheException) as e:
+            logger.warning("Error when trying to read from cache", extra={"props": {"id": id, "exception": str(e)}})
+            self._count("error")
+            return None, None
+
+        stamp = f"{generation or 0}:{client_generation or 0}"
+
+        if value:
+            cached = json.loads(value)
+
+            if cached["generation"] == stamp:
+                self._count("hit")
+                return _load_client_values(cached["client"]), stamp
+
+        self._count("miss")
+        return None, stamp
+
+    def set(self, id: str, values: dict, stamp: str) -> None:
+        if stamp is None:
+            return
+
+        value = json.dumps({"generation": stamp, "client": values}, default=datetime.isoformat)
+
+        try:
+            self.backend.set(self._key(id), value, self.ttl)
+        except (OSError, CacheException) as e:
+            logger.warning("Error when trying to write to cache", extra={"props": {"id": id, "exception": str(e)}})
+
+    def invalidate(self, id: str) -> None:
+        try:
+            self.backend.incr(self._generation_key(id), self.generation_ttl)
+            self.backend.delete(self._key(id))
+        except (OSError, CacheException) as e:
+            logger.error("Error when trying to invalidate cache", extra={"props": {"id": id, "exception": str(e)}})
+
+    def invalidate_all(self) -> None:
+        try:
+            self.backend.incr(self._generation_key(), self.generation_ttl)
+        except (OSError, CacheException) as e:
+            logger.error("Error when trying to invalidate cache", extra={"props": {"exception": str(e)}})
+
+    def _count(self, result: str) -> None:
+        with self._stats_lock:
+            self._stats[result] += 1
+
+    def _key(self, id: str) -> str:
+        return f"{self.namespace}:{id}"
+
+    def _generation_key(self, id: str = None) -> str:
+        return f"{self.namespace}:{id}:generation" if id else f"{self.namespace}:generation"
+
+
+class CountCache:
+    """Short lived cache of the client counts by filters. With the Redis backend, the processes share the counts."""
+
+    def __init__(self, backend: CacheBackendABC, ttl: float, namespace: str = "client:count"):
+        self.backend = backend
+        self.ttl = ttl
+        self.namespace = namespace
+
+    def get(self, filters: dict) -> tuple[int, bool]:
+        try:
+            value = self.backend.get_many([self._key(filters)])[0]
+        except (OSError, CacheException) as e:
+            logger.warning("Error when trying to read from cache", extra={"props": {"exception": str(e)}})
+            return None
+
+        return tuple(json.loads(value)) if value else None
+
+    def set(self, filters: dict, count: int, exact: bool) -> None:
+        try:
+            self.backend.set(self._key(filters), json.dumps([count, exact]), self.ttl)
+        except (OSError, CacheException) as e:
+            logger.warning("Error when trying to write to cache", extra={"props": {"exception": str(e)}})
+
+    def _key(self, filters: dict) -> str:
+        digest = hashlib.sha1(json.dumps(filters, sort_keys=True, default=str).encode()).hexdigest()
+        return f"{self.namespace}:{digest}"
+
+
+def create_cache_backend(config: dict) -> CacheBackendABC:
+    backend = config["CLIENT_CACHE_BACKEND"]
+
+    if backend == "memory":
+        return InMemoryCacheBackend(max_size=config["CLIENT_CACHE_MAX_SIZE"])
+    if backend == "redis":
+        return RedisCacheBackend(
+            config["CLIENT_CACHE_REDIS_URL"], max_idle_connections=config["CLIENT_CACHE_REDIS_MAX_IDLE_CONNECTIONS"]
+        )
+
+    raise ConfigurationNotValid(f"Invalid cache backend: '{backend}'")
+
+
+def client_cache() -> ClientCache:
+    return current_app.extensions["client_cache"]
+
+
+def count_cache() -> CountCache:
+    return current_app.extensions["client_count_cache"]
+
+
+def _encode_command(command: list) -> bytes:
+    args = [str(arg).encode() for arg in command]
+    return b"".join([f"*{len(args)}\r\n".encode(), *(b"$%d\r\n%s\r\n" % (len(arg), arg) for arg in args)])
+
+
+def _load_client_values(values: dict) -> dict:
+    for field in DATETIME_FIELDS:
+        values[field] = datetime.fromisoformat(values[field])
+
+    return values
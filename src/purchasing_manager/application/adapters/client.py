@@ -1,28 +1,65 @@
+from __future__ import annotations
+
 import json
 import logging
+from datetime import datetime
+from typing import Iterator
 
+from flask import current_app
+from sqlalchemy import delete, insert, select, tuple_
+from sqlalchemy.engine import Row
 from sqlalchemy.exc import IntegrityError
 
 from purchasing_manager import db
+from purchasing_manager.application.adapters.cache import client_cache, count_cache
+from purchasing_manager.application.adapters.counts import CAPPED, count_result
+from purchasing_manager.application.adapters.statements import (
+    capped_count_clients_statement,
+    chunks,
+    client_values,
+    count_clients_statement,
+    decode_cursor,
+    encode_cursor,
+    page_limit,
+    search_clients_statement,
+    select_fields,
+    update_client_statement,
+    upsert_clients_statement,
+)
 from purchasing_manager.application.exceptions import (
     DatabaseException,
     DuplicateError,
+    InvalidCursorException,
+    InvalidLimitException,
+    InvalidSearchException,
     NotFoundException,
 )
 from purchasing_manager.domain.models.client import Client
 from purchasing_manager.domain.ports.client import ClientRepositoryABC
+from purchasing_manager.routing import use_primary
 
 logger = logging.getLogger(f"purchasing-manager.{__name__}")
 
 
 class ClientRepository(ClientRepositoryABC):
     @classmethod
-    def list(cls, offset: int = 0, limit: int = 100, **kwargs) -> list[Client]:
+    def list(cls, offset: int = 0, limit: int = 100, fields: tuple[str] = None, **kwargs) -> list[Client | Row]:
         try:
             logger.info(
                 "Trying to retrieve a list of clients from database",
-                extra={"props": {"table": "client", "filters": json.dumps(kwargs), "offset": offset, "limit": limit}},
+                extra={
+                    "props": lambda: {
+                        "table": "client",
+                        "filters": json.dumps(kwargs),
+                        "offset": offset,
+                        "limit": limit,
+                    }
+                },
             )
+            if fields:
+                statement = select_fields(fields).filter_by(**kwargs).offset(offset).limit(limit)
+                return db.session.execute(statement).all()
+
             return Client.query.filter_by(**kwargs).offset(offset).limit(limit).all()
         except Exception as e:
             message = "Error when trying to retrieve a list of clients from database"
@@ -35,38 +72,312 @@ class ClientRepository(ClientRepositoryABC):
             raise DatabaseException(message)
 
     @classmethod
-    def retrieve(cls, id: str) -> Client:
+    def list_by_cursor(
+        cls, cursor: str = None, limit: int = 100, fields: tuple[str] = None, **kwargs
+    ) -> tuple[list[Client | Row], str]:
+        try:
+            logger.info(
+                "Trying to retrieve a page of clients from database",
+                extra={
+                    "props": lambda: {
+                        "table": "client",
+                        "filters": json.dumps(kwargs),
+                        "cursor": cursor,
+                        "limit": limit,
+                    }
+                },
+            )
+            limit = page_limit(limit)
+            statement = select_fields(dict.fromkeys([*fields, "created_dt", "id"])) if fields else select(Client)
+            statement = statement.filter_by(**kwargs).order_by(Client.created_dt, Client.id)
+
+            if cursor:
+                statement = statement.filter(tuple_(Client.created_dt, Client.id) > decode_cursor(cursor))
+
+            result = db.session.execute(statement.limit(limit + 1))
+            clients = result.all() if fields else result.scalars().all()
+
+            if len(clients) > limit:
+                clients = clients[:limit]
+                return clients, encode_cursor(clients[-1])
+
+            return clients, None
+        except (InvalidCursorException, InvalidLimitException) as e:
+            logger.exception(str(e), extra={"props": {"table": "client", "cursor": cursor, "exception": str(e)}})
+            raise e
+        except Exception as e:
+            message = "Error when trying to retrieve a page of clients from database"
+            logger.exception(
+                message,
+                extra={
+                    "props": {"table": "client", "filters": json.dumps(kwargs), "cursor": cursor, "exception": str(e)},
+                },
+            )
+            raise DatabaseException(message)
+
+    @classmethod
+    def search(
+        cls, query: str, offset: int = 0, limit: int = 100, fields: tuple[str] = None, **kwargs
+    ) -> list[Client | Row]:
+        try:
+            logger.info(
+                "Trying to search clients in database",
+                extra={
+                    "props": lambda: {
+                        "table": "client",
+                        "query": query,
+                        "filters": json.dumps(kwargs),
+                        "offset": offset,
+                        "limit": limit,
+                    }
+                },
+            )
+            statement = search_clients_statement(query, fields, kwargs, db.engine.dialect.name)
+            result = db.session.execute(statement.offset(offset).limit(limit))
+
+            return result.all() if fields else result.scalars().all()
+        except InvalidSearchException as e:
+            raise e
+        except Exception as e:
+            message = "Error when trying to search clients in database"
+            logger.exception(
+                message,
+                extra={
+                    "props": {"table": "client", "query": query, "filters": json.dumps(kwargs), "exception": str(e)}
+                },
+            )
+            raise DatabaseException(message)
+
+    @classmethod
+    def count(cls, query: str = None, **kwargs) -> tuple[int, bool]:
+        """Total of the clients matching the search query and filters, and whether it is exact. See
+        count_clients_statement."""
+        cache = count_cache()
+        key = dict(query=query, filters=kwargs)
+        cached = cache.get(key)
+
+        if cached:
+            return cached
+
+        try:
+            logger.info(
+                "Trying to count clients in database",
+                extra={"props": lambda: {"table": "client", "query": query, "filters": json.dumps(kwargs)}},
+            )
+            cap = current_app.config["CLIENT_COUNT_MAX"]
+            statement, kind = count_clients_statement(query, kwargs, db.engine.dialect.name, cap)
+            count = db.session.execute(statement).scalar()
+
+            if count is None:
+                statement, kind = capped_count_clients_statement(query, kwargs, db.engine.dialect.name, cap), CAPPED
+                count = db.session.execute(statement).scalar()
+        except InvalidSearchException as e:
+            raise e
+        except Exception as e:
+            message = "Error when trying to count clients in database"
+            logger.exception(
+                message,
+                extra={
+                    "props": {"table": "client", "query": query, "filters": json.dumps(kwargs), "exception": str(e)}
+                },
+            )
+            raise DatabaseException(message)
+
+        result = count_result(count, kind, cap)
+        cache.set(key, *result)
+
+        return result
+
+    @classmethod
+    def stream(cls, batch_size: int = None, **kwargs) -> Iterator[list[Row]]:
+        batch_size = batch_size or current_app.config["CLIENT_EXPORT_BATCH_SIZE"]
+
+        try:
+            logger.info(
+                "Trying to stream clients from database",
+                extra={"props": lambda: {"table": "client", "filters": json.dumps(kwargs), "batch_size": batch_size}},
+            )
+            statement = select(Client.__table__).filter_by(**kwargs).execution_options(stream_results=True)
+
+            yield from db.session.execute(statement).partitions(batch_size)
+        except Exception as e:
+            message = "Error when trying to stream clients from database"
+            logger.exception(
+                message, extra={"props": {"table": "client", "filters": json.dumps(kwargs), "exception": str(e)}}
+            )
+            raise DatabaseException(message)
+
+    @classmethod
+    def retrieve(cls, id: str, fields: tuple[str] = None) -> Client | Row:
         try:
-            logger.info("Trying to retrieve a client from database", extra={"props": {"table": "client", "id": id}})
-            client = Client.query.filter_by(id=id)
+            logger.info(
+                "Trying to retrieve a client from database", extra={"props": lambda: {"table": "client", "id": id}}
+            )
+            cached_client, stamp = client_cache().get(id)
+
+            if cached_client:
+                return Client(**cached_client)
 
-            if client.count() > 0:
-                return client.one()
+            if fields:
+                return db.session.execute(select_fields(fields).filter_by(id=id)).first()
 
-            return None
+            client = db.session.get(Client, id)
+
+            if client:
+                client_cache().set(id, client_values(client), stamp)
+
+            return client
 
         except Exception as e:
             message = "Error when trying to retrieve a client from database"
             logger.exception(message, extra={"props": {"table": "client", "id": id, "exception": str(e)}})
             raise DatabaseException(message)
 
+    @classmethod
+    def version(cls, id: str) -> datetime:
+        """The updated_dt of a client, read from the cache or as a single column by primary key, for the ETags of
+        the conditional requests. None when the client doesn't exist."""
+        try:
+            logger.info(
+                "Trying to retrieve a client version from database",
+                extra={"props": lambda: {"table": "client", "id": id}},
+            )
+            cached_client, _ = client_cache().get(id)
+
+            if cached_client:
+                return cached_client["updated_dt"]
+
+            return db.session.execute(select(Client.updated_dt).filter_by(id=id)).scalar()
+        except Exception as e:
+            message = "Error when trying to retrieve a client version from database"
+            logger.exception(message, extra={"props": {"table": "client", "id": id, "exception": str(e)}})
+            raise DatabaseException(message)
+
     @classmethod
     def create(cls, client: Client) -> None:
         try:
             logger.info(
                 "Trying to save a new client in database",
-                extra={"propos": {"table": "client", "client": client.dict}},
+                extra={"props": lambda: {"table": "client", "client": client.dict}},
             )
 
             db.session.add(client)
             db.session.commit()
         except IntegrityError as e:
             message = "User already added in database"
-            logger.exception(message, extra={"propos": {"table": "client", "client": client.dict, "exception": str(e)}})
+            logger.exception(message, extra={"props": {"table": "client", "client": client.dict, "exception": str(e)}})
             raise DuplicateError(message)
         except Exception as e:
             message = "Error when trying to save a new client in database"
-            logger.exception(message, extra={"propos": {"table": "client", "client": client.dict, "exception": str(e)}})
+            logger.exception(message, extra={"props": {"table": "client", "client": client.dict, "exception": str(e)}})
+            raise DatabaseException(message)
+
+    @classmethod
+    def bulk_create(cls, clients: list[Client], batch_size: int = None) -> list[Client]:
+        batch_size = batch_size or current_app.config["CLIENT_BULK_BATCH_SIZE"]
+        duplicates = []
+        use_primary()
+
+        try:
+            logger.info(
+                "Trying to save a batch of new clients in database",
+                extra={"props": lambda: {"table": "client", "total": len(clients), "batch_size": batch_size}},
+            )
+
+            for batch in chunks(clients, batch_size):
+                duplicates.extend(cls._insert_batch(batch))
+
+            return duplicates
+        except Exception as e:
+            db.session.rollback()
+            message = "Error when trying to save a batch of new clients in database"
+            logger.exception(message, extra={"props": {"table": "client", "total": len(clients), "exception": str(e)}})
+            raise DatabaseException(message)
+
+    @classmethod
+    def _insert_batch(cls, clients: list[Client]) -> list[Client]:
+        documents = [client.document for client in clients]
+        existing = {document for document, in db.session.query(Client.document).filter(Client.document.in_(documents))}
+        new_clients = [client for client in clients if client.document not in existing]
+        duplicates = [client for client in clients if client.document in existing]
+
+        try:
+            if new_clients:
+                db.session.execute(insert(Client.__table__), [client_values(client) for client in new_clients])
+
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            logger.warning(
+                "Batch insert conflicted with a concurrent write. Inserting clients one by one",
+                extra={"props": {"table": "client", "total": len(new_clients)}},
+            )
+            duplicates.extend(cls._insert_one_by_one(new_clients))
+
+        return duplicates
+
+    @classmethod
+    def _insert_one_by_one(cls, clients: list[Client]) -> list[Client]:
+        duplicates = []
+
+        for client in clients:
+            try:
+                with db.session.begin_nested():
+                    db.session.execute(insert(Client.__table__), client_values(client))
+            except IntegrityError:
+                duplicates.append(client)
+
+        db.session.commit()
+
+        return duplicates
+
+    @classmethod
+    def upsert(cls, client: Client) -> Client:
+        try:
+            logger.info(
+                f"Trying to upsert a client with document '{client.document}' in database",
+                extra={"props": lambda: {"table": "client", "client": client.dict}},
+            )
+
+            statement = upsert_clients_statement([client_values(client)])
+
+            if db.engine.dialect.full_returning:
+                row = db.session.execute(statement.returning(*Client.__table__.columns)).one()
+                db.session.commit()
+                upserted_client = Client(**row._mapping)
+            else:
+                db.session.execute(statement)
+                db.session.commit()
+                upserted_client = Client.query.filter_by(document=client.document).one()
+
+            client_cache().invalidate(upserted_client.id)
+
+            return upserted_client
+        except Exception as e:
+            db.session.rollback()
+            message = f"Error when trying to upsert a client with document '{client.document}' in database"
+            logger.exception(message, extra={"props": {"table": "client", "client": client.dict, "exception": str(e)}})
+            raise DatabaseException(message)
+
+    @classmethod
+    def bulk_upsert(cls, clients: list[Client], batch_size: int = None) -> None:
+        batch_size = batch_size or current_app.config["CLIENT_BULK_BATCH_SIZE"]
+
+        try:
+            logger.info(
+                "Trying to upsert a batch of clients in database",
+                extra={"props": lambda: {"table": "client", "total": len(clients), "batch_size": batch_size}},
+            )
+
+            for batch in chunks(clients, batch_size):
+                db.session.execute(upsert_clients_statement([client_values(client) for client in batch]))
+                db.session.commit()
+
+            client_cache().invalidate_all()
+        except Exception as e:
+            db.session.rollback()
+            message = "Error when trying to upsert a batch of clients in database"
+            logger.exception(message, extra={"props": {"table": "client", "total": len(clients), "exception": str(e)}})
             raise DatabaseException(message)
 
     @classmethod
@@ -74,31 +385,38 @@ class ClientRepository(ClientRepositoryABC):
         try:
             logger.info(
                 f"Trying to update a client with id '{client.id}' in database",
-                extra={"props": {"table": "client", "client": client.dict}},
+                extra={"props": lambda: {"table": "client", "client": client.dict}},
             )
 
-            old_client = Client.query.filter_by(id=client.id).first()
+            statement = update_client_statement(client)
 
-            if not old_client:
-                raise NotFoundException("Client not found")
+            if db.engine.dialect.full_returning:
+                row = db.session.execute(statement.returning(*Client.__table__.columns)).one_or_none()
 
-            if client.name:
-                old_client.name = client.name.title()
-            if client.phone:
-                old_client.phone = client.phone
-            if client.email:
-                old_client.email = client.email
+                if not row:
+                    raise NotFoundException("Client not found")
 
-            db.session.commit()
+                db.session.commit()
+                updated_client = Client(**row._mapping)
+            else:
+                if not db.session.execute(statement).rowcount:
+                    raise NotFoundException("Client not found")
+
+                db.session.commit()
+                updated_client = db.session.get(Client, client.id)
 
-            return Client.query.filter_by(id=client.id).first()
+            client_cache().invalidate(client.id)
+
+            return updated_client
         except NotFoundException as e:
+            db.session.rollback()
             message = f"Error when trying to update a client with id '{client.id}' in database. Client not found."
-            logger.exception(message, extra={"propos": {"table": "client", "client": client.dict, "exception": str(e)}})
+            logger.exception(message, extra={"props": {"table": "client", "client": client.dict, "exception": str(e)}})
             raise e
         except Exception as e:
+            db.session.rollback()
             message = f"Error when trying to update a client with id '{client.id}' in database"
-            logger.exception(message, extra={"propos": {"table": "client", "client": client.dict, "exception": str(e)}})
+            logger.exception(message, extra={"props": {"table": "client", "client": client.dict, "exception": str(e)}})
             raise DatabaseException(message)
 
     @classmethod
@@ -106,21 +424,49 @@ class ClientRepository(ClientRepositoryABC):
         try:
             logger.info(
                 f"Trying to delete a client with id '{id}' in database",
-                extra={"props": {"table": "client", "id": id}},
+                extra={"props": lambda: {"table": "client", "id": id}},
             )
 
-            client = Client.query.filter_by(id=id).first()
+            result = db.session.execute(delete(Client.__table__).where(Client.__table__.c.id == id))
 
-            if not client:
+            if not result.rowcount:
                 raise NotFoundException("Client not found")
 
-            db.session.delete(client)
             db.session.commit()
+            client_cache().invalidate(id)
         except NotFoundException as e:
+            db.session.rollback()
             message = f"Error when trying to delete a client with id '{id}' in database. Client not found."
-            logger.exception(message, extra={"propos": {"table": "client", "id": id, "exception": str(e)}})
+            logger.exception(message, extra={"props": {"table": "client", "id": id, "exception": str(e)}})
             raise e
         except Exception as e:
+            db.session.rollback()
             message = f"Error when trying to delete a client with id '{id}' in database"
-            logger.exception(message, extra={"propos": {"table": "client", "id": id, "exception": str(e)}})
+            logger.exception(message, extra={"props": {"table": "client", "id": id, "exception": str(e)}})
+            raise DatabaseException(message)
+
+    @classmethod
+    def bulk_delete(cls, ids: list[str], batch_size: int = None) -> int:
+        batch_size = batch_size or current_app.config["CLIENT_BULK_BATCH_SIZE"]
+        deleted = 0
+
+        try:
+            logger.info(
+                "Trying to delete a batch of clients in database",
+                extra={"props": lambda: {"table": "client", "total": len(ids), "batch_size": batch_size}},
+            )
+
+            for batch in chunks(ids, batch_size):
+                result = db.session.execute(delete(Client.__table__).where(Client.__table__.c.id.in_(batch)))
+                db.session.commit()
+                deleted += result.rowcount
+
+            return deleted
+        except Exception as e:
+            db.session.rollback()
+            message = "Error when trying to delete a batch of clients in database"
+            logger.exception(message, extra={"props": {"table": "client", "total": len(ids), "exception": str(e)}})
             raise DatabaseException(message)
+        finally:
+            if deleted:
+                client_cache().invalidate_all()
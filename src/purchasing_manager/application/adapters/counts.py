@@ -0,0 +1,75 @@
+from sqlalchemy import DDL, column, event, func, select, table, text
+from sqlalchemy.sql.expression import Select
+
+from purchasing_manager.domain.models.client import Client
+
+COUNTER = "counter"
+ESTIMATE = "estimate"
+CAPPED = "capped"
+
+COUNT_DDL = {
+    "sqlite": [
+        "CREATE TABLE client_count (id INTEGER PRIMARY KEY CHECK (id = 1), total INTEGER NOT NULL)",
+        "INSERT INTO client_count (id, total) SELECT 1, count(*) FROM client",
+        "CREATE TRIGGER client_count_insert AFTER INSERT ON client BEGIN "
+        "UPDATE client_count SET total = total + 1 WHERE id = 1; END",
+        "CREATE TRIGGER client_count_delete AFTER DELETE ON client BEGIN "
+        "UPDATE client_count SET total = total - 1 WHERE id = 1; END",
+    ],
+}
+COUNT_DROP_DDL = {"sqlite": ["DROP TABLE IF EXISTS client_count"]}
+ESTIMATE_QUERY = (
+    "SELECT CASE WHEN reltuples >= 0 THEN reltuples::bigint END FROM pg_class WHERE oid = 'client'::regclass"
+)
+
+_counter = table("client_count", column("total"))
+_ddl_events = [
+    *(
+        ("after_create", DDL(statement).execute_if(dialect=dialect))
+        for dialect, statements in COUNT_DDL.items()
+        for statement in statements
+    ),
+    *(
+        ("before_drop", DDL(statement).execute_if(dialect=dialect))
+        for dialect, statements in COUNT_DROP_DDL.items()
+        for statement in statements
+    ),
+]
+
+
+def install() -> None:
+    """Create the client counter of SQLite along with the client table, e.g. on ``db.create_all()``. It is a single
+    row kept up to date by triggers, which is fine with the single writer of SQLite. PostgreSQL uses the estimate of
+    the planner instead, so the inserts of concurrent transactions don't wait on the same row."""
+    for identifier, ddl in _ddl_events:
+        if not event.contains(Client.__table__, identifier, ddl):
+            event.listen(Client.__table__, identifier, ddl)
+
+
+def include_object(object, name: str, type_: str, reflected: bool, compare_to) -> bool:
+    """Keep the counter, which is not part of the models, out of the Alembic autogenerated migrations."""
+    return not (reflected and compare_to is None and name == "client_count")
+
+
+def total_count_statement(dialect_name: str) -> tuple[Select, str]:
+    """The cheapest count of the whole client table: the counter on SQLite and the planner estimate, refreshed by
+    every ANALYZE, on PostgreSQL. It is None when the table was never analyzed."""
+    if dialect_name == "sqlite":
+        return select(_counter.c.total), COUNTER
+    if dialect_name == "postgresql":
+        return text(ESTIMATE_QUERY), ESTIMATE
+
+    return None, None
+
+
+def capped_count_statement(statement: Select, cap: int) -> Select:
+    """Exact count of the rows of ``statement``, which stops at ``cap + 1`` rows."""
+    return select(func.count()).select_from(statement.order_by(None).limit(cap + 1).subquery())
+
+
+def count_result(count: int, kind: str, cap: int) -> tuple[int, bool]:
+    """The count to return and whether it is exact."""
+    if kind == CAPPED:
+        return min(count, cap), count <= cap
+
+    return count, kind == COUNTER
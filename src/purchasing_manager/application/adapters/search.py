@@ -0,0 +1,123 @@
+import re
+import unicodedata
+
+from sqlalchemy import DDL, column, event, func, literal_column, select, table
+from sqlalchemy.sql.expression import Select
+
+from purchasing_manager.domain.models.client import Client
+
+SEARCH_INDEX = "client_search"
+
+SEARCH_DDL = {
+    "sqlite": [
+        "CREATE TABLE client_search_key (rowid INTEGER PRIMARY KEY, id VARCHAR(36) NOT NULL UNIQUE)",
+        "CREATE VIRTUAL TABLE client_search USING fts5("
+        "name, email, tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        "CREATE TRIGGER client_search_insert AFTER INSERT ON client BEGIN "
+        "INSERT INTO client_search_key(id) VALUES (new.id); "
+        "INSERT INTO client_search(rowid, name, email) "
+        "SELECT rowid, new.name, new.email FROM client_search_key WHERE id = new.id; END",
+        "CREATE TRIGGER client_search_delete AFTER DELETE ON client BEGIN "
+        "DELETE FROM client_search WHERE rowid = (SELECT rowid FROM client_search_key WHERE id = old.id); "
+        "DELETE FROM client_search_key WHERE id = old.id; END",
+        "CREATE TRIGGER client_search_update AFTER UPDATE OF name, email ON client BEGIN "
+        "UPDATE client_search SET name = new.name, email = new.email "
+        "WHERE rowid = (SELECT rowid FROM client_search_key WHERE id = new.id); END",
+    ],
+    "postgresql": [
+        "CREATE EXTENSION IF NOT EXISTS unaccent",
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE OR REPLACE FUNCTION client_search_text(name text, email text) RETURNS text AS "
+        "$$ SELECT lower(public.unaccent('public.unaccent'::regdictionary, name || ' ' || email)) $$ "
+        "LANGUAGE sql IMMUTABLE PARALLEL SAFE",
+        "ALTER TABLE client ADD COLUMN search text GENERATED ALWAYS AS (client_search_text(name, email)) STORED",
+        "CREATE INDEX ix_client_search ON client USING gin (search gin_trgm_ops)",
+    ],
+}
+SEARCH_DROP_DDL = {"sqlite": ["DROP TABLE IF EXISTS client_search", "DROP TABLE IF EXISTS client_search_key"]}
+
+_sqlite_index = table(SEARCH_INDEX, column("rowid"), column("rank"))
+_sqlite_keys = table("client_search_key", column("rowid"), column("id"))
+_ddl_events = [
+    *(
+        ("after_create", DDL(statement).execute_if(dialect=dialect))
+        for dialect, statements in SEARCH_DDL.items()
+        for statement in statements
+    ),
+    *(
+        ("before_drop", DDL(statement).execute_if(dialect=dialect))
+        for dialect, statements in SEARCH_DROP_DDL.items()
+        for statement in statements
+    ),
+]
+
+
+def install() -> None:
+    """Create the search index of each dialect along with the client table, e.g. on ``db.create_all()``.
+
+    The index holds the lowercased and accent-folded name and email of each client and is kept up to date by the
+    database itself, so Core inserts and updates are indexed too:
+
+    - SQLite: an FTS5 table with prefix indexes, filled by triggers. Its rowids are the ones of the
+      ``client_search_key`` table, which maps them to the client ids. The implicit rowid of the client table, whose
+      primary key is a string, isn't used as a VACUUM may renumber it.
+    - PostgreSQL: a generated ``search`` column with a trigram GIN index, which answers the word prefix regexes.
+
+    Databases managed by the migrations get the same index from the ``add client search index`` and ``key client
+    search index by id`` revisions.
+    """
+    for identifier, ddl in _ddl_events:
+        if not event.contains(Client.__table__, identifier, ddl):
+            event.listen(Client.__table__, identifier, ddl)
+
+
+def include_object(object, name: str, type_: str, reflected: bool, compare_to) -> bool:
+    """Keep the search index, which is not part of the models, out of the Alembic autogenerated migrations."""
+    if not reflected or compare_to is not None:
+        return True
+
+    if type_ == "column":
+        return name != "search"
+
+    return not (name or "").startswith(("client_search", "ix_client_search"))
+
+
+def search_terms(query: str) -> list[str]:
+    """The lowercased and accent-folded words of a search query, e.g. ['joao', 'sil'] for 'João Sil'."""
+    folded = unicodedata.normalize("NFKD", query.lower())
+
+    return re.findall(r"\w+", "".join(char for char in folded if not unicodedata.combining(char)))
+
+
+def search_statement(statement: Select, terms: list[str], dialect_name: str, rank_window: int) -> Select:
+    """Restrict a select of clients to the ones with a name or email word starting with each term, best match
+    first.
+
+    Only the first ``rank_window`` matches found by the index are ranked, so a term shared by millions of clients,
+    e.g. 'example' in the emails, costs the same as a rare one.
+    """
+    if dialect_name == "sqlite":
+        match = " ".join(f'"{term}"*' for term in terms)
+        candidates = (
+            select(_sqlite_keys.c.id, _sqlite_index.c.rank)
+            .join_from(_sqlite_index, _sqlite_keys, _sqlite_keys.c.rowid == _sqlite_index.c.rowid)
+            .where(literal_column(SEARCH_INDEX).op("MATCH")(match))
+            .limit(rank_window)
+            .subquery()
+        )
+
+        return statement.join(candidates, candidates.c.id == Client.__table__.c.id).order_by(
+            candidates.c.rank, Client.id
+        )
+
+    search = literal_column("client.search")
+    candidates = (
+        select(Client.__table__.c.id, search.label("search"))
+        .where(*[search.op("~")(rf"\m{term}") for term in terms])
+        .limit(rank_window)
+        .subquery()
+    )
+
+    return statement.join(candidates, candidates.c.id == Client.__table__.c.id).order_by(
+        func.word_similarity(" ".join(terms), candidates.c.search).desc(), Client.id
+    )
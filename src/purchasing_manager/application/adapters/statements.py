@@ -0,0 +1,131 @@
+"""Statements and values of the client table, shared by ClientRepository and AsyncClientRepository, which only
+differ in how they execute them."""
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.sql.expression import Insert, Select, Update
+
+from purchasing_manager import db
+from purchasing_manager.application.adapters.counts import (
+    CAPPED,
+    capped_count_statement,
+    total_count_statement,
+)
+from purchasing_manager.application.adapters.search import (
+    search_statement,
+    search_terms,
+)
+from purchasing_manager.application.exceptions import (
+    InvalidCursorException,
+    InvalidLimitException,
+    InvalidSearchException,
+)
+from purchasing_manager.domain.models.client import Client
+
+UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+UPSERT_UPDATED_COLUMNS = ["name", "phone", "email", "updated_dt"]
+
+
+def chunks(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start : start + size]  # noqa: E203
+
+
+def client_values(client: Client) -> dict:
+    return {column.name: getattr(client, column.name) for column in Client.__table__.columns}
+
+
+def upsert_clients_statement(values: list[dict], dialect_name: str = None) -> Insert:
+    statement = UPSERT_INSERTS[dialect_name or db.engine.dialect.name](Client.__table__).values(values)
+
+    return statement.on_conflict_do_update(
+        index_elements=[Client.document],
+        set_={column: statement.excluded[column] for column in UPSERT_UPDATED_COLUMNS},
+    )
+
+
+def select_fields(fields) -> Select:
+    """Core select of only the given columns, so neither the database nor the ORM handle the unused ones."""
+    return select(*[Client.__table__.c[field] for field in fields])
+
+
+def search_clients_statement(
+    query: str, fields: tuple[str], filters: dict, dialect_name: str, rank_window: int = None
+) -> Select:
+    terms = search_terms(query)
+
+    if not terms:
+        raise InvalidSearchException("Invalid search: send at least one letter or digit")
+
+    statement = (select_fields(fields) if fields else select(Client)).filter_by(**filters)
+    rank_window = rank_window or current_app.config["CLIENT_SEARCH_RANK_WINDOW"]
+
+    return search_statement(statement, terms, dialect_name, rank_window)
+
+
+def count_clients_statement(query: str, filters: dict, dialect_name: str, cap: int) -> tuple[Select, str]:
+    """Never a full COUNT(*) of the client table: the maintained counter or the planner estimate of the dialect
+    without filters, otherwise an exact count which stops after ``cap`` rows."""
+    if not query and not filters:
+        statement, kind = total_count_statement(dialect_name)
+
+        if statement is not None:
+            return statement, kind
+
+    return capped_count_clients_statement(query, filters, dialect_name, cap), CAPPED
+
+
+def capped_count_clients_statement(query: str, filters: dict, dialect_name: str, cap: int) -> Select:
+    if query:
+        statement = search_clients_statement(query, ("id",), filters, dialect_name, rank_window=cap + 1)
+    else:
+        statement = select_fields(("id",)).filter_by(**filters)
+
+    return capped_count_statement(statement, cap)
+
+
+def update_client_statement(client: Client) -> Update:
+    values = dict(updated_dt=datetime.utcnow())
+
+    if client.name:
+        values["name"] = client.name.title()
+    if client.phone:
+        values["phone"] = client.phone
+    if client.email:
+        values["email"] = client.email
+
+    return update(Client.__table__).where(Client.__table__.c.id == client.id).values(**values)
+
+
+def page_limit(limit) -> int:
+    """The ``limit`` of a page of clients, an integer from 1 to CLIENT_PAGE_MAX_LIMIT."""
+    max_limit = current_app.config["CLIENT_PAGE_MAX_LIMIT"]
+
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        limit = 0
+
+    if not 1 <= limit <= max_limit:
+        raise InvalidLimitException(f"Invalid limit: send an integer from 1 to {max_limit}")
+
+    return limit
+
+
+def encode_cursor(client: Client) -> str:
+    payload = json.dumps([client.created_dt.isoformat(), client.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_dt, id = json.loads(payload)
+        return datetime.fromisoformat(created_dt), str(id)
+    except (binascii.Error, TypeError, ValueError) as e:
+        raise InvalidCursorException("Invalid pagination cursor") from e
@@ -10,9 +10,33 @@ class MissingAttributeException(Exception):
     pass
 
 
+class InvalidAttributeException(Exception):
+    pass
+
+
 class DuplicateError(Exception):
     pass
 
 
 class NotFoundException(Exception):
     pass
+
+
+class InvalidCursorException(Exception):
+    pass
+
+
+class InvalidLimitException(Exception):
+    pass
+
+
+class InvalidFieldsException(Exception):
+    pass
+
+
+class InvalidSearchException(Exception):
+    pass
+
+
+class CacheException(Exception):
+    pass
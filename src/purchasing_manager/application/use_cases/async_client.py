@@ -0,0 +1,225 @@
+import csv
+from http import HTTPStatus
+from typing import IO, AsyncIterator
+
+from flask import current_app
+
+from purchasing_manager.application.adapters.async_client import AsyncClientRepository
+from purchasing_manager.application.exceptions import (
+    DuplicateError,
+    InvalidAttributeException,
+    InvalidCursorException,
+    InvalidFieldsException,
+    InvalidLimitException,
+    InvalidSearchException,
+    MissingAttributeException,
+    NotFoundException,
+)
+from purchasing_manager.application.serializers import (
+    RawJSON,
+    client_serializer,
+    client_serializer_for,
+    dumps_page,
+)
+from purchasing_manager.application.use_cases.client import (
+    ETAG_HEADER,
+    NOT_FOUND_CLIENT_MESSAGE,
+    ClientUseCases,
+)
+
+
+class AsyncClientUseCases(ClientUseCases):
+    """Coroutine versions of the ClientUseCases methods, backed by the AsyncClientRepository.
+
+    Payload validation and result building are shared with ClientUseCases, so both modes answer with the same
+    response shapes.
+    """
+
+    async def get_clients(self, *args, if_none_match: str = None, **kwargs) -> RawJSON:
+        if self._is_true(kwargs.pop("count", None)):
+            response = await self.get_clients(if_none_match=if_none_match, **kwargs)
+
+            if response[1] not in (HTTPStatus.OK, HTTPStatus.NOT_MODIFIED):
+                return response
+
+            return self._with_total_count(response, await AsyncClientRepository.count(**self._count_filters(**kwargs)))
+
+        if "q" in kwargs:
+            return await self.search_clients(if_none_match=if_none_match, **kwargs)
+
+        if "cursor" in kwargs:
+            return await self.get_clients_page(if_none_match=if_none_match, **kwargs)
+
+        try:
+            fields = self._parse_fields(kwargs.pop("fields", None))
+        except InvalidFieldsException as e:
+            return dict(message=str(e)), HTTPStatus.BAD_REQUEST
+
+        clients_object = await AsyncClientRepository.list(fields=fields, **kwargs)
+
+        if not clients_object:
+            return NOT_FOUND_CLIENT_MESSAGE, HTTPStatus.NOT_FOUND
+
+        return self._collection_response(
+            clients_object, fields, if_none_match, lambda: client_serializer_for(fields).dumps_many(clients_object)
+        )
+
+    async def get_clients_page(self, cursor: str = None, if_none_match: str = None, **kwargs) -> RawJSON:
+        filters = self._delete_unwanted_fields("offset", **kwargs)
+
+        try:
+            fields = self._parse_fields(filters.pop("fields", None))
+            clients_object, next_cursor = await AsyncClientRepository.list_by_cursor(
+                cursor=cursor or None, fields=fields, **filters
+            )
+        except (InvalidCursorException, InvalidLimitException, InvalidFieldsException) as e:
+            return dict(message=str(e)), HTTPStatus.BAD_REQUEST
+
+        if not clients_object:
+            return NOT_FOUND_CLIENT_MESSAGE, HTTPStatus.NOT_FOUND
+
+        return self._collection_response(
+            clients_object,
+            fields,
+            if_none_match,
+            lambda: dumps_page(client_serializer_for(fields), clients_object, next_cursor),
+            next_cursor or "",
+        )
+
+    async def search_clients(self, q: str, if_none_match: str = None, **kwargs) -> RawJSON:
+        filters = self._delete_unwanted_fields("cursor", **kwargs)
+
+        try:
+            fields = self._parse_fields(filters.pop("fields", None))
+            clients_object = await AsyncClientRepository.search(q, fields=fields, **filters)
+        except (InvalidSearchException, InvalidFieldsException) as e:
+            return dict(message=str(e)), HTTPStatus.BAD_REQUEST
+
+        if not clients_object:
+            return NOT_FOUND_CLIENT_MESSAGE, HTTPStatus.NOT_FOUND
+
+        return self._collection_response(
+            clients_object, fields, if_none_match, lambda: client_serializer_for(fields).dumps_many(clients_object)
+        )
+
+    async def export(self, **kwargs) -> AsyncIterator[str]:
+        async for clients in AsyncClientRepository.stream(**kwargs):
+            yield client_serializer.lines(clients)
+
+    async def retrieve(self, id: str, fields: str = None, if_none_match: str = None) -> RawJSON:
+        try:
+            fields = self._parse_fields(fields)
+        except InvalidFieldsException as e:
+            return dict(message=str(e)), HTTPStatus.BAD_REQUEST
+
+        version = await AsyncClientRepository.version(id) if if_none_match else None
+        etag = version and self._client_etag(id, version, fields)
+
+        if etag and self._etag_matches(etag, if_none_match):
+            return self._not_modified(etag)
+
+        client = await AsyncClientRepository.retrieve(id, fields=fields)
+
+        if not client:
+            return NOT_FOUND_CLIENT_MESSAGE, HTTPStatus.NOT_FOUND
+
+        version = getattr(client, "updated_dt", None) or version or await AsyncClientRepository.version(id)
+        headers = {ETAG_HEADER: self._client_etag(id, version, fields)}
+
+        return client_serializer_for(fields).dumps(client), HTTPStatus.OK, headers
+
+    async def create(self, **kwargs) -> tuple[RawJSON, HTTPStatus]:
+        try:
+            client = self._create_client_object(**kwargs)
+            await AsyncClientRepository.create(client)
+
+            return client_serializer.dumps(client), HTTPStatus.CREATED
+        except (MissingAttributeException, InvalidAttributeException, DuplicateError) as e:
+            return dict(message=str(e)), HTTPStatus.BAD_REQUEST
+
+    async def bulk_create(self, payload: list[dict]) -> tuple[dict, HTTPStatus]:
+        error = self._validate_bulk_payload(payload)
+
+        if error:
+            return error
+
+        results = await self._bulk_create_clients(payload)
+
+        return self._bulk_create_summary(results), HTTPStatus.OK
+
+    async def import_csv(self, file: IO[str], chunk_size: int = None) -> tuple[dict, HTTPStatus]:
+        chunk_size = chunk_size or current_app.config["CLIENT_IMPORT_CHUNK_SIZE"]
+        reader = csv.DictReader(file)
+        error = self._validate_csv_columns(reader)
+
+        if error:
+            return error
+
+        summary = dict(inserted=0, duplicated=0, invalid=0, errors=[])
+
+        for chunk, lines in self._csv_chunks(reader, chunk_size):
+            results = await self._bulk_create_clients(chunk, batch_size=len(chunk))
+            self._add_import_results(results, lines, summary)
+
+        return summary, HTTPStatus.OK
+
+    async def upsert(self, document: str, **kwargs) -> RawJSON:
+        try:
+            client = self._create_client_object(**{**kwargs, "document": document})
+        except (MissingAttributeException, InvalidAttributeException) as e:
+            return dict(message=str(e)), HTTPStatus.BAD_REQUEST
+
+        return client_serializer.dumps(await AsyncClientRepository.upsert(client))
+
+    async def bulk_upsert(self, payload: list[dict]) -> tuple[dict, HTTPStatus]:
+        error = self._validate_bulk_payload(payload)
+
+        if error:
+            return error
+
+        results, clients = self._create_upsert_client_objects(payload)
+        await AsyncClientRepository.bulk_upsert(clients)
+
+        return self._bulk_upsert_summary(results), HTTPStatus.OK
+
+    async def update(self, **kwargs) -> RawJSON:
+        try:
+            client = self._create_update_client_object(**kwargs)
+        except TypeError as e:
+            return dict(message=str(e)), HTTPStatus.BAD_REQUEST
+
+        try:
+            new_client = await AsyncClientRepository.update(client)
+        except NotFoundException:
+            return NOT_FOUND_CLIENT_MESSAGE, HTTPStatus.NOT_FOUND
+
+        return client_serializer.dumps(new_client)
+
+    async def delete(self, id: str) -> tuple[None, HTTPStatus]:
+        try:
+            await AsyncClientRepository.delete(id)
+        except NotFoundException:
+            return NOT_FOUND_CLIENT_MESSAGE, HTTPStatus.NOT_FOUND
+
+        return None, HTTPStatus.NO_CONTENT
+
+    async def bulk_delete(self, payload: list[str]) -> tuple[dict, HTTPStatus]:
+        error = self._validate_bulk_delete_payload(payload)
+
+        if error:
+            return error
+
+        ids = list(dict.fromkeys(payload))
+        deleted = await AsyncClientRepository.bulk_delete(ids)
+
+        return dict(deleted=deleted, not_found=len(ids) - deleted), HTTPStatus.OK
+
+    @classmethod
+    async def _bulk_create_clients(cls, payload: list[dict], batch_size: int = None) -> list[dict]:
+        results, clients = cls._create_bulk_client_objects(payload)
+
+        duplicates = await AsyncClientRepository.bulk_create(
+            [client for _, client in clients.values()], batch_size=batch_size
+        )
+
+        return cls._bulk_create_results(results, clients, duplicates)
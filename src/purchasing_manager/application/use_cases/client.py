@@ -1,59 +1,194 @@
+import csv
+import hashlib
 from datetime import datetime
 from http import HTTPStatus
+from typing import IO, Callable, Iterator
 from uuid import uuid4
 
+from flask import current_app
+from werkzeug.http import parse_etags, quote_etag, unquote_etag
+
 from purchasing_manager.application.adapters.client import ClientRepository
 from purchasing_manager.application.exceptions import (
     DuplicateError,
+    InvalidAttributeException,
+    InvalidCursorException,
+    InvalidFieldsException,
+    InvalidLimitException,
+    InvalidSearchException,
     MissingAttributeException,
     NotFoundException,
 )
+from purchasing_manager.application.serializers import (
+    RawJSON,
+    client_serializer,
+    client_serializer_for,
+    dumps_page,
+)
 from purchasing_manager.domain.models.client import Client
 
 NOT_FOUND_CLIENT_MESSAGE = dict(message="Clients not found")
+DUPLICATE_CLIENT_MESSAGE = "User already added in database"
+CSV_COLUMNS = ["full_name", "document", "phone", "email"]
+ETAG_HEADER = "ETag"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+TOTAL_COUNT_EXACT_HEADER = "X-Total-Count-Exact"
 
 
 class ClientUseCases:
-    def get_clients(self, *args, **kwargs) -> list[dict[Client]]:
-        clients_object = ClientRepository.list(**kwargs)
+    def get_clients(self, *args, if_none_match: str = None, **kwargs) -> RawJSON:
+        if ClientUseCases._is_true(kwargs.pop("count", None)):
+            response = self.get_clients(if_none_match=if_none_match, **kwargs)
+
+            if response[1] not in (HTTPStatus.OK, HTTPStatus.NOT_MODIFIED):
+                return response
+
+            return ClientUseCases._with_total_count(response, ClientRepository.count(**self._count_filters(**kwargs)))
+
+        if "q" in kwargs:
+            return self.search_clients(if_none_match=if_none_match, **kwargs)
+
+        if "cursor" in kwargs:
+            return self.get_clients_page(if_none_match=if_none_match, **kwargs)
+
+        try:
+            fields = ClientUseCases._parse_fields(kwargs.pop("fields", None))
+        except InvalidFieldsException as e:
+            return dict(message=str(e)), HTTPStatus.BAD_REQUEST
+
+        clients_object = ClientRepository.list(fields=fields, **kwargs)
+
+        if not clients_object:
+            return NOT_FOUND_CLIENT_MESSAGE, HTTPStatus.NOT_FOUND
+
+        return ClientUseCases._collection_response(
+            clients_object, fields, if_none_match, lambda: client_serializer_for(fields).dumps_many(clients_object)
+        )
+
+    def get_clients_page(self, cursor: str = None, if_none_match: str = None, **kwargs) -> RawJSON:
+        filters = ClientUseCases._delete_unwanted_fields("offset", **kwargs)
+
+        try:
+            fields = ClientUseCases._parse_fields(filters.pop("fields", None))
+            clients_object, next_cursor = ClientRepository.list_by_cursor(
+                cursor=cursor or None, fields=fields, **filters
+            )
+        except (InvalidCursorException, InvalidLimitException, InvalidFieldsException) as e:
+            return dict(message=str(e)), HTTPStatus.BAD_REQUEST
+
+        if not clients_object:
+            return NOT_FOUND_CLIENT_MESSAGE, HTTPStatus.NOT_FOUND
+
+        return ClientUseCases._collection_response(
+            clients_object,
+            fields,
+            if_none_match,
+            lambda: dumps_page(client_serializer_for(fields), clients_object, next_cursor),
+            next_cursor or "",
+        )
+
+    def search_clients(self, q: str, if_none_match: str = None, **kwargs) -> RawJSON:
+        filters = ClientUseCases._delete_unwanted_fields("cursor", **kwargs)
+
+        try:
+            fields = ClientUseCases._parse_fields(filters.pop("fields", None))
+            clients_object = ClientRepository.search(q, fields=fields, **filters)
+        except (InvalidSearchException, InvalidFieldsException) as e:
+            return dict(message=str(e)), HTTPStatus.BAD_REQUEST
 
         if not clients_object:
             return NOT_FOUND_CLIENT_MESSAGE, HTTPStatus.NOT_FOUND
 
-        clients = [client.dict for client in clients_object]
-        return clients
+        return ClientUseCases._collection_response(
+            clients_object, fields, if_none_match, lambda: client_serializer_for(fields).dumps_many(clients_object)
+        )
+
+    def export(self, **kwargs) -> Iterator[str]:
+        for clients in ClientRepository.stream(**kwargs):
+            yield client_serializer.lines(clients)
 
-    def retrieve(self, id: str) -> dict[Client]:
-        client = ClientRepository.retrieve(id)
+    def retrieve(self, id: str, fields: str = None, if_none_match: str = None) -> RawJSON:
+        try:
+            fields = ClientUseCases._parse_fields(fields)
+        except InvalidFieldsException as e:
+            return dict(message=str(e)), HTTPStatus.BAD_REQUEST
+
+        version = ClientRepository.version(id) if if_none_match else None
+        etag = version and ClientUseCases._client_etag(id, version, fields)
+
+        if etag and ClientUseCases._etag_matches(etag, if_none_match):
+            return ClientUseCases._not_modified(etag)
+
+        client = ClientRepository.retrieve(id, fields=fields)
 
         if not client:
             return NOT_FOUND_CLIENT_MESSAGE, HTTPStatus.NOT_FOUND
 
-        return client.dict
+        version = getattr(client, "updated_dt", None) or version or ClientRepository.version(id)
+        headers = {ETAG_HEADER: ClientUseCases._client_etag(id, version, fields)}
+
+        return client_serializer_for(fields).dumps(client), HTTPStatus.OK, headers
 
-    def create(self, **kwargs) -> tuple[dict[Client], HTTPStatus]:
+    def create(self, **kwargs) -> tuple[RawJSON, HTTPStatus]:
         try:
             client = ClientUseCases._create_client_object(**kwargs)
             ClientRepository.create(client)
 
-            return client.dict, HTTPStatus.CREATED
-        except MissingAttributeException as e:
+            return client_serializer.dumps(client), HTTPStatus.CREATED
+        except (MissingAttributeException, InvalidAttributeException) as e:
             return dict(message=str(e)), HTTPStatus.BAD_REQUEST
         except DuplicateError as e:
             return dict(message=str(e)), HTTPStatus.BAD_REQUEST
         except Exception as e:
             raise e
 
-    def update(self, **kwargs) -> dict[Client]:
-        ClientUseCases._get_attribute_or_raise_exception("id", **kwargs)
-        fields = ClientUseCases._delete_unwanted_fields(*["created_dt", "updated_dt", "document"], **kwargs)
+    def bulk_create(self, payload: list[dict]) -> tuple[dict, HTTPStatus]:
+        error = ClientUseCases._validate_bulk_payload(payload)
 
-        if "full_name" in fields:
-            fields["name"] = fields.get("full_name")
-            fields.pop("full_name")
+        if error:
+            return error
+
+        results = ClientUseCases._bulk_create_clients(payload)
+
+        return ClientUseCases._bulk_create_summary(results), HTTPStatus.OK
+
+    def import_csv(self, file: IO[str], chunk_size: int = None) -> tuple[dict, HTTPStatus]:
+        chunk_size = chunk_size or current_app.config["CLIENT_IMPORT_CHUNK_SIZE"]
+        reader = csv.DictReader(file)
+        error = ClientUseCases._validate_csv_columns(reader)
+
+        if error:
+            return error
+
+        summary = dict(inserted=0, duplicated=0, invalid=0, errors=[])
+
+        for chunk, lines in ClientUseCases._csv_chunks(reader, chunk_size):
+            ClientUseCases._import_chunk(chunk, lines, summary)
+
+        return summary, HTTPStatus.OK
+
+    def upsert(self, document: str, **kwargs) -> RawJSON:
+        try:
+            client = ClientUseCases._create_client_object(**{**kwargs, "document": document})
+        except (MissingAttributeException, InvalidAttributeException) as e:
+            return dict(message=str(e)), HTTPStatus.BAD_REQUEST
+
+        return client_serializer.dumps(ClientRepository.upsert(client))
+
+    def bulk_upsert(self, payload: list[dict]) -> tuple[dict, HTTPStatus]:
+        error = ClientUseCases._validate_bulk_payload(payload)
+
+        if error:
+            return error
+
+        results, clients = ClientUseCases._create_upsert_client_objects(payload)
+        ClientRepository.bulk_upsert(clients)
+
+        return ClientUseCases._bulk_upsert_summary(results), HTTPStatus.OK
 
+    def update(self, **kwargs) -> RawJSON:
         try:
-            client = Client(**fields)
+            client = ClientUseCases._create_update_client_object(**kwargs)
         except TypeError as e:
             return dict(message=str(e)), HTTPStatus.BAD_REQUEST
 
@@ -62,7 +197,7 @@ class ClientUseCases:
         except NotFoundException:
             return NOT_FOUND_CLIENT_MESSAGE, HTTPStatus.NOT_FOUND
 
-        return new_client.dict
+        return client_serializer.dumps(new_client)
 
     def delete(self, id: str) -> tuple[None, HTTPStatus]:
         try:
@@ -72,6 +207,30 @@ class ClientUseCases:
 
         return None, HTTPStatus.NO_CONTENT
 
+    def bulk_delete(self, payload: list[str]) -> tuple[dict, HTTPStatus]:
+        error = ClientUseCases._validate_bulk_delete_payload(payload)
+
+        if error:
+            return error
+
+        ids = list(dict.fromkeys(payload))
+        deleted = ClientRepository.bulk_delete(ids)
+
+        return dict(deleted=deleted, not_found=len(ids) - deleted), HTTPStatus.OK
+
+    @classmethod
+    def _parse_fields(cls, fields: str = None) -> tuple[str]:
+        if not fields:
+            return None
+
+        fields = tuple(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+        invalid_fields = [field for field in fields if field not in client_serializer.fields]
+
+        if invalid_fields:
+            raise InvalidFieldsException(f"Invalid fields: {', '.join(invalid_fields)}")
+
+        return fields or None
+
     @classmethod
     def _create_client_object(cls, **kwargs) -> Client:
         attrs = dict(
@@ -86,12 +245,225 @@ class ClientUseCases:
 
         return Client(**attrs)
 
+    @classmethod
+    def _create_update_client_object(cls, **kwargs) -> Client:
+        cls._get_attribute_or_raise_exception("id", **kwargs)
+        fields = cls._delete_unwanted_fields(*["created_dt", "updated_dt", "document"], **kwargs)
+
+        if "full_name" in fields:
+            fields["name"] = fields.get("full_name")
+            fields.pop("full_name")
+
+        return Client(**fields)
+
+    @classmethod
+    def _validate_bulk_payload(cls, payload: list[dict]) -> tuple[dict, HTTPStatus]:
+        max_items = current_app.config["CLIENT_BULK_MAX_ITEMS"]
+
+        if not isinstance(payload, list):
+            return dict(message="The payload must be a list of clients"), HTTPStatus.BAD_REQUEST
+
+        if len(payload) > max_items:
+            return dict(message=f"The payload can't have more than {max_items} clients"), HTTPStatus.BAD_REQUEST
+
+        return None
+
+    @classmethod
+    def _validate_bulk_delete_payload(cls, payload: list[str]) -> tuple[dict, HTTPStatus]:
+        error = cls._validate_bulk_payload(payload)
+
+        if error:
+            return error
+
+        if not all(isinstance(id, str) for id in payload):
+            return dict(message="The payload must be a list of client ids"), HTTPStatus.BAD_REQUEST
+
+        return None
+
+    @classmethod
+    def _validate_csv_columns(cls, reader: csv.DictReader) -> tuple[dict, HTTPStatus]:
+        missing_columns = [column for column in CSV_COLUMNS if column not in (reader.fieldnames or [])]
+
+        if missing_columns:
+            return dict(message=f"Missing the following columns: {', '.join(missing_columns)}"), HTTPStatus.BAD_REQUEST
+
+        return None
+
+    @classmethod
+    def _csv_chunks(cls, reader: csv.DictReader, chunk_size: int) -> Iterator[tuple[list[dict], list[int]]]:
+        chunk, lines = [], []
+
+        for row in reader:
+            chunk.append({column: value for column, value in row.items() if column and value})
+            lines.append(reader.line_num)
+
+            if len(chunk) == chunk_size:
+                yield chunk, lines
+                chunk, lines = [], []
+
+        if chunk:
+            yield chunk, lines
+
+    @classmethod
+    def _bulk_create_clients(cls, payload: list[dict], batch_size: int = None) -> list[dict]:
+        results, clients = cls._create_bulk_client_objects(payload)
+
+        duplicates = ClientRepository.bulk_create([client for _, client in clients.values()], batch_size=batch_size)
+
+        return cls._bulk_create_results(results, clients, duplicates)
+
+    @classmethod
+    def _bulk_create_results(
+        cls, results: list[dict], clients: dict[str, tuple[int, Client]], duplicates: list[Client]
+    ) -> list[dict]:
+        duplicated_documents = {client.document for client in duplicates}
+
+        for index, client in clients.values():
+            if client.document in duplicated_documents:
+                results[index] = dict(index=index, status="duplicated", message=DUPLICATE_CLIENT_MESSAGE)
+            else:
+                results[index] = dict(index=index, status="created", id=client.id)
+
+        return results
+
+    @classmethod
+    def _bulk_create_summary(cls, results: list[dict]) -> dict:
+        summary = {status: 0 for status in ["created", "duplicated", "invalid"]}
+
+        for result in results:
+            summary[result["status"]] += 1
+
+        return dict(**summary, results=results)
+
+    @classmethod
+    def _import_chunk(cls, chunk: list[dict], lines: list[int], summary: dict) -> None:
+        cls._add_import_results(cls._bulk_create_clients(chunk, batch_size=len(chunk)), lines, summary)
+
+    @classmethod
+    def _add_import_results(cls, results: list[dict], lines: list[int], summary: dict) -> None:
+        max_errors = current_app.config["CLIENT_IMPORT_MAX_REPORTED_ERRORS"]
+
+        for result in results:
+            if result["status"] == "created":
+                summary["inserted"] += 1
+                continue
+
+            summary[result["status"]] += 1
+
+            if len(summary["errors"]) < max_errors:
+                summary["errors"].append(
+                    dict(line=lines[result["index"]], status=result["status"], message=result["message"])
+                )
+
+    @classmethod
+    def _create_bulk_client_objects(cls, payload: list[dict]) -> tuple[list[dict], dict[str, tuple[int, Client]]]:
+        results = [None] * len(payload)
+        clients = {}
+
+        for index, kwargs in enumerate(payload):
+            try:
+                client = cls._create_client_object(**kwargs)
+            except (MissingAttributeException, InvalidAttributeException, TypeError) as e:
+                results[index] = dict(index=index, status="invalid", message=str(e))
+                continue
+
+            if client.document in clients:
+                results[index] = dict(index=index, status="duplicated", message=DUPLICATE_CLIENT_MESSAGE)
+                continue
+
+            clients[client.document] = index, client
+
+        return results, clients
+
+    @classmethod
+    def _create_upsert_client_objects(cls, payload: list[dict]) -> tuple[list[dict], list[Client]]:
+        results = []
+        clients = {}
+
+        for index, kwargs in enumerate(payload):
+            try:
+                client = cls._create_client_object(**kwargs)
+            except (MissingAttributeException, InvalidAttributeException, TypeError) as e:
+                results.append(dict(index=index, status="invalid", message=str(e)))
+                continue
+
+            clients[client.document] = client
+            results.append(dict(index=index, status="upserted", document=client.document))
+
+        return results, list(clients.values())
+
+    @classmethod
+    def _bulk_upsert_summary(cls, results: list[dict]) -> dict:
+        upserted = sum(result["status"] == "upserted" for result in results)
+
+        return dict(upserted=upserted, invalid=len(results) - upserted, results=results)
+
     @classmethod
     def _get_attribute_or_raise_exception(cls, attr, **kwargs) -> str:
-        if attr in kwargs:
-            return kwargs.get(attr)
+        if attr not in kwargs:
+            raise MissingAttributeException(f"Missing the following attribute: '{attr}'")
+
+        if not isinstance(kwargs[attr], str):
+            raise InvalidAttributeException(f"The following attribute must be a string: '{attr}'")
+
+        return kwargs[attr]
+
+    @classmethod
+    def _count_filters(cls, q: str = None, **kwargs) -> dict:
+        return dict(query=q, **cls._delete_unwanted_fields("offset", "limit", "cursor", "fields", **kwargs))
 
-        raise MissingAttributeException(f"Missing the following attribute: '{attr}'")
+    @classmethod
+    def _with_total_count(cls, response: tuple, count: tuple[int, bool]) -> tuple[RawJSON, HTTPStatus, dict]:
+        """The total of the clients matching the filters, whatever the page. When the exact header is false, it is
+        either the planner estimate or CLIENT_COUNT_MAX for the counts stopped there."""
+        data, status, headers = response
+        total, exact = count
+
+        return data, status, {**headers, TOTAL_COUNT_HEADER: str(total), TOTAL_COUNT_EXACT_HEADER: str(exact).lower()}
+
+    @classmethod
+    def _client_etag(cls, id: str, version: datetime, fields: tuple[str] = None) -> str:
+        """Strong ETag of a client representation. Every write of a client sets its updated_dt, and the fields
+        change the representation."""
+        return quote_etag(cls._digest(id, version.isoformat(), *(fields or ())))
+
+    @classmethod
+    def _collection_response(
+        cls, objs: list, fields: tuple[str], if_none_match: str, dumps: Callable[[], RawJSON], *extra: str
+    ) -> tuple[RawJSON, HTTPStatus, dict]:
+        """A list of clients with a weak ETag. It is computed from the id and updated_dt of the listed clients,
+        plus the ``extra`` parts of the response, e.g. the next cursor of a page, so a matching If-None-Match skips
+        the serialization, or from the serialized list when the fields leave them out."""
+        data = None
+
+        if fields and not {"id", "updated_dt"} <= set(fields):
+            data = dumps()
+            etag = quote_etag(hashlib.sha1(data).hexdigest(), weak=True)
+        else:
+            versions = (f"{obj.id}:{obj.updated_dt.isoformat()}" for obj in objs)
+            etag = quote_etag(cls._digest(*(fields or ()), *versions, *extra), weak=True)
+
+        if cls._etag_matches(etag, if_none_match):
+            return cls._not_modified(etag)
+
+        return data or dumps(), HTTPStatus.OK, {ETAG_HEADER: etag}
+
+    @classmethod
+    def _etag_matches(cls, etag: str, if_none_match: str = None) -> bool:
+        """Weak comparison, the one of If-None-Match, so a strong ETag matches its weak form too."""
+        return bool(if_none_match) and parse_etags(if_none_match).contains_weak(unquote_etag(etag)[0])
+
+    @classmethod
+    def _not_modified(cls, etag: str) -> tuple[RawJSON, HTTPStatus, dict]:
+        return RawJSON(b""), HTTPStatus.NOT_MODIFIED, {ETAG_HEADER: etag}
+
+    @classmethod
+    def _digest(cls, *parts: str) -> str:
+        return hashlib.sha1("\n".join(parts).encode()).hexdigest()
+
+    @classmethod
+    def _is_true(cls, value: str = None) -> bool:
+        return value is not None and value.strip().lower() in ("1", "true", "yes")
 
     @classmethod
     def _delete_unwanted_fields(cls, *args, **kwargs) -> dict:
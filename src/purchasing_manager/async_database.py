@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from flask import Flask, current_app
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker
+
+from .pool import PoolMetrics, pool_options
+
+if TYPE_CHECKING:  # pragma: no cover
+    from sqlalchemy.ext.asyncio import AsyncEngine, async_scoped_session
+
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+class AsyncSQLAlchemy:
+    """Async counterpart of the Flask-SQLAlchemy ``db`` object used by the ASGI mode.
+
+    The engine is only created on first use, so the WSGI mode never imports the async drivers, nor the asyncio
+    extension of SQLAlchemy.
+    Sessions are scoped to the running asyncio task, which is one request in the ASGI app.
+    """
+
+    def init_app(self, app: Flask) -> None:
+        app.config.setdefault("SQLALCHEMY_ASYNC_DATABASE_URI", None)
+        app.extensions["async_sqlalchemy"] = _AsyncState()
+
+    @property
+    def engine(self) -> AsyncEngine:
+        state = self._state()
+
+        if state.engine is None:
+            from sqlalchemy.ext.asyncio import create_async_engine
+
+            url = make_url(async_database_uri(current_app.config))
+            state.engine = create_async_engine(
+                url, **pool_options(url, current_app.config["SQLALCHEMY_ENGINE_OPTIONS"])
+            )
+            PoolMetrics.instrument(state.engine.sync_engine)
+
+        return state.engine
+
+    @property
+    def session(self) -> async_scoped_session:
+        state = self._state()
+
+        if state.session is None:
+            from sqlalchemy.ext.asyncio import AsyncSession, async_scoped_session
+
+            factory = sessionmaker(bind=self.engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+            state.session = async_scoped_session(factory, scopefunc=asyncio.current_task)
+
+        return state.session
+
+    async def remove(self) -> None:
+        session = self._state().session
+
+        if session is not None:
+            await session.remove()
+
+    async def dispose(self) -> None:
+        state = self._state()
+
+        if state.engine is not None:
+            await state.engine.dispose()
+            state.engine, state.session = None, None
+
+    def _state(self) -> _AsyncState:
+        return current_app.extensions["async_sqlalchemy"]
+
+
+class _AsyncState:
+    def __init__(self):
+        self.engine = None
+        self.session = None
+
+
+def async_database_uri(config: dict) -> str:
+    if config.get("SQLALCHEMY_ASYNC_DATABASE_URI"):
+        return config["SQLALCHEMY_ASYNC_DATABASE_URI"]
+
+    url = make_url(config["SQLALCHEMY_DATABASE_URI"])
+    backend = url.get_backend_name()
+
+    if backend in ASYNC_DRIVERS:
+        url = url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+    return str(url)
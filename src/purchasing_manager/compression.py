@@ -0,0 +1,187 @@
+import zlib
+from typing import Iterable, Iterator
+
+from flask import Flask, Response, request
+from werkzeug.http import parse_accept_header, quote_etag, unquote_etag
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+COMPRESSIBLE_MIMETYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "text/css",
+    "text/html",
+    "text/javascript",
+    "text/plain",
+)
+UNCOMPRESSED_STATUSES = (204, 206, 304)
+
+
+class GzipCompressor:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliCompressor:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdCompressor:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+# By server preference, for the encodings the client accepts with the same quality
+COMPRESSORS = {
+    **({"zstd": (ZstdCompressor, "COMPRESSION_ZSTD_LEVEL")} if zstandard else {}),
+    **({"br": (BrotliCompressor, "COMPRESSION_BROTLI_LEVEL")} if brotli else {}),
+    "gzip": (GzipCompressor, "COMPRESSION_GZIP_LEVEL"),
+}
+
+
+class ResponseCompression:
+    """Negotiates the Content-Encoding of the responses from their Accept-Encoding header.
+
+    Bodies shorter than ``min_size`` are sent as they are, since the framing of the encodings outweighs the
+    savings. Streamed bodies are compressed chunk by chunk, each one flushed so the client can decode it right
+    away, and nothing is buffered whole.
+    """
+
+    def __init__(self, encodings: dict[str, tuple[type, int]], min_size: int):
+        self.encodings = encodings
+        self.min_size = min_size
+
+    def negotiate(self, accept_encoding: str = None) -> str:
+        if not accept_encoding or not self.encodings:
+            return None
+
+        return parse_accept_header(accept_encoding).best_match(list(self.encodings))
+
+    def start(self, status: int, headers, encoding: str, size: int = None):
+        """The compressor of a response, or None when it goes out as it is. Sets the Vary, Content-Encoding and
+        ETag headers, which can be a dict or Werkzeug Headers. ``size`` is the one of whole bodies, None for the
+        streamed ones."""
+        if not self.is_compressible(status, headers):
+            return None
+
+        _add_vary(headers, "Accept-Encoding")
+
+        if encoding is None or (size is not None and size < self.min_size):
+            return None
+
+        headers["Content-Encoding"] = encoding
+        headers.pop("Content-Length", None)
+        _weaken_etag(headers)
+        compressor_class, level = self.encodings[encoding]
+
+        return compressor_class(level)
+
+    def is_compressible(self, status: int, headers) -> bool:
+        mimetype = headers.get("Content-Type", "").split(";")[0].strip()
+
+        return (
+            status not in UNCOMPRESSED_STATUSES
+            and "Content-Encoding" not in headers
+            and mimetype in COMPRESSIBLE_MIMETYPES
+        )
+
+    def process_response(self, response: Response, accept_encoding: str = None) -> Response:
+        """Compress a Flask response in place."""
+        size = None if response.is_streamed else response.calculate_content_length()
+        compressor = self.start(response.status_code, response.headers, self.negotiate(accept_encoding), size)
+
+        if compressor is None:
+            return response
+
+        if response.is_streamed:
+            response.response = compress_chunks(compressor, response.response)
+        else:
+            response.set_data(compressor.compress(response.get_data()) + compressor.finish())
+
+        return response
+
+
+def compress_chunks(compressor, chunks: Iterable[bytes | str]) -> Iterator[bytes]:
+    try:
+        for chunk in chunks:
+            yield compressor.compress(chunk.encode() if isinstance(chunk, str) else chunk) + compressor.flush()
+
+        yield compressor.finish()
+    finally:
+        if hasattr(chunks, "close"):
+            chunks.close()
+
+
+def _add_vary(headers, header: str) -> None:
+    vary = [value.strip() for value in headers.get("Vary", "").split(",") if value.strip()]
+
+    if header.lower() not in (value.lower() for value in vary):
+        headers["Vary"] = ", ".join([*vary, header])
+
+
+def _weaken_etag(headers) -> None:
+    """A strong ETag promises byte equal bodies, which the encodings break. The weak form still matches the
+    If-None-Match of the clients, which use the weak comparison."""
+    etag = headers.get("ETag")
+
+    if etag:
+        headers["ETag"] = quote_etag(unquote_etag(etag)[0], weak=True)
+
+
+def create_compression(config: dict) -> ResponseCompression:
+    """The encodings of the installed libraries, e.g. only gzip without the brotli and zstandard packages, or none
+    when COMPRESSION_ENABLED is false."""
+    encodings = {}
+
+    if config["COMPRESSION_ENABLED"]:
+        encodings = {encoding: (compressor, config[level]) for encoding, (compressor, level) in COMPRESSORS.items()}
+
+    return ResponseCompression(encodings, config["COMPRESSION_MIN_SIZE"])
+
+
+def init_app(app: Flask) -> None:
+    compression = create_compression(app.config)
+    app.extensions["compression"] = compression
+
+    @app.after_request
+    def compress_response(response: Response) -> Response:
+        accept_encoding = request.headers.get("Accept-Encoding") if request.method != "HEAD" else None
+
+        return compression.process_response(response, accept_encoding)
@@ -8,25 +8,96 @@ from .application.exceptions import ConfigurationNotValid
 
 load_dotenv()
 
+ENGINE_OPTIONS_FROM_ENV = {
+    "pool_size": int,
+    "max_overflow": int,
+    "pool_timeout": float,
+    "pool_recycle": int,
+    "pool_pre_ping": lambda value: value.lower() in ("1", "true", "yes"),
+    "pool_use_lifo": lambda value: value.lower() in ("1", "true", "yes"),
+}
+
+
+def _engine_options(**defaults) -> dict:
+    """Engine options of a config class. Each one can be overridden by the SQLALCHEMY_<OPTION> env var, e.g.
+    SQLALCHEMY_POOL_SIZE=20."""
+    options = dict(defaults)
+
+    for option, cast in ENGINE_OPTIONS_FROM_ENV.items():
+        value = os.environ.get(f"SQLALCHEMY_{option.upper()}")
+
+        if value is not None:
+            options[option] = cast(value)
+
+    return options
+
+
+def _route_rates(value: str) -> dict[str, float]:
+    """Sample rates by route, from a comma separated list of route=rate, e.g. /api/client=0.01."""
+    rates = {}
+
+    for item in filter(None, value.split(",")):
+        route, _, rate = item.rpartition("=")
+        rates[route.strip()] = float(rate)
+
+    return rates
+
 
 class BaseConfig:
+    CLIENT_BULK_BATCH_SIZE = int(os.environ.get("CLIENT_BULK_BATCH_SIZE", 500))
+    CLIENT_BULK_MAX_ITEMS = int(os.environ.get("CLIENT_BULK_MAX_ITEMS", 10000))
+    CLIENT_CACHE_BACKEND = os.environ.get("CLIENT_CACHE_BACKEND", "memory")
+    CLIENT_CACHE_MAX_SIZE = int(os.environ.get("CLIENT_CACHE_MAX_SIZE", 10000))
+    CLIENT_CACHE_REDIS_MAX_IDLE_CONNECTIONS = int(os.environ.get("CLIENT_CACHE_REDIS_MAX_IDLE_CONNECTIONS", 10))
+    CLIENT_CACHE_REDIS_URL = os.environ.get("CLIENT_CACHE_REDIS_URL", "redis://localhost:6379/0")
+    CLIENT_CACHE_TTL = float(os.environ.get("CLIENT_CACHE_TTL", 30))
+    CLIENT_COUNT_CACHE_TTL = float(os.environ.get("CLIENT_COUNT_CACHE_TTL", 5))
+    CLIENT_COUNT_MAX = int(os.environ.get("CLIENT_COUNT_MAX", 10000))
+    CLIENT_EXPORT_BATCH_SIZE = int(os.environ.get("CLIENT_EXPORT_BATCH_SIZE", 1000))
+    CLIENT_IMPORT_CHUNK_SIZE = int(os.environ.get("CLIENT_IMPORT_CHUNK_SIZE", 5000))
+    CLIENT_IMPORT_MAX_REPORTED_ERRORS = int(os.environ.get("CLIENT_IMPORT_MAX_REPORTED_ERRORS", 1000))
+    CLIENT_PAGE_MAX_LIMIT = int(os.environ.get("CLIENT_PAGE_MAX_LIMIT", 1000))
+    CLIENT_SEARCH_RANK_WINDOW = int(os.environ.get("CLIENT_SEARCH_RANK_WINDOW", 1000))
+    COMPRESSION_BROTLI_LEVEL = int(os.environ.get("COMPRESSION_BROTLI_LEVEL", 4))
+    COMPRESSION_ENABLED = os.environ.get("COMPRESSION_ENABLED", "true").lower() in ("1", "true", "yes")
+    COMPRESSION_GZIP_LEVEL = int(os.environ.get("COMPRESSION_GZIP_LEVEL", 6))
+    COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", 1024))
+    COMPRESSION_ZSTD_LEVEL = int(os.environ.get("COMPRESSION_ZSTD_LEVEL", 3))
+    JSON_BACKEND = os.environ.get("JSON_BACKEND", "orjson")
+    LAZY_STARTUP = os.environ.get("LAZY_STARTUP", "true").lower() in ("1", "true", "yes")
     LOGS_LEVEL = logging.INFO
+    LOGS_QUEUE_ENABLED = os.environ.get("LOGS_QUEUE_ENABLED", "true").lower() in ("1", "true", "yes")
+    METRICS_FLUSH_INTERVAL = float(os.environ.get("METRICS_FLUSH_INTERVAL", 1))
+    METRICS_MULTIPROCESS_DIR = os.environ.get("METRICS_MULTIPROCESS_DIR")
+    OPENAPI_CACHE_MAX_AGE = int(os.environ.get("OPENAPI_CACHE_MAX_AGE", 300))
+    OPENAPI_SPEC_FILE = os.environ.get("OPENAPI_SPEC_FILE", "")
+    REQUEST_LOG_SAMPLE_RATE = float(os.environ.get("REQUEST_LOG_SAMPLE_RATE", 1))
+    REQUEST_LOG_SAMPLE_RATES = _route_rates(os.environ.get("REQUEST_LOG_SAMPLE_RATES", ""))
+    SERVER_TIMING_ENABLED = os.environ.get("SERVER_TIMING_ENABLED", "true").lower() in ("1", "true", "yes")
+    SLOW_QUERY_THRESHOLD = float(os.environ.get("SLOW_QUERY_THRESHOLD", 0.5))
     SQLALCHEMY_DATABASE_URI = os.environ.get("SQLALCHEMY_DATABASE_URI", "")
+    SQLALCHEMY_ENGINE_OPTIONS = _engine_options(pool_pre_ping=True)
+    SQLALCHEMY_REPLICA_RETRY_AFTER = float(os.environ.get("SQLALCHEMY_REPLICA_RETRY_AFTER", 30))
+    SQLALCHEMY_REPLICA_URIS = [uri for uri in os.environ.get("SQLALCHEMY_REPLICA_URIS", "").split(",") if uri]
     SQLALCHEMY_TRACK_MODIFICATIONS = os.environ.get("SQLALCHEMY_TRACK_MODIFICATIONS", False)
     VERSION = "1.0.0"
 
 
 class DevelopmentConfig(BaseConfig):
     LOGS_LEVEL = logging.DEBUG
+    SQLALCHEMY_ENGINE_OPTIONS = _engine_options(pool_size=5, max_overflow=5, pool_timeout=10, pool_pre_ping=True)
 
 
 class TestingConfig(BaseConfig):
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+    SQLALCHEMY_ENGINE_OPTIONS = _engine_options()
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
 
 class ProductionConfig(BaseConfig):
-    pass
+    SQLALCHEMY_ENGINE_OPTIONS = _engine_options(
+        pool_size=10, max_overflow=20, pool_timeout=5, pool_recycle=1800, pool_pre_ping=True, pool_use_lifo=True
+    )
 
 
 def set_app_config(app: Flask) -> None:
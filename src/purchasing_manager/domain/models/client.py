@@ -5,6 +5,7 @@ from purchasing_manager import db
 
 class Client(db.Model):
     __tablename__ = "client"
+    __table_args__ = (db.Index("ix_client_created_dt_id", "created_dt", "id"),)
 
     id = db.Column(db.String(36), primary_key=True)
     created_dt = db.Column(db.DateTime(timezone=True), default=datetime.now(), nullable=False)
@@ -16,12 +17,16 @@ class Client(db.Model):
 
     @property
     def dict(self):
+        return Client.as_dict(self)
+
+    @staticmethod
+    def as_dict(client) -> dict:
         return {
-            "id": self.id,
-            "created_dt": str(self.created_dt),
-            "updated_dt": str(self.updated_dt),
-            "name": self.name,
-            "document": self.document,
-            "phone": self.phone,
-            "email": self.email,
+            "id": client.id,
+            "created_dt": str(client.created_dt),
+            "updated_dt": str(client.updated_dt),
+            "name": client.name,
+            "document": client.document,
+            "phone": client.phone,
+            "email": client.email,
         }
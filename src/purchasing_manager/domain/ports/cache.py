@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from abc import ABC
+
+
+class CacheBackendABC(ABC):
+    def get_many(self, keys: list[str]) -> list[str]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        raise NotImplementedError
+
+    def delete(self, *keys: str) -> None:
+        raise NotImplementedError
+
+    def incr(self, key: str, ttl: float) -> int:
+        raise NotImplementedError
@@ -1,4 +1,10 @@
+from __future__ import annotations
+
 from abc import ABC
+from datetime import datetime
+from typing import Iterator
+
+from sqlalchemy.engine import Row
 
 from purchasing_manager.domain.models.client import Client
 
@@ -9,13 +15,45 @@ class ClientRepositoryABC(ABC):
         raise NotImplementedError
 
     @classmethod
-    def retrieve(cls, id: str) -> Client:
+    def list_by_cursor(cls, *args, **kwargs) -> tuple[list[Client], str]:
+        raise NotImplementedError
+
+    @classmethod
+    def search(cls, query: str, *args, **kwargs) -> list[Client]:
+        raise NotImplementedError
+
+    @classmethod
+    def count(cls, query: str = None, **kwargs) -> tuple[int, bool]:
+        raise NotImplementedError
+
+    @classmethod
+    def stream(cls, *args, **kwargs) -> Iterator[list[Row]]:
+        raise NotImplementedError
+
+    @classmethod
+    def retrieve(cls, id: str, *args, **kwargs) -> Client:
+        raise NotImplementedError
+
+    @classmethod
+    def version(cls, id: str) -> datetime:
         raise NotImplementedError
 
     @classmethod
     def create(cls, client: Client) -> None:
         raise NotImplementedError
 
+    @classmethod
+    def bulk_create(cls, clients: list[Client], *args, **kwargs) -> list[Client]:
+        raise NotImplementedError
+
+    @classmethod
+    def upsert(cls, client: Client) -> Client:
+        raise NotImplementedError
+
+    @classmethod
+    def bulk_upsert(cls, clients: list[Client], *args, **kwargs) -> None:
+        raise NotImplementedError
+
     @classmethod
     def update(cls, client: Client) -> Client:
         raise NotImplementedError
@@ -23,3 +61,7 @@ class ClientRepositoryABC(ABC):
     @classmethod
     def delete(cls, id: str) -> None:
         raise NotImplementedError
+
+    @classmethod
+    def bulk_delete(cls, ids: list[str], *args, **kwargs) -> int:
+        raise NotImplementedError
@@ -0,0 +1,121 @@
+import atexit
+import logging
+import os
+import queue
+import random
+from logging.handlers import QueueHandler, QueueListener
+from typing import IO
+
+from flask import g, has_app_context
+
+_pipelines = []
+
+
+class LazyPropsFilter(logging.Filter):
+    """Builds the ``props`` extra when it is given as a callable.
+
+    Handler filters only run for the records which passed the logger level, so ``extra={"props": lambda: {...}}``
+    skips the ``json.dumps`` and ``client.dict`` calls of the filtered out records. The props are built in the
+    thread which logs, before the record is queued.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        props = getattr(record, "props", None)
+
+        if callable(props):
+            record.props = props()
+
+        return True
+
+
+class SampledRequestFilter(logging.Filter):
+    """Drops the records of the requests left out of the request log sample."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return not has_app_context() or g.get("log_sampled", True)
+
+
+class RequestLogSampler:
+    """Decides which requests get their request and response logs, with a rate by route and a default one."""
+
+    def __init__(self, rate: float = 1.0, route_rates: dict[str, float] = None):
+        self.rate = rate
+        self.route_rates = route_rates or {}
+
+    def sample(self, route: str) -> bool:
+        rate = self.route_rates.get(route, self.rate)
+
+        return rate >= 1 or random.random() < rate
+
+
+class LogPipeline:
+    """Moves the writes to the log stream out of the request threads.
+
+    Records are formatted by the QueueHandler in the thread which logs, since the JSON formatters read the request
+    context for the correlation id, and a QueueListener thread writes them to the stream. The listener doesn't
+    survive a fork, so it is started again in the child processes, e.g. the gunicorn workers of a preloaded app.
+    """
+
+    def __init__(self, stream: IO[str]):
+        self.stream = stream
+        self.queue = queue.SimpleQueue()
+        self.handlers = []
+        self._listener = None
+
+    def handler(self, formatter: logging.Formatter, *filters: logging.Filter) -> QueueHandler:
+        handler = QueueHandler(self.queue)
+        handler.setFormatter(formatter)
+
+        for log_filter in filters:
+            handler.addFilter(log_filter)
+
+        self.handlers.append(handler)
+
+        return handler
+
+    def start(self) -> None:
+        if self._listener is not None:
+            return
+
+        stream_handler = logging.StreamHandler(self.stream)
+        stream_handler.setFormatter(logging.Formatter("%(message)s"))
+        self._listener = QueueListener(self.queue, stream_handler)
+        self._listener.start()
+
+    def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+    def _restart_after_fork(self) -> None:
+        self.queue = queue.SimpleQueue()
+
+        for handler in self.handlers:
+            handler.queue = self.queue
+
+        self._listener = None
+        self.start()
+
+
+def stream_handler(stream: IO[str], formatter: logging.Formatter, *filters: logging.Filter) -> logging.Handler:
+    """Synchronous handler, used when the log queue is disabled."""
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(formatter)
+
+    for log_filter in filters:
+        handler.addFilter(log_filter)
+
+    return handler
+
+
+def start_pipeline(pipeline: LogPipeline) -> None:
+    pipeline.start()
+    _pipelines.append(pipeline)
+    atexit.register(pipeline.stop)
+    os.register_at_fork(after_in_child=pipeline._restart_after_fork)
+
+
+def stop_pipelines() -> None:
+    """Write the queued records and stop the listeners, e.g. before measuring how long the queue took to drain."""
+    for pipeline in _pipelines:
+        pipeline.stop()
@@ -0,0 +1,496 @@
+import atexit
+import glob
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Iterable
+
+from flask import Flask, Response, g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0, math.inf)
+UNMATCHED_ROUTE = "<unmatched>"
+
+SERVER_TIMING_HEADER = "Server-Timing"
+
+logger = logging.getLogger("purchasing-manager")
+slow_query_logger = logging.getLogger("purchasing-manager.slow-query")
+
+_request_stats = ContextVar("request_stats", default=None)
+_slow_query_threshold = None
+
+
+class Metric:
+    """A metric family whose samples are keyed by their label values, in the order of ``labelnames``."""
+
+    type = None
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            samples = [[list(labels), value] for labels, value in self._samples.items()]
+
+        return dict(type=self.type, help=self.documentation, labelnames=list(self.labelnames), samples=samples)
+
+    def _labels(self, labels: dict) -> tuple:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, value: float = 1, **labels) -> None:
+        key = self._labels(labels)
+
+        with self._lock:
+            self._samples[key] = self._samples.get(key, 0) + value
+
+
+class Gauge(Metric):
+    """Gauge summed across the live processes only, so the gauges of a dead worker don't linger."""
+
+    type = "gauge"
+
+    def inc(self, value: float = 1, **labels) -> None:
+        key = self._labels(labels)
+
+        with self._lock:
+            self._samples[key] = self._samples.get(key, 0) + value
+
+    def dec(self, value: float = 1, **labels) -> None:
+        self.inc(-value, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._samples[self._labels(labels)] = value
+
+
+class Histogram(Metric):
+    """Histogram with fixed buckets. Each sample holds the count of every bucket, not cumulative, plus the sum and
+    the count of the observations."""
+
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._labels(labels)
+        index = next(index for index, bound in enumerate(self.buckets) if value <= bound)
+
+        with self._lock:
+            sample = self._samples.get(key)
+
+            if sample is None:
+                sample = self._samples[key] = [[0] * len(self.buckets), 0.0, 0]
+
+            sample[0][index] += 1
+            sample[1] += value
+            sample[2] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            samples = [
+                [list(labels), [list(counts), total, count]] for labels, (counts, total, count) in self._samples.items()
+            ]
+
+        return dict(
+            type=self.type,
+            help=self.documentation,
+            labelnames=list(self.labelnames),
+            buckets=[_format_value(bound) for bound in self.buckets],
+            samples=samples,
+        )
+
+
+class MetricsRegistry:
+    """In-process registry of the app metrics, rendered in the Prometheus text format.
+
+    With a ``directory``, every process writes its snapshot to ``<directory>/<pid>.json`` at the end of its
+    requests, at most once every ``flush_interval`` seconds, from a background thread every ``flush_interval``
+    seconds and on exit. The metrics endpoint merges the snapshots of all the processes: counters and histograms
+    are summed, gauges are summed across the processes which are still alive. The directory must be emptied before
+    the server starts, like the one of the prometheus_client multiprocess mode.
+
+    prometheus_client is not used because its multiprocess mode only reads the collectors, e.g. the client cache
+    one, of the process serving the scrape, and needs its directory set before it is imported, which the config
+    of the app is not.
+    """
+
+    def __init__(self, directory: str = None, flush_interval: float = 1.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._metrics = {}
+        self._collectors = []
+        self._flushed_at = 0.0
+        self._flush_lock = threading.Lock()
+        self._flusher_pid = None
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets=DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[Metric]]) -> None:
+        """Add a callback which builds metrics from counters kept elsewhere, e.g. the ones of the client cache."""
+        self._collectors.append(collector)
+
+    def snapshot(self) -> dict:
+        metrics = [*self._metrics.values(), *(metric for collector in self._collectors for metric in collector())]
+
+        return {metric.name: metric.snapshot() for metric in metrics}
+
+    def maybe_flush(self) -> None:
+        """Flush unless the snapshot was written less than ``flush_interval`` seconds ago or another thread is
+        writing it. Called at the end of every request, so it never raises."""
+        if not self.directory:
+            return
+
+        self._start_flusher()
+
+        if time.monotonic() - self._flushed_at < self.flush_interval or not self._flush_lock.acquire(blocking=False):
+            return
+
+        try:
+            if time.monotonic() - self._flushed_at >= self.flush_interval:
+                self._write()
+        except OSError:
+            logger.warning("Metrics snapshot not written", exc_info=True)
+        finally:
+            self._flush_lock.release()
+
+    def flush(self) -> None:
+        with self._flush_lock:
+            self._write()
+
+    def collect(self) -> dict:
+        merged = {}
+
+        if not self.directory:
+            _merge(merged, self.snapshot(), alive=True)
+            return merged
+
+        self.flush()
+
+        for path in glob.glob(os.path.join(self.directory, "*.json")):
+            pid = int(os.path.basename(path).split(".")[0])
+
+            try:
+                with open(path) as file:
+                    snapshot = json.load(file)
+            except (OSError, ValueError):
+                continue
+
+            _merge(merged, snapshot, alive=_is_alive(pid))
+
+        return merged
+
+    def render(self) -> str:
+        return "".join(_render_metric(name, metric) for name, metric in sorted(self.collect().items()))
+
+    def _write(self) -> None:
+        """Write the snapshot to a temporary file of its own, then move it over ``<pid>.json``, so the readers never
+        see a partial snapshot."""
+        descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, prefix=f"{os.getpid()}.", suffix=".tmp")
+
+        try:
+            with os.fdopen(descriptor, "w") as file:
+                json.dump(self.snapshot(), file)
+
+            os.replace(temporary_path, os.path.join(self.directory, f"{os.getpid()}.json"))
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.unlink(temporary_path)
+
+            raise
+
+        self._flushed_at = time.monotonic()
+
+    def _start_flusher(self) -> None:
+        """Flush every ``flush_interval`` seconds from a daemon thread, and once more on exit, so the requests which
+        finished right before a worker went idle or was recycled are written too. The thread is started again in the
+        processes forked after it."""
+        if self._flusher_pid == os.getpid():
+            return
+
+        with self._flush_lock:
+            if self._flusher_pid == os.getpid():
+                return
+
+            self._flusher_pid = os.getpid()
+
+        threading.Thread(target=self._flush_periodically, name="metrics-flusher", daemon=True).start()
+        atexit.register(self._flush_quietly)
+
+    def _flush_periodically(self) -> None:
+        while True:
+            time.sleep(self.flush_interval)
+            self._flush_quietly()
+
+    def _flush_quietly(self) -> None:
+        try:
+            self.flush()
+        except OSError:
+            logger.warning("Metrics snapshot not written", exc_info=True)
+
+    def _register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+
+        self._metrics[metric.name] = metric
+
+        return metric
+
+
+class RequestStats:
+    """Database time and statement count of the running request, fed by the cursor events of every engine."""
+
+    __slots__ = ("db_time", "statements")
+
+    def __init__(self):
+        self.db_time = 0.0
+        self.statements = 0
+
+
+def start_request_stats() -> RequestStats:
+    stats = RequestStats()
+    _request_stats.set(stats)
+
+    return stats
+
+
+def current_request_stats() -> RequestStats:
+    return _request_stats.get()
+
+
+def server_timing(stats: RequestStats, duration: float) -> str:
+    """Server-Timing header value with the database time and statement count of the request and its total time."""
+    return f'db;dur={stats.db_time * 1000:.2f};desc="statements: {stats.statements}", total;dur={duration * 1000:.2f}'
+
+
+class HttpMetrics:
+    """The request metrics of both the WSGI and the ASGI modes."""
+
+    def __init__(self, registry: MetricsRegistry):
+        self.registry = registry
+        self.requests = registry.histogram(
+            "http_request_duration_seconds", "Request latency", ["method", "route", "status"]
+        )
+        self.in_flight = registry.gauge("http_requests_in_flight", "Requests being handled", ["method", "route"])
+        self.db_time = registry.histogram(
+            "http_request_db_duration_seconds", "Time spent on database statements by request", ["method", "route"]
+        )
+
+    def started(self, method: str, route: str) -> RequestStats:
+        self.in_flight.inc(method=method, route=route)
+
+        return start_request_stats()
+
+    def finished(self, method: str, route: str, status: int, duration: float, stats: RequestStats) -> None:
+        self.in_flight.dec(method=method, route=route)
+        self.requests.observe(duration, method=method, route=route, status=status)
+        self.db_time.observe(stats.db_time, method=method, route=route)
+        self.registry.maybe_flush()
+
+
+def init_app(app: Flask) -> None:
+    registry = MetricsRegistry(app.config["METRICS_MULTIPROCESS_DIR"], app.config["METRICS_FLUSH_INTERVAL"])
+    http_metrics = HttpMetrics(registry)
+    app.extensions["metrics"] = registry
+    app.extensions["http_metrics"] = http_metrics
+    instrument_engines(app.config["SLOW_QUERY_THRESHOLD"])
+
+    client_cache = app.extensions.get("client_cache")
+
+    if client_cache is not None:
+        registry.register_collector(lambda: cache_metrics(client_cache))
+
+    @app.before_request
+    def start_request_metrics():
+        g.metrics_route = current_route()
+        g.metrics_started = time.perf_counter()
+        g.metrics_stats = http_metrics.started(request.method, g.metrics_route)
+
+    @app.after_request
+    def record_request_metrics(response):
+        if app.config["SERVER_TIMING_ENABLED"] and "metrics_started" in g:
+            duration = time.perf_counter() - g.metrics_started
+            response.headers[SERVER_TIMING_HEADER] = server_timing(g.metrics_stats, duration)
+
+        _finish_request(http_metrics, response.status_code)
+
+        return response
+
+    @app.teardown_request
+    def record_failed_request_metrics(exception=None):
+        _finish_request(http_metrics, 500)
+        _request_stats.set(None)
+
+
+def instrument_engines(slow_query_threshold: float = None) -> None:
+    """Time the statements of every engine, the binds of the replicas and the async engine included.
+
+    The statements which take at least ``slow_query_threshold`` seconds are logged by the slow query logger, with
+    their parameters redacted. ``None`` disables the slow query log.
+    """
+    global _slow_query_threshold
+    _slow_query_threshold = slow_query_threshold
+
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def cache_metrics(client_cache) -> list[Metric]:
+    requests = Counter("client_cache_requests_total", "Client cache lookups by result", ["result"])
+
+    for result, value in client_cache.stats().items():
+        requests.inc(value, result=result)
+
+    return [requests]
+
+
+def metrics_response(registry: MetricsRegistry) -> Response:
+    return Response(registry.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def current_route() -> str:
+    return request.url_rule.rule if request.url_rule else UNMATCHED_ROUTE
+
+
+def _finish_request(http_metrics: HttpMetrics, status: int) -> None:
+    started = g.pop("metrics_started", None)
+
+    if started is not None:
+        duration = time.perf_counter() - started
+        http_metrics.finished(request.method, g.metrics_route, status, duration, g.metrics_stats)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    duration = time.perf_counter() - context._metrics_started
+    stats = _request_stats.get()
+
+    if stats is not None:
+        stats.db_time += duration
+        stats.statements += 1
+
+    if _slow_query_threshold is not None and duration >= _slow_query_threshold:
+        slow_query_logger.warning(
+            "Slow query",
+            extra={
+                "props": {
+                    "duration_ms": round(duration * 1000, 2),
+                    "statement": statement,
+                    "parameters": _redact(parameters, executemany),
+                    "database": conn.engine.url.database,
+                }
+            },
+        )
+
+
+def _redact(parameters, executemany: bool):
+    """Keep the type of each parameter but not its value, which may be personal data, e.g. a document."""
+    if executemany:
+        return dict(rows=len(parameters), first=_redact(parameters[0], False) if parameters else None)
+
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+
+    return [type(value).__name__ for value in parameters or ()]
+
+
+def _merge(merged: dict, snapshot: dict, alive: bool) -> None:
+    for name, metric in snapshot.items():
+        if metric["type"] == "gauge" and not alive:
+            continue
+
+        target = merged.setdefault(name, {**metric, "samples": {}})
+        samples = target["samples"]
+
+        for labels, value in metric["samples"]:
+            key = tuple(labels)
+
+            if metric["type"] == "histogram":
+                counts, total, count = samples.get(key, ([0] * len(value[0]), 0.0, 0))
+                samples[key] = ([a + b for a, b in zip(counts, value[0])], total + value[1], count + value[2])
+            else:
+                samples[key] = samples.get(key, 0) + value
+
+
+def _render_metric(name: str, metric: dict) -> str:
+    lines = [f"# HELP {name} {metric['help']}", f"# TYPE {name} {metric['type']}"]
+    for labels, value in sorted(metric["samples"].items()):
+        pairs = list(zip(metric["labelnames"], labels))
+
+        if metric["type"] != "histogram":
+            lines.append(f"{name}{_format_labels(pairs)} {_format_value(value)}")
+            continue
+
+        counts, total, count = value
+        cumulative = 0
+
+        for bound, bucket_count in zip(metric["buckets"], counts):
+            cumulative += bucket_count
+            lines.append(f"{name}_bucket{_format_labels([*pairs, ('le', bound)])} {cumulative}")
+
+        lines.append(f"{name}_sum{_format_labels(pairs)} {_format_value(total)}")
+        lines.append(f"{name}_count{_format_labels(pairs)} {count}")
+
+    return "\n".join(lines) + "\n"
+
+
+def _format_labels(pairs: list) -> str:
+    if not pairs:
+        return ""
+
+    escaped = (
+        f'{name}="' + str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') + '"'
+        for name, value in pairs
+    )
+
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _is_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+    return True
@@ -0,0 +1,162 @@
+import threading
+import time
+import weakref
+
+import flask_sqlalchemy
+from sqlalchemy import event, orm
+from sqlalchemy.engine import URL, Engine
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import Pool, QueuePool
+
+QUEUE_POOL_OPTIONS = ("pool_size", "max_overflow", "pool_timeout", "pool_use_lifo")
+
+
+class PoolMetrics:
+    """Counters of a connection pool, fed by the SQLAlchemy pool events of its engine.
+
+    ``checkouts`` and ``checkins`` count every connection handed out and given back, ``connects`` every new DBAPI
+    connection and ``invalidations`` every connection thrown away after an error. The wait counters are only fed
+    by an InstrumentedQueuePool, the only pool which can make a request wait for a connection.
+    """
+
+    _engines = weakref.WeakKeyDictionary()
+
+    def __init__(self):
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.soft_invalidations = 0
+        self.timeouts = 0
+        self.waits = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def instrument(cls, engine: Engine) -> "PoolMetrics":
+        metrics = cls()
+
+        for name in ("connect", "checkout", "checkin", "invalidate", "soft_invalidate"):
+            event.listen(engine, name, getattr(metrics, f"_on_{name}"))
+
+        if isinstance(engine.pool, InstrumentedQueuePool):
+            engine.pool.metrics = metrics
+
+        cls._engines[engine] = metrics
+
+        return metrics
+
+    @classmethod
+    def for_engine(cls, engine: Engine) -> "PoolMetrics":
+        return cls._engines.get(engine)
+
+    def observe_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.waits += 1
+            self.wait_time_total += seconds
+            self.wait_time_max = max(self.wait_time_max, seconds)
+            self.timeouts += timed_out
+
+    def snapshot(self, pool: Pool) -> dict:
+        with self._lock:
+            stats = dict(
+                pool_class=type(pool).__name__,
+                size=None,
+                checked_in=None,
+                checked_out=self.checkouts - self.checkins,
+                overflow=None,
+                connects=self.connects,
+                checkouts=self.checkouts,
+                invalidations=self.invalidations,
+                soft_invalidations=self.soft_invalidations,
+                timeouts=self.timeouts,
+                waits=self.waits,
+                wait_time_ms_total=round(self.wait_time_total * 1000, 3),
+                wait_time_ms_max=round(self.wait_time_max * 1000, 3),
+            )
+
+        if isinstance(pool, QueuePool):
+            stats.update(
+                size=pool.size(), checked_in=pool.checkedin(), checked_out=pool.checkedout(), overflow=pool.overflow()
+            )
+
+        return stats
+
+    def _increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        self._increment("connects")
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        self._increment("checkouts")
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        self._increment("checkins")
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        self._increment("invalidations")
+
+    def _on_soft_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        self._increment("soft_invalidations")
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool which reports how long each checkout waited for a free connection.
+
+    There is no pool event fired before a checkout starts waiting, so the wait is timed around ``_do_get``.
+    """
+
+    metrics = None
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        pool.metrics = self.metrics
+
+        return pool
+
+    def _do_get(self):
+        started = time.perf_counter()
+        timed_out = False
+
+        try:
+            return super()._do_get()
+        except TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            if self.metrics:
+                self.metrics.observe_wait(time.perf_counter() - started, timed_out)
+
+
+class SQLAlchemy(flask_sqlalchemy.SQLAlchemy):
+    def create_session(self, options: dict) -> orm.sessionmaker:
+        from .routing import RoutingSession
+
+        return orm.sessionmaker(class_=RoutingSession, db=self, **options)
+
+    def create_engine(self, sa_url: URL, engine_opts: dict) -> Engine:
+        engine = super().create_engine(sa_url, pool_options(sa_url, engine_opts))
+        PoolMetrics.instrument(engine)
+
+        return engine
+
+
+def pool_stats(engine: Engine) -> dict:
+    metrics = PoolMetrics.for_engine(engine)
+
+    return metrics.snapshot(engine.pool) if metrics else None
+
+
+def pool_options(url: URL, options: dict) -> dict:
+    """SQLite runs on a NullPool or a StaticPool, which don't take the queue options. Every other database gets an
+    InstrumentedQueuePool unless a pool class is configured."""
+    if url.get_backend_name() == "sqlite":
+        return {key: value for key, value in options.items() if key not in QUEUE_POOL_OPTIONS}
+
+    if url.get_dialect().is_async:
+        return options
+
+    return {"poolclass": InstrumentedQueuePool, **options}
@@ -0,0 +1,376 @@
+import io
+import json
+import logging
+import time
+from http import HTTPStatus
+from typing import AsyncIterator, Callable
+
+from flask import Flask
+from werkzeug.datastructures import Headers, MultiDict
+from werkzeug.exceptions import BadRequest, HTTPException, NotFound
+from werkzeug.formparser import parse_form_data
+from werkzeug.routing import Map, Rule
+from werkzeug.urls import url_decode
+
+from purchasing_manager import async_db
+from purchasing_manager.application.use_cases.async_client import AsyncClientUseCases
+from purchasing_manager.compression import ResponseCompression
+from purchasing_manager.metrics import (
+    PROMETHEUS_CONTENT_TYPE,
+    SERVER_TIMING_HEADER,
+    UNMATCHED_ROUTE,
+    RequestStats,
+    server_timing,
+)
+from purchasing_manager.pool import pool_stats
+from purchasing_manager.presentation.views.representations import json_body
+
+logger = logging.getLogger("purchasing-manager")
+
+INTERNAL_SERVER_ERROR_MESSAGE = dict(message="Internal Server Error")
+
+
+class AsyncRequest:
+    def __init__(self, scope: dict, receive: Callable):
+        self.method = scope["method"]
+        self.path = scope["path"]
+        self.args = url_decode(scope.get("query_string", b""))
+        self.headers = Headers([(key.decode("latin-1"), value.decode("latin-1")) for key, value in scope["headers"]])
+        self._receive = receive
+        self._body = None
+
+    async def get_data(self) -> bytes:
+        if self._body is None:
+            chunks = []
+            more_body = True
+
+            while more_body:
+                message = await self._receive()
+                chunks.append(message.get("body", b""))
+                more_body = message.get("more_body", False)
+
+            self._body = b"".join(chunks)
+
+        return self._body
+
+    async def get_json(self):
+        mimetype = self.headers.get("Content-Type", "").split(";")[0].strip()
+
+        if mimetype != "application/json" and not mimetype.endswith("+json"):
+            raise BadRequest()
+
+        try:
+            return json.loads(await self.get_data())
+        except ValueError as e:
+            raise BadRequest() from e
+
+    async def get_files(self) -> MultiDict:
+        data = await self.get_data()
+        environ = {
+            "REQUEST_METHOD": self.method,
+            "CONTENT_TYPE": self.headers.get("Content-Type", ""),
+            "CONTENT_LENGTH": str(len(data)),
+            "wsgi.input": io.BytesIO(data),
+        }
+        _, _, files = parse_form_data(environ)
+
+        return files
+
+
+class StreamingResponse:
+    def __init__(self, iterator: AsyncIterator[str], mimetype: str, status: int = HTTPStatus.OK):
+        self.iterator = iterator
+        self.mimetype = mimetype
+        self.status = status
+
+
+class AsyncResource:
+    """Same contract as a flask_restx Resource: one coroutine per HTTP method, returning the payload alone or a
+    (payload, status) tuple."""
+
+    @classmethod
+    def methods(cls) -> list[str]:
+        return [method.upper() for method in ("get", "post", "put", "patch", "delete") if hasattr(cls, method)]
+
+
+class Health(AsyncResource):
+    async def get(self, request: AsyncRequest, app: Flask) -> dict:
+        return dict(
+            service="Purchasing Manager",
+            version=app.config["VERSION"],
+            database_pool=pool_stats(async_db.engine.sync_engine),
+        )
+
+
+class Metrics(AsyncResource):
+    async def get(self, request: AsyncRequest, app: Flask) -> tuple[str, HTTPStatus, dict]:
+        return app.extensions["metrics"].render(), HTTPStatus.OK, {"Content-Type": PROMETHEUS_CONTENT_TYPE}
+
+
+class Client(AsyncResource):
+    async def get(self, request: AsyncRequest, app: Flask):
+        return await AsyncClientUseCases().get_clients(
+            **request.args.to_dict(), if_none_match=request.headers.get("If-None-Match")
+        )
+
+    async def post(self, request: AsyncRequest, app: Flask):
+        return await AsyncClientUseCases().create(**await request.get_json())
+
+    async def delete(self, request: AsyncRequest, app: Flask):
+        return await AsyncClientUseCases().bulk_delete(await request.get_json())
+
+
+class ExportClient(AsyncResource):
+    async def get(self, request: AsyncRequest, app: Flask) -> StreamingResponse:
+        return StreamingResponse(
+            AsyncClientUseCases().export(**request.args.to_dict()), mimetype="application/x-ndjson"
+        )
+
+
+class ImportClient(AsyncResource):
+    async def post(self, request: AsyncRequest, app: Flask):
+        file = (await request.get_files()).get("file")
+
+        if not file:
+            return dict(message="Missing the following file: 'file'"), HTTPStatus.BAD_REQUEST
+
+        client = AsyncClientUseCases()
+        return await client.import_csv(io.TextIOWrapper(file.stream, encoding="utf-8", newline=""))
+
+
+class BulkClient(AsyncResource):
+    async def post(self, request: AsyncRequest, app: Flask):
+        return await AsyncClientUseCases().bulk_create(await request.get_json())
+
+
+class BulkClientByDocument(AsyncResource):
+    async def put(self, request: AsyncRequest, app: Flask):
+        return await AsyncClientUseCases().bulk_upsert(await request.get_json())
+
+
+class ClientByDocument(AsyncResource):
+    async def put(self, request: AsyncRequest, app: Flask, document: str):
+        return await AsyncClientUseCases().upsert(document, **await request.get_json())
+
+
+class SpecificClient(AsyncResource):
+    async def get(self, request: AsyncRequest, app: Flask, id):
+        return await AsyncClientUseCases().retrieve(
+            str(id), request.args.get("fields"), request.headers.get("If-None-Match")
+        )
+
+    async def patch(self, request: AsyncRequest, app: Flask, id):
+        kwargs = await request.get_json()
+        kwargs["id"] = str(id)
+        return await AsyncClientUseCases().update(**kwargs)
+
+    async def delete(self, request: AsyncRequest, app: Flask, id):
+        return await AsyncClientUseCases().delete(str(id))
+
+
+ROUTES = [
+    ("/api", Health),
+    ("/api/healthz", Health),
+    ("/api/metrics", Metrics),
+    ("/api/client", Client),
+    ("/api/client/export", ExportClient),
+    ("/api/client/import", ImportClient),
+    ("/api/client/bulk", BulkClient),
+    ("/api/client/by-document", BulkClientByDocument),
+    ("/api/client/by-document/<string:document>", ClientByDocument),
+    ("/api/client/<uuid:id>", SpecificClient),
+]
+
+
+class AsgiApp:
+    """ASGI application serving the Health and Client APIs with the async use cases.
+
+    The Flask app is only used for its config and extensions: an app context is pushed around every request, so
+    ``current_app`` works the same way in both modes. The Swagger docs are only served by the WSGI mode.
+    """
+
+    def __init__(self, app: Flask):
+        self.app = app
+        self.url_map = Map([Rule(path, endpoint=resource, methods=resource.methods()) for path, resource in ROUTES])
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] == "lifespan":
+            return await self._lifespan(receive, send)
+
+        with self.app.app_context():
+            try:
+                await self._handle_request(AsyncRequest(scope, receive), send)
+            finally:
+                await async_db.remove()
+
+    async def _handle_request(self, request: AsyncRequest, send: Callable) -> None:
+        http_metrics = self.app.extensions["http_metrics"]
+        started = time.perf_counter()
+
+        try:
+            rule, values = self.url_map.bind("").match(request.path, request.method, return_rule=True)
+            route, routing_error = rule.rule, None
+        except HTTPException as e:
+            rule, values, route, routing_error = None, {}, UNMATCHED_ROUTE, e
+
+        sampled = self.app.extensions["request_log_sampler"].sample(route)
+
+        if sampled:
+            logger.info("Request received", extra={"props": {"path": request.path, "method": request.method}})
+
+        stats = http_metrics.started(request.method, route)
+        status = HTTPStatus.INTERNAL_SERVER_ERROR
+
+        try:
+            status = await self._dispatch(request, send, rule, values, routing_error, started, stats)
+        finally:
+            http_metrics.finished(request.method, route, status, time.perf_counter() - started, stats)
+
+        if sampled or status >= HTTPStatus.INTERNAL_SERVER_ERROR:
+            logger.info(
+                "Request response",
+                extra={
+                    "props": {
+                        "path": request.path,
+                        "method": request.method,
+                        "status": status,
+                        "db_time_ms": round(stats.db_time * 1000, 2),
+                        "db_statements": stats.statements,
+                    }
+                },
+            )
+
+    async def _dispatch(
+        self,
+        request: AsyncRequest,
+        send: Callable,
+        rule: Rule,
+        values: dict,
+        routing_error,
+        started: float,
+        stats: RequestStats,
+    ) -> int:
+        try:
+            if routing_error:
+                raise routing_error
+
+            method = "get" if request.method == "HEAD" else request.method.lower()
+            response = await getattr(rule.endpoint(), method)(request, self.app, **values)
+        except NotFound as e:
+            response = e.get_body(), e.code, {"Content-Type": "text/html; charset=utf-8"}
+        except HTTPException as e:
+            response = dict(message=e.description), e.code, dict(e.get_headers())
+        except Exception as e:
+            logger.exception("Unhandled error", extra={"props": {"path": request.path, "exception": str(e)}})
+            response = INTERNAL_SERVER_ERROR_MESSAGE, HTTPStatus.INTERNAL_SERVER_ERROR
+
+        headers = {}
+
+        if self.app.config["SERVER_TIMING_ENABLED"]:
+            headers[SERVER_TIMING_HEADER] = server_timing(stats, time.perf_counter() - started)
+
+        compression = self.app.extensions["compression"]
+        head = request.method == "HEAD"
+        encoding = compression.negotiate(request.headers.get("Accept-Encoding")) if not head else None
+
+        if isinstance(response, StreamingResponse):
+            return await _send_stream(send, response, headers, compression, encoding, head)
+
+        data, status, response_headers = _unpack(response)
+
+        return await _send_response(send, data, status, {**response_headers, **headers}, compression, encoding, head)
+
+    async def _lifespan(self, receive: Callable, send: Callable) -> None:
+        while True:
+            message = await receive()
+
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                with self.app.app_context():
+                    await async_db.dispose()
+
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+def _unpack(response) -> tuple:
+    if not isinstance(response, tuple):
+        return response, HTTPStatus.OK, {}
+    if len(response) == 2:
+        return (*response, {})
+
+    return response
+
+
+async def _send_response(
+    send: Callable,
+    data,
+    status: int,
+    headers: dict,
+    compression: ResponseCompression,
+    encoding: str = None,
+    head: bool = False,
+) -> int:
+    """Sends the whole body at once. A HEAD request, routed to the GET of the resource, gets its headers and
+    Content-Length without the body."""
+    headers = {"Content-Type": "application/json", **headers}
+
+    if status in (HTTPStatus.NO_CONTENT, HTTPStatus.NOT_MODIFIED):
+        body = b""
+    elif isinstance(data, str):
+        body = data.encode()
+    else:
+        body = json_body(data)
+
+    compressor = compression.start(status, headers, encoding, len(body))
+
+    if compressor is not None:
+        body = compressor.compress(body) + compressor.finish()
+
+    if status != HTTPStatus.NOT_MODIFIED:
+        headers["Content-Length"] = str(len(body))
+
+    await send({"type": "http.response.start", "status": int(status), "headers": _encode_headers(headers)})
+    await send({"type": "http.response.body", "body": body if not head else b""})
+
+    return int(status)
+
+
+async def _send_stream(
+    send: Callable,
+    response: StreamingResponse,
+    headers: dict,
+    compression: ResponseCompression,
+    encoding: str = None,
+    head: bool = False,
+) -> int:
+    """Sends each chunk of the iterator as it comes, compressed and flushed on its own when the client accepts an
+    encoding. The iterator of a HEAD request is closed without being read."""
+    headers = {"Content-Type": response.mimetype, **headers}
+    compressor = compression.start(response.status, headers, encoding)
+
+    await send({"type": "http.response.start", "status": int(response.status), "headers": _encode_headers(headers)})
+
+    if head:
+        if hasattr(response.iterator, "aclose"):
+            await response.iterator.aclose()
+
+        await send({"type": "http.response.body", "body": b""})
+        return int(response.status)
+
+    async for chunk in response.iterator:
+        body = chunk.encode()
+
+        if compressor is not None:
+            body = compressor.compress(body) + compressor.flush()
+
+        await send({"type": "http.response.body", "body": body, "more_body": True})
+
+    await send({"type": "http.response.body", "body": compressor.finish() if compressor is not None else b""})
+
+    return int(response.status)
+
+
+def _encode_headers(headers: dict) -> list[tuple[bytes, bytes]]:
+    return [(key.lower().encode("latin-1"), str(value).encode("latin-1")) for key, value in headers.items()]
@@ -0,0 +1,22 @@
+import json
+
+import click
+from flask.cli import AppGroup
+
+from purchasing_manager.application.use_cases.client import ClientUseCases
+
+client_cli = AppGroup("clients", help="Client management commands")
+
+
+@client_cli.command("import")
+@click.argument("file", type=click.File("r", encoding="utf-8"))
+@click.option("--chunk-size", type=int, default=None, help="Number of rows committed per transaction")
+def import_clients(file, chunk_size):
+    """Import clients from a CSV file with full_name, document, phone and email columns."""
+    client = ClientUseCases()
+    summary, status = client.import_csv(file, chunk_size=chunk_size)
+
+    click.echo(json.dumps(summary, indent=2))
+
+    if status != 200:
+        raise click.exceptions.Exit(1)
@@ -0,0 +1,21 @@
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+openapi_cli = AppGroup("openapi", help="OpenAPI document commands")
+
+
+@openapi_cli.command("export")
+@click.argument("file", type=click.File("wb"), default="-")
+def export_openapi(file):
+    """Write the Swagger document of every API to FILE, e.g. the OPENAPI_SPEC_FILE served by the app."""
+    from purchasing_manager.presentation.views.openapi import combined_schema
+    from purchasing_manager.presentation.views.representations import json_body
+
+    with current_app.test_request_context():
+        schema = combined_schema()
+
+    if "error" in schema:
+        raise click.ClickException(schema["error"])
+
+    file.write(json_body(schema))
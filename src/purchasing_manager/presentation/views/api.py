@@ -1,19 +1,27 @@
-from flask import Blueprint
+from flask import Blueprint, Response
 from flask import current_app as app
-from flask_restx import Api, Resource
+from flask_restx import Resource
 
-from .schemas import health
+from purchasing_manager import db
+from purchasing_manager.metrics import metrics_response
+from purchasing_manager.pool import pool_stats
+
+from . import representations
+from .openapi import CachedSpecApi, spec_response, specs
+from .schemas import database_pool, health
 
 health_bp = Blueprint("Health", __name__, url_prefix="/api")
 
-api = Api(
+api = CachedSpecApi(
     health_bp,
     title="Purchasing Manager",
     description="Purchasing Manager API",
     doc="/docs/swagger",
 )
+representations.register(api)
 
 ns = api.namespace("", description="Purchasing Manager API endpoints")
+ns.add_model(database_pool.name, database_pool)
 ns.add_model(health.name, health)
 
 
@@ -21,4 +29,19 @@ ns.add_model(health.name, health)
 @ns.route("", "/healthz")
 class Index(Resource):
     def get(self) -> dict:
-        return dict(service="Purchasing Manager", version=app.config["VERSION"])
+        return dict(service="Purchasing Manager", version=app.config["VERSION"], database_pool=pool_stats(db.engine))
+
+
+@ns.route("/metrics")
+class Metrics(Resource):
+    @ns.response(200, "Metrics of every worker in the Prometheus text format")
+    @ns.produces(["text/plain"])
+    def get(self) -> Response:
+        return metrics_response(app.extensions["metrics"])
+
+
+@ns.route("/openapi.json", doc=False)
+class OpenApi(Resource):
+    def get(self):
+        """Swagger document of every API."""
+        return spec_response(*specs().combined())
@@ -1,16 +1,46 @@
-from flask import Blueprint, request
-from flask_restx import Api, Resource
+import io
+from http import HTTPStatus
+
+from flask import Blueprint, Response, request, stream_with_context
+from flask_restx import Resource, fields
+from werkzeug.datastructures import FileStorage
 
 from purchasing_manager.application.use_cases.client import ClientUseCases
 
-from .schemas import client, internal_server_error, invalid_payload, not_found_error
+from . import representations
+from .openapi import CachedSpecApi
+from .schemas import (
+    client,
+    client_bulk,
+    client_bulk_delete,
+    client_bulk_result,
+    client_bulk_upsert,
+    client_bulk_upsert_result,
+    client_import,
+    client_import_error,
+    client_page,
+    client_upsert,
+    internal_server_error,
+    invalid_payload,
+    not_found_error,
+)
 
 client_bp = Blueprint("Client", __name__, url_prefix="/api/client")
 
-api = Api(client_bp, title="Client", description="Client API", doc="/docs/swagger")
+api = CachedSpecApi(client_bp, title="Client", description="Client API", doc="/docs/swagger")
+representations.register(api)
 
 ns = api.namespace("", description="Client API endpoints")
 ns.add_model(client.name, client)
+ns.add_model(client_page.name, client_page)
+ns.add_model(client_bulk_result.name, client_bulk_result)
+ns.add_model(client_bulk.name, client_bulk)
+ns.add_model(client_bulk_delete.name, client_bulk_delete)
+ns.add_model(client_upsert.name, client_upsert)
+ns.add_model(client_import_error.name, client_import_error)
+ns.add_model(client_import.name, client_import)
+ns.add_model(client_bulk_upsert_result.name, client_bulk_upsert_result)
+ns.add_model(client_bulk_upsert.name, client_bulk_upsert)
 ns.add_model(internal_server_error.name, internal_server_error)
 ns.add_model(not_found_error.name, not_found_error)
 ns.add_model(invalid_payload.name, invalid_payload)
@@ -18,16 +48,23 @@ ns.add_model(invalid_payload.name, invalid_payload)
 
 @ns.route("")
 class Client(Resource):
-    @ns.response(200, "List all clients", [client])
+    @ns.response(200, "List all clients. A page of clients when 'cursor' is sent", [client])
+    @ns.response(304, "Not modified since the ETag sent in If-None-Match")
+    @ns.response(400, "Invalid cursor, fields or search", invalid_payload)
     @ns.response(404, "Clients not found", not_found_error)
     @ns.response(500, "Internal server error", internal_server_error)
     @ns.param("document")
     @ns.param("email")
+    @ns.param("limit", "Max number of clients returned")
+    @ns.param("cursor", "Keyset pagination cursor. Send it empty to fetch the first page")
+    @ns.param("q", "Search by the beginning of the name or email words, best match first, e.g. 'joao sil'")
+    @ns.param("fields", "Comma separated client fields returned, e.g. 'id,name'. All fields when not sent")
+    @ns.param("count", "Send 'true' to get the total of matching clients in the X-Total-Count header")
     def get(self) -> list[client]:
         params = request.args
 
         client = ClientUseCases()
-        return client.get_clients(**params)
+        return client.get_clients(**params, if_none_match=request.headers.get("If-None-Match"))
 
     @ns.response(201, "Client object", client)
     @ns.response(400, "Invalid payload", invalid_payload)
@@ -38,15 +75,97 @@ class Client(Resource):
         client = ClientUseCases()
         return client.create(**kwargs)
 
+    @ns.response(200, "Number of deleted clients", client_bulk_delete)
+    @ns.response(400, "Invalid payload", invalid_payload)
+    @ns.response(500, "Internal server error", internal_server_error)
+    @ns.expect([fields.String(example="677db4c7-3f29-4393-af2a-73f29cf115d5")])
+    def delete(self):
+        payload = request.get_json()
+        client = ClientUseCases()
+        return client.bulk_delete(payload)
+
+
+@ns.route("/export")
+class ExportClient(Resource):
+    @ns.response(200, "Newline-delimited JSON stream of clients", client)
+    @ns.response(500, "Internal server error", internal_server_error)
+    @ns.param("document")
+    @ns.param("email")
+    @ns.produces(["application/x-ndjson"])
+    def get(self) -> Response:
+        params = request.args
+
+        client = ClientUseCases()
+        return Response(stream_with_context(client.export(**params)), mimetype="application/x-ndjson")
+
+
+upload_parser = ns.parser()
+upload_parser.add_argument("file", location="files", type=FileStorage, required=True, help="CSV file of clients")
+
+
+@ns.route("/import")
+class ImportClient(Resource):
+    @ns.response(200, "Summary of the imported clients", client_import)
+    @ns.response(400, "Invalid payload", invalid_payload)
+    @ns.response(500, "Internal server error", internal_server_error)
+    @ns.expect(upload_parser)
+    def post(self):
+        file = request.files.get("file")
+
+        if not file:
+            return dict(message="Missing the following file: 'file'"), HTTPStatus.BAD_REQUEST
+
+        client = ClientUseCases()
+        return client.import_csv(io.TextIOWrapper(file.stream, encoding="utf-8", newline=""))
+
+
+@ns.route("/bulk")
+class BulkClient(Resource):
+    @ns.response(200, "Result of each client creation", client_bulk)
+    @ns.response(400, "Invalid payload", invalid_payload)
+    @ns.response(500, "Internal server error", internal_server_error)
+    @ns.expect([client])
+    def post(self):
+        payload = request.get_json()
+        client = ClientUseCases()
+        return client.bulk_create(payload)
+
+
+@ns.route("/by-document")
+class BulkClientByDocument(Resource):
+    @ns.response(200, "Result of each client upsert", client_bulk_upsert)
+    @ns.response(400, "Invalid payload", invalid_payload)
+    @ns.response(500, "Internal server error", internal_server_error)
+    @ns.expect([client])
+    def put(self):
+        payload = request.get_json()
+        client = ClientUseCases()
+        return client.bulk_upsert(payload)
+
+
+@ns.route("/by-document/<string:document>")
+class ClientByDocument(Resource):
+    @ns.response(200, "Client object", client)
+    @ns.response(400, "Invalid payload", invalid_payload)
+    @ns.response(500, "Internal server error", internal_server_error)
+    @ns.expect(client_upsert)
+    def put(self, document) -> client:
+        kwargs = request.get_json()
+        client = ClientUseCases()
+        return client.upsert(document, **kwargs)
+
 
 @ns.route("/<uuid:id>")
 class SpecificClient(Resource):
     @ns.response(200, "Client object", client)
+    @ns.response(304, "Not modified since the ETag sent in If-None-Match")
+    @ns.response(400, "Invalid fields", invalid_payload)
     @ns.response(404, "Client not found", not_found_error)
     @ns.response(500, "Internal server error", internal_server_error)
+    @ns.param("fields", "Comma separated client fields returned, e.g. 'id,name'. All fields when not sent")
     def get(self, id) -> client:
         client = ClientUseCases()
-        return client.retrieve(str(id))
+        return client.retrieve(str(id), request.args.get("fields"), request.headers.get("If-None-Match"))
 
     @ns.response(200, "Client object", client)
     @ns.response(400, "Invalid payload", invalid_payload)
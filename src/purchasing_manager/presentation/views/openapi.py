@@ -0,0 +1,164 @@
+import copy
+import hashlib
+import logging
+import os
+import threading
+from http import HTTPStatus
+from typing import Callable
+
+from flask import Flask, Response, current_app, request
+from flask_restx import Api, Resource
+
+from .representations import json_body
+
+COMBINED = "combined"
+
+logger = logging.getLogger("purchasing-manager")
+
+
+class SpecDocument:
+    """An encoded Swagger document and its ETag, the digest of the body, so every worker sends the same one."""
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = hashlib.sha1(body).hexdigest()
+
+
+class OpenApiSpecs:
+    """The Swagger documents of the process, generated on their first request and then served as they are.
+
+    Flask-RESTX keeps the schema of each Api, but still encodes it on every request, and the combined document of
+    the APIs would be built again each time. The combined one can also be generated at build time with
+    ``flask openapi export``, into the ``spec_file`` read here.
+    """
+
+    def __init__(self, spec_file: str = None):
+        self.spec_file = spec_file
+        self._documents = {}
+        self._lock = threading.Lock()
+
+    def document(self, key, build: Callable[[], dict]) -> tuple[SpecDocument, dict]:
+        """The document of ``key``, built with ``build`` the first time. Schemas which flask-restx failed to render
+        are returned as the error dict instead and built again on the next request."""
+        document = self._documents.get(key)
+
+        if document is not None:
+            return document, None
+
+        with self._lock:
+            if key not in self._documents:
+                schema = build()
+
+                if "error" in schema:
+                    return None, schema
+
+                self._documents[key] = SpecDocument(json_body(schema))
+
+        return self._documents[key], None
+
+    def combined(self) -> tuple[SpecDocument, dict]:
+        if COMBINED not in self._documents and self.spec_file:
+            self._load(self.spec_file)
+
+        return self.document(COMBINED, combined_schema)
+
+    def _load(self, spec_file: str) -> None:
+        if not os.path.exists(spec_file):
+            logger.warning(
+                "OpenAPI spec file not found, generating it", extra={"props": lambda: {"spec_file": spec_file}}
+            )
+            return
+
+        with open(spec_file, "rb") as file:
+            document = SpecDocument(file.read())
+
+        with self._lock:
+            self._documents.setdefault(COMBINED, document)
+
+
+class CachedSpecApi(Api):
+    """Api which serves its ``swagger.json`` from the documents of the process, with the ETag and Cache-Control
+    headers. The Swagger UI of ``doc`` is the one of Flask-RESTX."""
+
+    def _register_specs(self, app_or_blueprint):
+        if self._add_specs:
+            self._register_view(
+                app_or_blueprint,
+                SpecView,
+                self.default_namespace,
+                "/swagger.json",
+                endpoint="specs",
+                resource_class_args=(self,),
+            )
+            self.endpoints.add("specs")
+
+
+class SpecView(Resource):
+    def get(self):
+        return spec_response(*specs().document(self.api, lambda: self.api.__schema__))
+
+
+def specs() -> OpenApiSpecs:
+    return current_app.extensions["openapi_specs"]
+
+
+def spec_response(document: SpecDocument, error: dict = None):
+    """The document with its ETag and Cache-Control headers, or a 304 for the If-None-Match of the request."""
+    if document is None:
+        return error, HTTPStatus.INTERNAL_SERVER_ERROR
+
+    response = Response(document.body, mimetype="application/json")
+    response.set_etag(document.etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = current_app.config["OPENAPI_CACHE_MAX_AGE"]
+
+    return response.make_conditional(request)
+
+
+def combined_schema() -> dict:
+    """One Swagger document with the paths and models of every API, each path prefixed by the base path of its
+    API. The unnamed namespaces of the APIs are tagged with the API titles."""
+    from .api import api as health_api
+    from .client import api as client_api
+
+    schema = dict(
+        swagger="2.0",
+        basePath="/",
+        info=dict(title=health_api.title, version=current_app.config["VERSION"], description=health_api.description),
+        produces=["application/json"],
+        consumes=["application/json"],
+        tags=[],
+        paths={},
+        definitions={},
+        responses={},
+    )
+
+    for api in (health_api, client_api):
+        api_schema = api.__schema__
+
+        if "error" in api_schema:
+            return api_schema
+
+        api_schema = copy.deepcopy(api_schema)
+        tags = {tag["name"]: tag["name"] or api.title for tag in api_schema.get("tags", [])}
+        schema["tags"] += [dict(tag, name=tags[tag["name"]]) for tag in api_schema.get("tags", [])]
+        base_path = api_schema["basePath"].rstrip("/")
+
+        for path, operations in api_schema["paths"].items():
+            for operation in operations.values():
+                if isinstance(operation, dict) and "tags" in operation:
+                    operation["tags"] = [tags.get(tag, tag) for tag in operation["tags"]]
+
+            schema["paths"][base_path + path or "/"] = operations
+
+        schema["definitions"].update(api_schema.get("definitions", {}))
+        schema["responses"].update(api_schema.get("responses", {}))
+
+        if "host" in api_schema:
+            schema["host"] = api_schema["host"]
+
+    return schema
+
+
+def init_app(app: Flask) -> None:
+    app.extensions["openapi_specs"] = OpenApiSpecs(app.config["OPENAPI_SPEC_FILE"])
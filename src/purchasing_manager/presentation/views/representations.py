@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from flask import current_app, make_response
+
+from purchasing_manager.application.serializers import dumps
+
+if TYPE_CHECKING:  # pragma: no cover
+    from flask_restx import Api
+
+
+def json_body(data) -> bytes:
+    """Response body of the JSON representation. Documents already encoded by a serializer are written as they
+    are, everything else goes through the configured JSON backend."""
+    return dumps(data, backend=current_app.config["JSON_BACKEND"]) + b"\n"
+
+
+def output_json(data, code: int, headers: dict = None):
+    response = make_response(json_body(data), code)
+    response.headers.extend(headers or {})
+
+    return response
+
+
+def register(api: Api) -> None:
+    api.representation("application/json")(output_json)
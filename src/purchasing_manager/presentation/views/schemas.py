@@ -1,7 +1,27 @@
 from flask_restx import Model, fields
 
+database_pool = Model(
+    name="database_pool",
+    pool_class=fields.String(example="InstrumentedQueuePool"),
+    size=fields.Integer(description="Connections kept in the pool", example=10),
+    checked_in=fields.Integer(description="Idle connections in the pool", example=7),
+    checked_out=fields.Integer(description="Connections in use", example=3),
+    overflow=fields.Integer(description="Connections opened beyond the pool size", example=0),
+    connects=fields.Integer(description="DBAPI connections opened", example=10),
+    checkouts=fields.Integer(description="Connections handed out by the pool", example=5230),
+    invalidations=fields.Integer(description="Connections discarded after an error", example=0),
+    soft_invalidations=fields.Integer(description="Connections marked to be recycled", example=0),
+    timeouts=fields.Integer(description="Checkouts which gave up waiting for a connection", example=0),
+    waits=fields.Integer(description="Checkouts which went through the pool queue", example=5230),
+    wait_time_ms_total=fields.Float(example=12.5),
+    wait_time_ms_max=fields.Float(example=0.8),
+)
+
 health = Model(
-    name="health", service=fields.String(example="Purchasing Manager"), version=fields.String(example="1.0.0")
+    name="health",
+    service=fields.String(example="Purchasing Manager"),
+    version=fields.String(example="1.0.0"),
+    database_pool=fields.Nested(database_pool, allow_null=True),
 )
 
 
@@ -23,6 +43,88 @@ client = Model(
 )
 
 
+client_page = Model(
+    name="client_page",
+    clients=fields.List(fields.Nested(client)),
+    next_cursor=fields.String(
+        description="Opaque cursor to fetch the next page. Null when there are no more clients",
+        required=False,
+        example="WyIyMDIyLTExLTI3VDE0OjAxOjQ3LjU4NSIsIjY3N2RiNGM3In0",
+    ),
+)
+
+
+client_bulk_result = Model(
+    name="client_bulk_result",
+    index=fields.Integer(description="Position of the client in the payload", example=0),
+    status=fields.String(
+        description="Result of the client creation", enum=["created", "duplicated", "invalid"], example="created"
+    ),
+    id=fields.String(description="Created client unique identifier", example="677db4c7-3f29-4393-af2a-73f29cf115d5"),
+    message=fields.String(description="Why the client wasn't created", example="User already added in database"),
+)
+
+
+client_bulk = Model(
+    name="client_bulk",
+    created=fields.Integer(description="Number of created clients", example=2),
+    duplicated=fields.Integer(description="Number of clients already added in database", example=1),
+    invalid=fields.Integer(description="Number of invalid clients", example=0),
+    results=fields.List(fields.Nested(client_bulk_result)),
+)
+
+
+client_upsert = Model(
+    name="client_upsert",
+    full_name=fields.String(description="Client full name", required=True, example="Fulano Beltrano da Silva"),
+    phone=fields.String(description="Client phone number", required=True, example="11999998888"),
+    email=fields.String(description="Client email", required=True, example="fulanodasilva@example.com"),
+)
+
+
+client_bulk_upsert_result = Model(
+    name="client_bulk_upsert_result",
+    index=fields.Integer(description="Position of the client in the payload", example=0),
+    status=fields.String(description="Result of the client upsert", enum=["upserted", "invalid"], example="upserted"),
+    document=fields.String(description="Client document number (CPF)", example="12345678900"),
+    message=fields.String(
+        description="Why the client wasn't upserted", example="Missing the following attribute: 'email'"
+    ),
+)
+
+
+client_bulk_upsert = Model(
+    name="client_bulk_upsert",
+    upserted=fields.Integer(description="Number of created or updated clients", example=2),
+    invalid=fields.Integer(description="Number of invalid clients", example=0),
+    results=fields.List(fields.Nested(client_bulk_upsert_result)),
+)
+
+
+client_bulk_delete = Model(
+    name="client_bulk_delete",
+    deleted=fields.Integer(description="Number of deleted clients", example=2),
+    not_found=fields.Integer(description="Number of ids not found in database", example=0),
+)
+
+
+client_import_error = Model(
+    name="client_import_error",
+    line=fields.Integer(description="Line of the CSV file", example=3),
+    status=fields.String(description="Why the row wasn't imported", enum=["duplicated", "invalid"], example="invalid"),
+    message=fields.String(description="Error message", example="Missing the following attribute: 'email'"),
+)
+
+
+client_import = Model(
+    name="client_import",
+    inserted=fields.Integer(description="Number of inserted clients", example=1000),
+    duplicated=fields.Integer(description="Number of clients already added in database", example=2),
+    invalid=fields.Integer(description="Number of invalid rows", example=1),
+    errors=fields.List(fields.Nested(client_import_error)),
+)
+
+
 internal_server_error = Model(
     name="internal_server_error",
     message=fields.String(description="Error message", required=False, example="Internal Server Error"),
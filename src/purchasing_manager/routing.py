@@ -0,0 +1,122 @@
+import logging
+import threading
+import time
+import weakref
+
+from flask import Flask, request
+from flask_sqlalchemy import SignallingSession, get_state
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(f"purchasing-manager.{__name__}")
+
+FORCE_PRIMARY_HEADER = "X-Read-From-Primary"
+USE_PRIMARY = "use_primary"
+
+
+class ReplicaRouter:
+    """Picks the replica bind of each read, round-robin, skipping the replicas which failed to connect.
+
+    A replica is marked as unhealthy when one of its connections fails and gets another chance after
+    ``retry_after`` seconds. When every replica is unhealthy, reads go to the primary.
+    """
+
+    def __init__(self, bind_keys: list[str], retry_after: float):
+        self.bind_keys = bind_keys
+        self.retry_after = retry_after
+        self._next = 0
+        self._unhealthy_until = {}
+        self._instrumented = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def next_bind_key(self) -> str:
+        with self._lock:
+            now = time.monotonic()
+
+            for _ in range(len(self.bind_keys)):
+                bind_key = self.bind_keys[self._next]
+                self._next = (self._next + 1) % len(self.bind_keys)
+
+                if self._unhealthy_until.get(bind_key, 0) <= now:
+                    return bind_key
+
+        return None
+
+    def engine(self, app: Flask, bind_key: str) -> Engine:
+        engine = get_state(app).db.get_engine(app, bind=bind_key)
+
+        if engine not in self._instrumented:
+            with self._lock:
+                if engine not in self._instrumented:
+                    event.listen(engine, "handle_error", lambda context: self._on_error(bind_key, context))
+                    self._instrumented.add(engine)
+
+        return engine
+
+    def mark_unhealthy(self, bind_key: str) -> None:
+        with self._lock:
+            self._unhealthy_until[bind_key] = time.monotonic() + self.retry_after
+
+        logger.warning(
+            "Database replica marked as unhealthy",
+            extra={"props": {"bind_key": bind_key, "retry_after": self.retry_after}},
+        )
+
+    def _on_error(self, bind_key: str, context) -> None:
+        if context.is_disconnect or context.connection is None:
+            self.mark_unhealthy(bind_key)
+
+
+class RoutingSession(SignallingSession):
+    """Session which sends the reads to the replicas and everything else to the primary.
+
+    Once the session flushes or executes an INSERT, UPDATE or DELETE, every following statement goes to the
+    primary too, so a request reads its own writes. The session is removed at the end of each request.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or _is_write(clause):
+            self.info[USE_PRIMARY] = True
+
+        router = self.app.extensions.get("replica_router")
+
+        if router is None or self.info.get(USE_PRIMARY) or _has_bind_key(mapper):
+            return super().get_bind(mapper, clause)
+
+        bind_key = router.next_bind_key()
+
+        if bind_key is None:
+            return super().get_bind(mapper, clause)
+
+        return router.engine(self.app, bind_key)
+
+
+def use_primary() -> None:
+    """Send the remaining statements of the current session, reads included, to the primary."""
+    from purchasing_manager import db
+
+    db.session.info[USE_PRIMARY] = True
+
+
+def init_app(app: Flask) -> None:
+    replica_uris = app.config.get("SQLALCHEMY_REPLICA_URIS") or []
+
+    if not replica_uris:
+        return
+
+    binds = {f"replica_{index}": uri for index, uri in enumerate(replica_uris)}
+    app.config["SQLALCHEMY_BINDS"] = {**(app.config.get("SQLALCHEMY_BINDS") or {}), **binds}
+    app.extensions["replica_router"] = ReplicaRouter(list(binds), app.config["SQLALCHEMY_REPLICA_RETRY_AFTER"])
+
+    @app.before_request
+    def read_from_primary_when_asked():
+        if request.headers.get(FORCE_PRIMARY_HEADER, "").lower() in ("1", "true", "yes"):
+            use_primary()
+
+
+def _is_write(clause) -> bool:
+    return clause is not None and bool(getattr(clause, "is_dml", False) or getattr(clause, "_for_update_arg", None))
+
+
+def _has_bind_key(mapper) -> bool:
+    return mapper is not None and mapper.persist_selectable.info.get("bind_key") is not None
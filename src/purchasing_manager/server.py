@@ -0,0 +1,96 @@
+import logging
+import os
+import shutil
+from typing import Mapping
+
+from flask import Flask
+
+from . import db
+from .application.exceptions import ConfigurationNotValid
+
+WORKER_CLASSES = ("gthread", "gevent")
+
+logger = logging.getLogger("purchasing-manager")
+
+
+def cpu_count() -> int:
+    """The CPUs the process may run on, which is less than the ones of the host in a container with a CPU set."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+
+    return os.cpu_count() or 1
+
+
+def gunicorn_settings(environ: Mapping[str, str], cpus: int) -> dict:
+    """The settings of gunicorn.conf.py, each one overridable by its SERVER_* env var.
+
+    - gthread, the default: 2 * CPUs + 1 worker processes of SERVER_THREADS threads, for a mix of CPU and I/O.
+    - gevent: one worker per CPU, each one serving up to SERVER_WORKER_CONNECTIONS requests at once, for the I/O
+      bound lookups. The database work of a worker is still capped by its pool, pool_size + max_overflow.
+
+    The app is preloaded in the master, so the workers share its memory and a broken app fails on startup rather
+    than in a loop of dying workers. Workers are restarted after SERVER_MAX_REQUESTS requests, plus a random
+    jitter so they don't all restart at once.
+    """
+    worker_class = environ.get("SERVER_WORKER_CLASS", "gthread")
+
+    if worker_class not in WORKER_CLASSES:
+        raise ConfigurationNotValid(
+            f"SERVER_WORKER_CLASS must be one of {', '.join(WORKER_CLASSES)}, not {worker_class}"
+        )
+
+    workers = cpus if worker_class == "gevent" else 2 * cpus + 1
+    max_requests = int(environ.get("SERVER_MAX_REQUESTS", 10000))
+
+    return dict(
+        bind=environ.get("SERVER_BIND", "0.0.0.0:5000"),
+        worker_class=worker_class,
+        workers=int(environ.get("SERVER_WORKERS", workers)),
+        threads=int(environ.get("SERVER_THREADS", 4)) if worker_class == "gthread" else 1,
+        worker_connections=int(environ.get("SERVER_WORKER_CONNECTIONS", 100)),
+        preload_app=True,
+        max_requests=max_requests,
+        max_requests_jitter=int(environ.get("SERVER_MAX_REQUESTS_JITTER", max_requests // 10)),
+        timeout=int(environ.get("SERVER_TIMEOUT", 30)),
+        graceful_timeout=int(environ.get("SERVER_GRACEFUL_TIMEOUT", 30)),
+        keepalive=int(environ.get("SERVER_KEEPALIVE", 5)),
+    )
+
+
+def dispose_engines(app: Flask) -> None:
+    """Drop the pooled connections of the primary and replica engines, so the forked workers open their own instead
+    of sharing the sockets of the master."""
+    with app.app_context():
+        for bind in [None, *(app.config.get("SQLALCHEMY_BINDS") or {})]:
+            db.get_engine(app, bind=bind).dispose()
+
+
+def clear_metrics_directory(directory: str) -> None:
+    """Remove the snapshots of the workers of a previous run."""
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory, exist_ok=True)
+
+
+def on_starting(server) -> None:
+    directory = os.environ.get("METRICS_MULTIPROCESS_DIR")
+
+    if directory:
+        clear_metrics_directory(directory)
+
+
+def when_ready(server) -> None:
+    """Runs in the master once the app is preloaded, before the workers are forked."""
+    dispose_engines(server.app.wsgi())
+
+
+def post_fork(server, worker) -> None:
+    dispose_engines(server.app.wsgi())
+    logger.info("Worker started", extra={"props": {"pid": worker.pid, "worker_class": server.cfg.worker_class_str}})
+
+
+def worker_exit(server, worker) -> None:
+    """Write the last metrics of the worker, e.g. one recycled after its max_requests."""
+    registry = server.app.wsgi().extensions["metrics"]
+
+    if registry.directory:
+        registry.flush()
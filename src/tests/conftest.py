@@ -1,8 +1,12 @@
+import asyncio
 import os
 
 import pytest
 
-from purchasing_manager import create_app, db
+from purchasing_manager import async_db, create_app, db
+from purchasing_manager.presentation.asgi import AsgiApp
+from tests.doubles.asgi import AsgiTestClient
+from tests.doubles.redis import FakeRedisServer
 
 
 @pytest.fixture
@@ -27,3 +31,35 @@ def app():
 def api_client(app):
     with app.test_client() as client:
         return client
+
+
+@pytest.fixture
+def async_app(tmp_path):
+    os.environ["DEPLOY_ENV"] = "Testing"
+
+    app = create_app()
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'purchasing_manager.db'}"
+    app.app_context().push()
+
+    with app.app_context():
+        db.create_all()
+
+    yield app
+
+    with app.app_context():
+        asyncio.run(async_db.dispose())
+        db.session.remove()
+
+
+@pytest.fixture
+def asgi_client(async_app):
+    return AsgiTestClient(AsgiApp(async_app))
+
+
+@pytest.fixture
+def redis_server():
+    server = FakeRedisServer().start()
+
+    yield server
+
+    server.stop()
@@ -0,0 +1,87 @@
+import asyncio
+import json as json_lib
+
+from purchasing_manager import async_db
+
+
+def run(coroutine):
+    """Run a coroutine in a fresh event loop, removing the task scoped async session at the end."""
+
+    async def main():
+        try:
+            return await coroutine
+        finally:
+            await async_db.remove()
+
+    return asyncio.run(main())
+
+
+class AsgiResponse:
+    def __init__(self, status_code: int, headers: dict, data: bytes):
+        self.status_code = status_code
+        self.headers = headers
+        self.data = data
+
+    @property
+    def json(self):
+        return json_lib.loads(self.data)
+
+
+class AsgiTestClient:
+    def __init__(self, app):
+        self.app = app
+
+    def get(self, path: str, **kwargs) -> AsgiResponse:
+        return self.request("GET", path, **kwargs)
+
+    def head(self, path: str, **kwargs) -> AsgiResponse:
+        return self.request("HEAD", path, **kwargs)
+
+    def post(self, path: str, **kwargs) -> AsgiResponse:
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path: str, **kwargs) -> AsgiResponse:
+        return self.request("PUT", path, **kwargs)
+
+    def patch(self, path: str, **kwargs) -> AsgiResponse:
+        return self.request("PATCH", path, **kwargs)
+
+    def delete(self, path: str, **kwargs) -> AsgiResponse:
+        return self.request("DELETE", path, **kwargs)
+
+    def request(
+        self, method: str, path: str, json=None, data: bytes = b"", content_type: str = None, headers: dict = None
+    ) -> AsgiResponse:
+        if json is not None:
+            data, content_type = json_lib.dumps(json).encode(), "application/json"
+
+        path, _, query_string = path.partition("?")
+        headers = [(key.lower().encode(), value.encode()) for key, value in (headers or {}).items()]
+
+        if content_type:
+            headers.append((b"content-type", content_type.encode()))
+
+        scope = dict(type="http", method=method, path=path, query_string=query_string.encode(), headers=headers)
+
+        return asyncio.run(self._call(scope, data))
+
+    async def _call(self, scope: dict, data: bytes) -> AsgiResponse:
+        messages = []
+        # Split the body in two messages to go through the more_body handling
+        body = [
+            dict(type="http.request", body=data[: len(data) // 2], more_body=True),  # noqa: E203
+            dict(type="http.request", body=data[len(data) // 2 :], more_body=False),  # noqa: E203
+        ]
+
+        async def receive():
+            return body.pop(0)
+
+        async def send(message):
+            messages.append(message)
+
+        await self.app(scope, receive, send)
+
+        start = messages[0]
+        headers = {key.decode(): value.decode() for key, value in start["headers"]}
+
+        return AsgiResponse(start["status"], headers, b"".join(message.get("body", b"") for message in messages[1:]))
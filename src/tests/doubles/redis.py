@@ -0,0 +1,100 @@
+import socketserver
+import threading
+import time
+
+
+class FakeRedisServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeRedisHandler)
+        self.data = {}
+        self.commands = []
+        self.connections = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address
+        return f"redis://{host}:{port}/0"
+
+    def start(self) -> "FakeRedisServer":
+        threading.Thread(target=self.serve_forever, args=(0.01,), daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def get(self, key: bytes) -> bytes:
+        value, expires_at = self.data.get(key, (None, None))
+
+        if expires_at and expires_at <= time.monotonic():
+            self.data.pop(key)
+            return None
+
+        return value
+
+
+class FakeRedisHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        with self.server.lock:
+            self.server.connections += 1
+
+        while True:
+            command = self._read_command()
+
+            if command is None:
+                return
+
+            with self.server.lock:
+                self.server.commands.append(command)
+                reply = self._execute(command[0].upper().decode(), command[1:])
+
+            self.wfile.write(reply)
+
+    def _read_command(self) -> list[bytes]:
+        line = self.rfile.readline()
+
+        if not line:
+            return None
+
+        args = []
+        for _ in range(int(line[1:-2])):
+            length = int(self.rfile.readline()[1:-2])
+            args.append(self.rfile.read(length + 2)[:-2])
+
+        return args
+
+    def _execute(self, name: str, args: list[bytes]) -> bytes:
+        server = self.server
+
+        if name in ("PING", "AUTH", "SELECT"):
+            return b"+OK\r\n"
+        if name == "MGET":
+            return b"*%d\r\n" % len(args) + b"".join(_bulk_string(server.get(key)) for key in args)
+        if name == "SET":
+            ttl = int(args[3]) / 1000 if len(args) > 3 else None
+            server.data[args[0]] = args[1], time.monotonic() + ttl if ttl else None
+            return b"+OK\r\n"
+        if name == "DEL":
+            return b":%d\r\n" % sum(server.data.pop(key, None) is not None for key in args)
+        if name == "INCR":
+            value = int(server.get(args[0]) or 0) + 1
+            server.data[args[0]] = str(value).encode(), server.data.get(args[0], (None, None))[1]
+            return b":%d\r\n" % value
+        if name == "PEXPIRE":
+            if server.get(args[0]) is None:
+                return b":0\r\n"
+            server.data[args[0]] = server.data[args[0]][0], time.monotonic() + int(args[1]) / 1000
+            return b":1\r\n"
+
+        return b"-ERR unknown command '%s'\r\n" % name.encode()
+
+
+def _bulk_string(value: bytes) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+
+    return b"$%d\r\n%s\r\n" % (len(value), value)
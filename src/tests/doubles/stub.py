@@ -32,3 +32,24 @@ def generate_clients_objects(qtd: int):
         )
 
     return clients
+
+
+def generate_clients_rows(qtd: int, start: int = 0) -> list[dict]:
+    """Fast version of generate_clients_objects, to seed large tables: plain rows for an ``insert`` of the client
+    table, with unique documents built from the row index."""
+    now = datetime.now()
+    letters = string.ascii_lowercase
+    digits = string.digits
+
+    return [
+        dict(
+            id=str(uuid4()),
+            created_dt=now,
+            updated_dt=now,
+            name="".join(random.choices(letters, k=5)),
+            document=str(index).zfill(11),
+            phone="".join(random.choices(digits, k=11)),
+            email="".join(random.choices(letters, k=10)) + "@example.com",
+        )
+        for index in range(start, start + qtd)
+    ]
@@ -0,0 +1,300 @@
+import gzip
+import io
+import json
+from http import HTTPStatus
+
+from purchasing_manager import db
+from purchasing_manager.domain.models.client import Client
+from purchasing_manager.presentation.asgi import AsgiApp
+from tests.doubles.stub import generate_clients_objects
+
+NOT_FOUND_MESSAGE = dict(message="Clients not found")
+INTERNAL_SERVER_ERROR_MESSAGE = dict(message="Internal Server Error")
+
+
+def _add_clients(qtd: int) -> list[dict]:
+    clients = generate_clients_objects(qtd)
+    expected = [client.dict for client in clients]
+
+    db.session.add_all(clients)
+    db.session.commit()
+
+    return expected
+
+
+def _payload(client: dict) -> dict:
+    return dict(full_name=client["name"], document=client["document"], phone=client["phone"], email=client["email"])
+
+
+def test_health_must_return_the_service_version(asgi_client):
+    response = asgi_client.get("/api/healthz")
+
+    assert HTTPStatus.OK == response.status_code
+    assert ("Purchasing Manager", "1.0.0") == (response.json["service"], response.json["version"])
+    assert "NullPool" == response.json["database_pool"]["pool_class"]
+
+
+def test_metrics_must_return_the_request_metrics_by_route(asgi_client):
+    asgi_client.get("/api/client")
+    asgi_client.get("/api/xpto")
+
+    response = asgi_client.get("/api/metrics")
+    metrics = response.data.decode()
+
+    assert HTTPStatus.OK == response.status_code
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/client",status="404"} 1' in metrics
+    assert 'http_request_duration_seconds_count{method="GET",route="<unmatched>",status="404"} 1' in metrics
+
+
+def test_responses_must_have_the_server_timing_of_the_database_statements(asgi_client):
+    response = asgi_client.get("/api/client")
+
+    assert response.headers["server-timing"].startswith("db;dur=")
+    assert 'desc="statements: 1"' in response.headers["server-timing"]
+
+
+def test_get_clients_must_return_the_same_payload_as_the_wsgi_mode(asgi_client, async_app):
+    _add_clients(3)
+
+    response = asgi_client.get("/api/client?limit=2")
+    wsgi_response = async_app.test_client().get("/api/client?limit=2")
+
+    assert HTTPStatus.OK == response.status_code
+    assert "application/json" == response.headers["content-type"]
+    assert wsgi_response.data == response.data
+
+
+def test_get_clients_with_cursor_must_return_pages_of_clients(asgi_client):
+    _add_clients(3)
+
+    first_page = asgi_client.get("/api/client?cursor=&limit=2")
+    last_page = asgi_client.get(f"/api/client?cursor={first_page.json['next_cursor']}&limit=2")
+
+    assert 2 == len(first_page.json["clients"])
+    assert 1 == len(last_page.json["clients"])
+    assert last_page.json["next_cursor"] is None
+
+
+def test_get_clients_with_cursor_and_invalid_limit_must_return_400(asgi_client):
+    response = asgi_client.get("/api/client?cursor=&limit=0")
+
+    assert HTTPStatus.BAD_REQUEST == response.status_code
+    assert dict(message="Invalid limit: send an integer from 1 to 1000") == response.json
+
+
+def test_get_clients_must_return_404(asgi_client):
+    response = asgi_client.get("/api/client")
+
+    assert HTTPStatus.NOT_FOUND == response.status_code
+    assert NOT_FOUND_MESSAGE == response.json
+
+
+def test_export_clients_must_stream_ndjson(asgi_client):
+    expected = _add_clients(3)
+
+    response = asgi_client.get("/api/client/export")
+
+    assert HTTPStatus.OK == response.status_code
+    assert "application/x-ndjson" == response.headers["content-type"]
+    assert expected == [json.loads(line) for line in response.data.decode().splitlines()]
+
+
+def test_get_and_export_clients_must_be_gzipped_when_accepted(async_app, asgi_client):
+    async_app.extensions["compression"].min_size = 0
+    expected = _add_clients(3)
+
+    response = asgi_client.get("/api/client", headers={"Accept-Encoding": "gzip"})
+    export = asgi_client.get("/api/client/export", headers={"Accept-Encoding": "gzip"})
+
+    assert "gzip" == response.headers["content-encoding"]
+    assert "Accept-Encoding" == response.headers["vary"]
+    assert len(response.data) == int(response.headers["content-length"])
+    assert expected == json.loads(gzip.decompress(response.data))
+    assert "gzip" == export.headers["content-encoding"]
+    assert expected == [json.loads(line) for line in gzip.decompress(export.data).splitlines()]
+
+
+def test_head_must_return_the_headers_of_the_get_without_the_body(asgi_client):
+    _add_clients(3)
+
+    for path in ("/api/healthz", "/api/client", "/api/client/export"):
+        response = asgi_client.head(path)
+        get_response = asgi_client.get(path)
+
+        assert HTTPStatus.OK == response.status_code
+        assert b"" == response.data
+        assert get_response.headers["content-type"] == response.headers["content-type"]
+
+    assert str(len(asgi_client.get("/api/client").data)) == asgi_client.head("/api/client").headers["content-length"]
+
+
+def test_routes_must_match_the_wsgi_routes(async_app):
+    docs = ("doc", "specs", "root", "_open_api")
+    wsgi_routes = {
+        rule.rule: rule.methods - {"OPTIONS"}
+        for rule in async_app.url_map.iter_rules()
+        if rule.rule.startswith("/api") and rule.endpoint.rpartition(".")[2] not in docs
+    }
+    asgi_routes = {rule.rule: rule.methods for rule in AsgiApp(async_app).url_map.iter_rules()}
+
+    assert wsgi_routes == asgi_routes
+
+
+def test_get_client_must_return_a_client(asgi_client):
+    expected = _add_clients(1)[0]
+
+    response = asgi_client.get(f"/api/client/{expected['id']}")
+
+    assert HTTPStatus.OK == response.status_code
+    assert expected == response.json
+
+
+def test_get_clients_and_client_with_fields_must_return_only_those_fields(asgi_client):
+    expected = _add_clients(1)[0]
+
+    clients = asgi_client.get("/api/client?fields=id,name")
+    client = asgi_client.get(f"/api/client/{expected['id']}?fields=document")
+    invalid = asgi_client.get("/api/client?fields=xpto")
+
+    assert [dict(id=expected["id"], name=expected["name"])] == clients.json
+    assert dict(document=expected["document"]) == client.json
+    assert HTTPStatus.BAD_REQUEST == invalid.status_code
+
+
+def test_get_clients_with_q_must_return_the_matching_clients(asgi_client):
+    expected = _add_clients(2)[1]
+
+    response = asgi_client.get(f"/api/client?q={expected['email'][:3]}&fields=id")
+
+    assert HTTPStatus.OK == response.status_code
+    assert dict(id=expected["id"]) in response.json
+
+
+def test_get_clients_with_count_must_send_the_total_count_headers(asgi_client):
+    _add_clients(3)
+
+    response = asgi_client.get("/api/client?limit=1&count=true")
+
+    assert HTTPStatus.OK == response.status_code
+    assert 1 == len(response.json)
+    assert "3" == response.headers["x-total-count"]
+    assert "true" == response.headers["x-total-count-exact"]
+
+
+def test_get_client_must_return_304_while_the_etag_matches(asgi_client):
+    expected = _add_clients(1)[0]
+
+    response = asgi_client.get(f"/api/client/{expected['id']}")
+    not_modified = asgi_client.get(f"/api/client/{expected['id']}", headers={"If-None-Match": response.headers["etag"]})
+
+    assert HTTPStatus.NOT_MODIFIED == not_modified.status_code
+    assert b"" == not_modified.data
+    assert response.headers["etag"] == not_modified.headers["etag"]
+
+
+def test_get_client_must_return_404_when_id_is_not_an_uuid(asgi_client):
+    response = asgi_client.get("/api/client/xpto")
+
+    assert HTTPStatus.NOT_FOUND == response.status_code
+    assert response.headers["content-type"].startswith("text/html")
+
+
+def test_create_client_must_return_201(asgi_client):
+    payload = _payload(generate_clients_objects(1)[0].dict)
+
+    response = asgi_client.post("/api/client", json=payload)
+
+    assert HTTPStatus.CREATED == response.status_code
+    assert payload["document"] == response.json["document"]
+    assert 1 == Client.query.count()
+
+
+def test_create_client_must_return_400_when_client_already_created(asgi_client):
+    payload = _payload(_add_clients(1)[0])
+
+    response = asgi_client.post("/api/client", json=payload)
+
+    assert HTTPStatus.BAD_REQUEST == response.status_code
+    assert dict(message="User already added in database") == response.json
+
+
+def test_create_client_must_return_400_when_body_is_not_json(asgi_client):
+    response = asgi_client.post("/api/client", data=b"{xpto", content_type="application/json")
+
+    assert HTTPStatus.BAD_REQUEST == response.status_code
+
+
+def test_method_not_allowed_must_return_405(asgi_client):
+    response = asgi_client.put("/api/client/bulk")
+
+    assert HTTPStatus.METHOD_NOT_ALLOWED == response.status_code
+    assert dict(message="The method is not allowed for the requested URL.") == response.json
+
+
+def test_unknown_exception_must_return_500(asgi_client):
+    response = asgi_client.get("/api/client?xpto=1")
+
+    assert HTTPStatus.INTERNAL_SERVER_ERROR == response.status_code
+    assert INTERNAL_SERVER_ERROR_MESSAGE == response.json
+
+
+def test_bulk_create_and_bulk_upsert_clients_must_return_200(asgi_client):
+    payload = [_payload(client.dict) for client in generate_clients_objects(2)]
+
+    created = asgi_client.post("/api/client/bulk", json=payload)
+    upserted = asgi_client.put("/api/client/by-document", json=payload)
+
+    assert (2, 0, 0) == (created.json["created"], created.json["duplicated"], created.json["invalid"])
+    assert (2, 0) == (upserted.json["upserted"], upserted.json["invalid"])
+
+
+def test_upsert_client_by_document_must_return_the_client(asgi_client):
+    payload = _payload(generate_clients_objects(1)[0].dict)
+
+    response = asgi_client.put(f"/api/client/by-document/{payload.pop('document')}", json=payload)
+
+    assert HTTPStatus.OK == response.status_code
+    assert payload["email"] == response.json["email"]
+
+
+def test_import_clients_must_return_the_summary(asgi_client):
+    body = (
+        b"--boundary\r\n"
+        b'Content-Disposition: form-data; name="file"; filename="clients.csv"\r\n'
+        b"Content-Type: text/csv\r\n\r\n"
+        b"full_name,document,phone,email\r\n"
+        b"fulano,12345678900,11999887766,fulano@example.com\r\n"
+        b"--boundary--\r\n"
+    )
+
+    response = asgi_client.post("/api/client/import", data=body, content_type="multipart/form-data; boundary=boundary")
+
+    assert HTTPStatus.OK == response.status_code
+    assert dict(inserted=1, duplicated=0, invalid=0, errors=[]) == response.json
+
+
+def test_import_clients_must_return_400_when_file_is_missing(asgi_client):
+    response = asgi_client.post("/api/client/import", data=io.BytesIO().read(), content_type="multipart/form-data")
+
+    assert HTTPStatus.BAD_REQUEST == response.status_code
+
+
+def test_update_and_delete_client(asgi_client):
+    id = _add_clients(1)[0]["id"]
+
+    updated = asgi_client.patch(f"/api/client/{id}", json=dict(full_name="new name"))
+    deleted = asgi_client.delete(f"/api/client/{id}")
+    not_found = asgi_client.delete(f"/api/client/{id}")
+
+    assert (HTTPStatus.OK, "New Name") == (updated.status_code, updated.json["name"])
+    assert (HTTPStatus.NO_CONTENT, b"") == (deleted.status_code, deleted.data)
+    assert HTTPStatus.NOT_FOUND == not_found.status_code
+
+
+def test_bulk_delete_clients_must_return_the_number_of_deleted_clients(asgi_client):
+    ids = [client["id"] for client in _add_clients(2)]
+
+    response = asgi_client.delete("/api/client", json=[*ids, "xpto"])
+
+    assert dict(deleted=2, not_found=1) == response.json
@@ -1,6 +1,11 @@
+import gzip
+import io
+import json
 from http import HTTPStatus
 from unittest.mock import patch
 
+import pytest
+
 from purchasing_manager import db
 from purchasing_manager.application.adapters.client import ClientRepository
 from tests.doubles.stub import generate_clients_objects
@@ -36,6 +41,167 @@ def test_get_clients_return_client_from_document(api_client):
     assert 1 == len(response.json)
 
 
+def test_get_clients_with_cursor_must_return_pages_of_clients(api_client):
+    clients = generate_clients_objects(3)
+
+    for client in clients:
+        db.session.add(client)
+        db.session.commit()
+
+    first_page = api_client.get("/api/client?cursor=&limit=2")
+    last_page = api_client.get(f"/api/client?cursor={first_page.json['next_cursor']}&limit=2")
+
+    ids = [client["id"] for client in first_page.json["clients"] + last_page.json["clients"]]
+
+    assert HTTPStatus.OK == first_page.status_code
+    assert 2 == len(first_page.json["clients"])
+    assert HTTPStatus.OK == last_page.status_code
+    assert 1 == len(last_page.json["clients"])
+    assert last_page.json["next_cursor"] is None
+    assert sorted(client.id for client in clients) == sorted(ids)
+
+
+def test_get_clients_with_invalid_cursor_must_return_400(api_client):
+    response = api_client.get("/api/client?cursor=xpto")
+
+    assert HTTPStatus.BAD_REQUEST == response.status_code
+    assert dict(message="Invalid pagination cursor") == response.json
+
+
+@pytest.mark.parametrize("limit", ["abc", "0"])
+def test_get_clients_with_cursor_and_invalid_limit_must_return_400(api_client, limit):
+    response = api_client.get(f"/api/client?cursor=&limit={limit}")
+
+    assert HTTPStatus.BAD_REQUEST == response.status_code
+    assert dict(message="Invalid limit: send an integer from 1 to 1000") == response.json
+
+
+def test_get_clients_with_fields_must_return_only_those_fields(api_client):
+    clients = generate_clients_objects(3)
+    db.session.add_all(clients)
+    db.session.commit()
+
+    response = api_client.get("/api/client?fields=id,name")
+    first_page = api_client.get("/api/client?cursor=&limit=2&fields=name")
+    last_page = api_client.get(f"/api/client?cursor={first_page.json['next_cursor']}&limit=2&fields=name")
+
+    assert HTTPStatus.OK == response.status_code
+    assert sorted((client.id, client.name) for client in clients) == sorted(
+        (client["id"], client["name"]) for client in response.json
+    )
+    assert [["id", "name"]] * 3 == [list(client) for client in response.json]
+    assert [["name"]] * 3 == [list(client) for client in first_page.json["clients"] + last_page.json["clients"]]
+
+
+def test_get_clients_with_invalid_fields_must_return_400(api_client):
+    response = api_client.get("/api/client?fields=id,password")
+
+    assert HTTPStatus.BAD_REQUEST == response.status_code
+    assert dict(message="Invalid fields: password") == response.json
+
+
+def test_get_clients_with_q_must_return_the_matching_clients(api_client):
+    clients = generate_clients_objects(3)
+    clients[0].name, clients[1].name, clients[2].name = "José Silva", "Maria Silveira", "Ana Souza"
+    db.session.add_all(clients)
+    db.session.commit()
+
+    response = api_client.get("/api/client?q=jose sil&fields=id,name")
+    invalid = api_client.get("/api/client?q=!!")
+    not_found = api_client.get("/api/client?q=pedro")
+
+    assert HTTPStatus.OK == response.status_code
+    assert [dict(id=clients[0].id, name="José Silva")] == response.json
+    assert HTTPStatus.BAD_REQUEST == invalid.status_code
+    assert HTTPStatus.NOT_FOUND == not_found.status_code
+
+
+def test_get_clients_with_count_must_send_the_total_count_headers(api_client):
+    clients = generate_clients_objects(3)
+    db.session.add_all(clients)
+    db.session.commit()
+
+    response = api_client.get("/api/client?limit=1&count=true")
+    filtered = api_client.get(f"/api/client?document={clients[0].document}&count=1")
+    not_counted = api_client.get("/api/client?limit=1")
+
+    assert 1 == len(response.json)
+    assert "3" == response.headers["X-Total-Count"]
+    assert "true" == response.headers["X-Total-Count-Exact"]
+    assert "1" == filtered.headers["X-Total-Count"]
+    assert "X-Total-Count" not in not_counted.headers
+
+
+def test_get_client_must_return_304_while_the_etag_matches(api_client):
+    client = generate_clients_objects(1)[0]
+    db.session.add(client)
+    db.session.commit()
+
+    response = api_client.get(f"/api/client/{client.id}")
+    not_modified = api_client.get(f"/api/client/{client.id}", headers={"If-None-Match": response.headers["ETag"]})
+    api_client.patch(f"/api/client/{client.id}", json=dict(name="Fulano"))
+    modified = api_client.get(f"/api/client/{client.id}", headers={"If-None-Match": response.headers["ETag"]})
+
+    assert HTTPStatus.NOT_MODIFIED == not_modified.status_code
+    assert b"" == not_modified.data
+    assert response.headers["ETag"] == not_modified.headers["ETag"]
+    assert HTTPStatus.OK == modified.status_code
+    assert "Fulano" == modified.json["name"]
+
+
+def test_get_clients_must_return_304_while_the_weak_etag_matches(api_client):
+    clients = generate_clients_objects(2)
+    db.session.add_all(clients)
+    db.session.commit()
+
+    response = api_client.get("/api/client")
+    not_modified = api_client.get("/api/client", headers={"If-None-Match": response.headers["ETag"]})
+    api_client.delete(f"/api/client/{clients[0].id}")
+    modified = api_client.get("/api/client", headers={"If-None-Match": response.headers["ETag"]})
+
+    assert response.headers["ETag"].startswith('W/"')
+    assert HTTPStatus.NOT_MODIFIED == not_modified.status_code
+    assert HTTPStatus.OK == modified.status_code
+    assert 1 == len(modified.json)
+
+
+def test_export_clients_must_stream_ndjson(api_client):
+    clients = generate_clients_objects(3)
+    expected_response = sorted((client.dict for client in clients), key=lambda c: c["id"])
+
+    for client in clients:
+        db.session.add(client)
+        db.session.commit()
+
+    response = api_client.get("/api/client/export")
+
+    assert HTTPStatus.OK == response.status_code
+    assert response.is_streamed
+    assert "application/x-ndjson" == response.mimetype
+    assert expected_response == sorted(
+        (json.loads(line) for line in response.get_data(as_text=True).splitlines()), key=lambda c: c["id"]
+    )
+
+
+def test_get_and_export_clients_must_be_gzipped_when_accepted(app, api_client):
+    app.extensions["compression"].min_size = 0
+    clients = generate_clients_objects(3)
+    db.session.add_all(clients)
+    db.session.commit()
+
+    response = api_client.get("/api/client", headers={"Accept-Encoding": "gzip"})
+    export = api_client.get("/api/client/export", headers={"Accept-Encoding": "gzip"})
+    identity = api_client.get("/api/client")
+
+    assert "gzip" == response.headers["Content-Encoding"]
+    assert "Accept-Encoding" == response.headers["Vary"]
+    assert response.headers["ETag"].startswith('W/"')
+    assert identity.json == json.loads(gzip.decompress(response.data))
+    assert "gzip" == export.headers["Content-Encoding"]
+    assert 3 == len(gzip.decompress(export.data).splitlines())
+    assert "Content-Encoding" not in identity.headers
+
+
 def test_get_clients_must_return_404(api_client):
     response = api_client.get("/api/client")
 
@@ -67,6 +233,18 @@ def test_get_client_must_return_a_client(api_client):
     assert except_response == response.json
 
 
+def test_get_client_with_fields_must_return_only_those_fields(api_client):
+    client = generate_clients_objects(1)[0]
+    db.session.add(client)
+    db.session.commit()
+
+    response = api_client.get(f"/api/client/{client.id}?fields=email,id")
+
+    assert HTTPStatus.OK == response.status_code
+    assert ["email", "id"] == list(response.json)
+    assert dict(email=client.email, id=client.id) == response.json
+
+
 def test_get_client_must_return_404(api_client):
     response = api_client.get("/api/client/4fd36341-ab6e-4c2d-a0d4-de39207f88a4")
 
@@ -142,6 +320,132 @@ def test_create_a_new_client_must_return_500_when_some_unknown_exception_is_rais
     assert INTERNAL_SERVER_ERROR_MESSAGE == response.json
 
 
+def test_bulk_create_clients_must_return_200_with_the_result_of_each_client(api_client):
+    clients = generate_clients_objects(3)
+    db.session.add(clients[0])
+    db.session.commit()
+    payload = [
+        dict(full_name=client.name, document=client.document, phone=client.phone, email=client.email)
+        for client in clients
+    ]
+    payload.append(dict(full_name="Ciclano"))
+
+    response = api_client.post("/api/client/bulk", headers={"Content-Type": "application/json"}, json=payload)
+    response_json = response.json
+
+    assert HTTPStatus.OK == response.status_code
+    assert (2, 1, 1) == (response_json["created"], response_json["duplicated"], response_json["invalid"])
+    assert ["duplicated", "created", "created", "invalid"] == [result["status"] for result in response_json["results"]]
+    assert 3 == len(ClientRepository.list())
+
+
+def test_bulk_create_clients_must_return_invalid_for_the_clients_with_attributes_of_the_wrong_type(api_client):
+    client = generate_clients_objects(1)[0]
+    payload = [
+        dict(full_name=client.name, document=client.document, phone=client.phone, email=client.email),
+        dict(full_name=123, document="12345678900", phone=client.phone, email=client.email),
+    ]
+
+    response = api_client.post("/api/client/bulk", headers={"Content-Type": "application/json"}, json=payload)
+
+    assert HTTPStatus.OK == response.status_code
+    assert (1, 1) == (response.json["created"], response.json["invalid"])
+    assert "The following attribute must be a string: 'full_name'" == response.json["results"][1]["message"]
+    assert 1 == len(ClientRepository.list())
+
+
+def test_bulk_create_clients_must_return_400_when_payload_is_not_a_list(api_client):
+    expected_response = dict(message="The payload must be a list of clients")
+
+    response = api_client.post("/api/client/bulk", headers={"Content-Type": "application/json"}, json={})
+
+    assert HTTPStatus.BAD_REQUEST == response.status_code
+    assert expected_response == response.json
+
+
+def test_upsert_client_by_document_must_create_and_then_update_the_client(api_client):
+    client = generate_clients_objects(1)[0]
+    payload = dict(full_name=client.name, phone=client.phone, email=client.email)
+    url = f"/api/client/by-document/{client.document}"
+
+    response_1 = api_client.put(url, headers={"Content-Type": "application/json"}, json=payload)
+    response_2 = api_client.put(
+        url, headers={"Content-Type": "application/json"}, json=dict(payload, email="test@example.com")
+    )
+
+    assert HTTPStatus.OK == response_1.status_code
+    assert client.document == response_1.json["document"]
+    assert HTTPStatus.OK == response_2.status_code
+    assert response_1.json["id"] == response_2.json["id"]
+    assert "test@example.com" == response_2.json["email"]
+    assert 1 == len(ClientRepository.list())
+
+
+def test_upsert_client_by_document_must_return_400_when_some_attribute_is_missing(api_client):
+    expected_response = dict(message="Missing the following attribute: 'full_name'")
+
+    response = api_client.put(
+        "/api/client/by-document/12345678900", headers={"Content-Type": "application/json"}, json={}
+    )
+
+    assert HTTPStatus.BAD_REQUEST == response.status_code
+    assert expected_response == response.json
+
+
+def test_bulk_upsert_clients_must_return_200_with_the_result_of_each_client(api_client):
+    clients = generate_clients_objects(2)
+    db.session.add(clients[0])
+    db.session.commit()
+    payload = [
+        dict(full_name="Ciclano", document=client.document, phone=client.phone, email=client.email)
+        for client in clients
+    ]
+
+    response = api_client.put("/api/client/by-document", headers={"Content-Type": "application/json"}, json=payload)
+
+    assert HTTPStatus.OK == response.status_code
+    assert (2, 0) == (response.json["upserted"], response.json["invalid"])
+    assert ["Ciclano", "Ciclano"] == [client.name for client in ClientRepository.list()]
+
+
+def test_bulk_upsert_clients_must_return_invalid_for_the_clients_with_attributes_of_the_wrong_type(api_client):
+    client = generate_clients_objects(1)[0]
+    payload = [
+        dict(full_name=client.name, document=client.document, phone=client.phone, email=client.email),
+        dict(full_name=123, document="12345678900", phone=client.phone, email=client.email),
+    ]
+
+    response = api_client.put("/api/client/by-document", headers={"Content-Type": "application/json"}, json=payload)
+
+    assert HTTPStatus.OK == response.status_code
+    assert (1, 1) == (response.json["upserted"], response.json["invalid"])
+    assert "invalid" == response.json["results"][1]["status"]
+    assert [client.document] == [client.document for client in ClientRepository.list()]
+
+
+def test_import_clients_must_return_200_with_the_summary(api_client):
+    clients = generate_clients_objects(2)
+    content = "full_name,document,phone,email\n" + "".join(
+        f"{client.name},{client.document},{client.phone},{client.email}\n" for client in clients
+    )
+
+    response = api_client.post(
+        "/api/client/import",
+        data={"file": (io.BytesIO(content.encode()), "clients.csv")},
+        content_type="multipart/form-data",
+    )
+
+    assert HTTPStatus.OK == response.status_code
+    assert dict(inserted=2, duplicated=0, invalid=0, errors=[]) == response.json
+    assert 2 == len(ClientRepository.list())
+
+
+def test_import_clients_must_return_400_when_file_is_missing(api_client):
+    response = api_client.post("/api/client/import", data={}, content_type="multipart/form-data")
+
+    assert HTTPStatus.BAD_REQUEST == response.status_code
+
+
 def test_update_a_client_must_update_successfully_with_status_200(api_client):
     client = generate_clients_objects(1)[0]
     db.session.add(client)
@@ -244,3 +548,28 @@ def test_delete_client_must_return_500_when_some_unknown_exception_is_raised(moc
     assert 1 == len(ClientRepository.list())
     assert HTTPStatus.INTERNAL_SERVER_ERROR == response.status_code
     assert INTERNAL_SERVER_ERROR_MESSAGE == response.json
+
+
+def test_bulk_delete_clients_must_return_200_with_the_number_of_deleted_clients(api_client):
+    clients = generate_clients_objects(3)
+
+    for client in clients[:2]:
+        db.session.add(client)
+        db.session.commit()
+
+    response = api_client.delete(
+        "/api/client", headers={"Content-Type": "application/json"}, json=[client.id for client in clients]
+    )
+
+    assert HTTPStatus.OK == response.status_code
+    assert dict(deleted=2, not_found=1) == response.json
+    assert 0 == len(ClientRepository.list())
+
+
+def test_bulk_delete_clients_must_return_400_when_payload_is_invalid(api_client):
+    expected_response = dict(message="The payload must be a list of client ids")
+
+    response = api_client.delete("/api/client", headers={"Content-Type": "application/json"}, json=[1, 2])
+
+    assert HTTPStatus.BAD_REQUEST == response.status_code
+    assert expected_response == response.json
@@ -0,0 +1,39 @@
+import json
+import logging
+
+from purchasing_manager import db
+from purchasing_manager.application.adapters.client import ClientRepository
+from tests.doubles.stub import generate_clients_objects
+
+
+def test_import_clients_command_must_import_csv_file(app, tmp_path, caplog):
+    # With the live logging of pytest.ini, the INFO logs of the command go to a stream handler on the stdout swapped
+    # by CliRunner, which then fails to read its output
+    caplog.set_level(logging.WARNING, logger="purchasing-manager")
+    clients = generate_clients_objects(3)
+    db.session.add(clients[0])
+    db.session.commit()
+    file = tmp_path / "clients.csv"
+    file.write_text(
+        "full_name,document,phone,email\n"
+        + "".join(f"{client.name},{client.document},{client.phone},{client.email}\n" for client in clients)
+    )
+
+    result = app.test_cli_runner().invoke(args=["clients", "import", str(file), "--chunk-size", "2"])
+
+    summary = json.loads(result.output)
+
+    assert 0 == result.exit_code
+    assert (2, 1, 0) == (summary["inserted"], summary["duplicated"], summary["invalid"])
+    assert [2] == [error["line"] for error in summary["errors"]]
+    assert 3 == len(ClientRepository.list())
+
+
+def test_import_clients_command_must_exit_with_error_when_columns_are_missing(app, tmp_path):
+    file = tmp_path / "clients.csv"
+    file.write_text("full_name\nCiclano\n")
+
+    result = app.test_cli_runner().invoke(args=["clients", "import", str(file)])
+
+    assert 1 == result.exit_code
+    assert "Missing the following columns: document, phone, email" in result.output
@@ -12,7 +12,33 @@ def test_health_endpoint_must_return_200(api_client, app, endpoint):
     expected_response = dict(service="Purchasing Manager", version=app.config["VERSION"])
 
     assert HTTPStatus.OK == response.status_code
-    assert expected_response == response.json
+    assert expected_response == {key: response.json[key] for key in expected_response}
+    assert "StaticPool" == response.json["database_pool"]["pool_class"]
+
+
+def test_health_endpoint_must_return_the_pool_stats(api_client):
+    api_client.get("/api/client")
+
+    database_pool = api_client.get("/api/healthz").json["database_pool"]
+
+    assert database_pool["checkouts"] >= 1
+    assert database_pool["connects"] >= 1
+
+
+def test_metrics_endpoint_must_return_the_request_metrics_by_route(api_client):
+    api_client.get("/api/client")
+    api_client.get("/api/client/4fd36341-ab6e-4c2d-a0d4-de39207f88a4")
+
+    response = api_client.get("/api/metrics")
+    metrics = response.data.decode()
+
+    assert HTTPStatus.OK == response.status_code
+    assert "text/plain; version=0.0.4; charset=utf-8" == response.headers["Content-Type"]
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/client",status="404"} 1' in metrics
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/client/<uuid:id>",status="404"} 1' in metrics
+    assert 'http_request_db_duration_seconds_count{method="GET",route="/api/client"} 1' in metrics
+    assert 'http_requests_in_flight{method="GET",route="/api/metrics"} 1' in metrics
+    assert 'client_cache_requests_total{result="miss"} 1' in metrics
 
 
 @pytest.mark.parametrize("endpoint", ["/api", "/api/healthz"])
@@ -28,3 +54,10 @@ def test_health_must_return_500(mock_get, api_client, endpoint):
 
     assert HTTPStatus.INTERNAL_SERVER_ERROR == response.status_code
     assert expected_response == response.json
+
+
+def test_responses_must_have_the_server_timing_of_the_database_statements(api_client):
+    response = api_client.get("/api/client")
+
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+    assert 'desc="statements: 1"' in response.headers["Server-Timing"]
@@ -0,0 +1,90 @@
+import json
+from http import HTTPStatus
+from unittest.mock import patch
+
+import pytest
+
+from purchasing_manager.presentation.views import openapi
+from purchasing_manager.presentation.views.client import api as client_api
+from purchasing_manager.presentation.views.openapi import OpenApiSpecs
+
+
+def test_openapi_must_return_the_paths_and_models_of_every_api(api_client):
+    response = api_client.get("/api/openapi.json")
+
+    assert HTTPStatus.OK == response.status_code
+    assert {"/api/healthz", "/api/client", "/api/client/{id}"} <= set(response.json["paths"])
+    assert {"health", "client"} <= set(response.json["definitions"])
+    assert ["Purchasing Manager", "Client"] == [tag["name"] for tag in response.json["tags"]]
+    assert ["Client"] == response.json["paths"]["/api/client/{id}"]["get"]["tags"]
+    assert "/api/openapi.json" not in response.json["paths"]
+
+
+def test_openapi_must_return_the_etag_and_cache_headers(api_client, app):
+    response = api_client.get("/api/openapi.json")
+
+    assert response.headers["ETag"]
+    assert {"public": None, "max-age": str(app.config["OPENAPI_CACHE_MAX_AGE"])} == dict(response.cache_control)
+
+
+@pytest.mark.parametrize("url", ["/api/openapi.json", "/api/swagger.json", "/api/client/swagger.json"])
+def test_specs_must_return_not_modified_for_their_etag(api_client, url):
+    etag = api_client.get(url).headers["ETag"]
+
+    response = api_client.get(url, headers={"If-None-Match": etag})
+
+    assert HTTPStatus.NOT_MODIFIED == response.status_code
+    assert b"" == response.data
+
+
+def test_openapi_must_be_generated_once(api_client):
+    with patch.object(openapi, "combined_schema", wraps=openapi.combined_schema) as combined_schema:
+        first = api_client.get("/api/openapi.json")
+        second = api_client.get("/api/openapi.json")
+
+    assert 1 == combined_schema.call_count
+    assert (first.data, first.headers["ETag"]) == (second.data, second.headers["ETag"])
+
+
+def test_openapi_must_return_the_spec_file(api_client, app, tmp_path):
+    spec_file = tmp_path / "openapi.json"
+    spec_file.write_bytes(b'{"swagger": "2.0", "paths": {}}\n')
+    app.extensions["openapi_specs"] = OpenApiSpecs(str(spec_file))
+
+    response = api_client.get("/api/openapi.json")
+
+    assert {"swagger": "2.0", "paths": {}} == response.json
+
+
+def test_openapi_must_be_generated_when_the_spec_file_is_missing(api_client, app, tmp_path):
+    app.extensions["openapi_specs"] = OpenApiSpecs(str(tmp_path / "openapi.json"))
+
+    response = api_client.get("/api/openapi.json")
+
+    assert HTTPStatus.OK == response.status_code
+    assert "/api/client" in response.json["paths"]
+
+
+def test_client_swagger_must_return_the_flask_restx_schema(api_client):
+    response = api_client.get("/api/client/swagger.json")
+
+    assert HTTPStatus.OK == response.status_code
+    assert client_api.__schema__ == response.json
+    assert response.headers["ETag"]
+
+
+@pytest.mark.parametrize("url", ["/api/docs/swagger", "/api/client/docs/swagger"])
+def test_swagger_ui_must_return_200(api_client, url):
+    response = api_client.get(url)
+
+    assert HTTPStatus.OK == response.status_code
+    assert b"swagger.json" in response.data
+
+
+def test_openapi_export_command_must_write_the_combined_spec(app, api_client, tmp_path):
+    spec_file = tmp_path / "openapi.json"
+
+    result = app.test_cli_runner().invoke(args=["openapi", "export", str(spec_file)])
+
+    assert 0 == result.exit_code
+    assert api_client.get("/api/openapi.json").json == json.loads(spec_file.read_bytes())
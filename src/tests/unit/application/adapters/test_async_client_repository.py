@@ -0,0 +1,192 @@
+from unittest.mock import patch
+
+import pytest
+
+from purchasing_manager import db
+from purchasing_manager.application.adapters.async_client import AsyncClientRepository
+from purchasing_manager.application.exceptions import (
+    DatabaseException,
+    DuplicateError,
+    InvalidCursorException,
+    InvalidLimitException,
+    NotFoundException,
+)
+from purchasing_manager.domain.models.client import Client
+from tests.doubles.asgi import run
+from tests.doubles.stub import generate_clients_objects
+
+
+def _add_clients(qtd: int) -> list[dict]:
+    clients = generate_clients_objects(qtd)
+    expected = [client.dict for client in clients]
+
+    db.session.add_all(clients)
+    db.session.commit()
+
+    return expected
+
+
+def test_list_clients_with_offset_and_limit(async_app):
+    expected = _add_clients(4)
+
+    clients = run(AsyncClientRepository.list(offset=1, limit=2))
+
+    assert expected[1:3] == [client.dict for client in clients]
+
+
+def test_list_clients_must_raise_database_exception_when_filter_is_invalid(async_app):
+    with pytest.raises(DatabaseException):
+        run(AsyncClientRepository.list(xpto="foo"))
+
+
+def test_list_by_cursor_must_return_all_pages(async_app):
+    expected = _add_clients(3)
+
+    first_page, cursor = run(AsyncClientRepository.list_by_cursor(limit=2))
+    last_page, last_cursor = run(AsyncClientRepository.list_by_cursor(cursor=cursor, limit=2))
+
+    assert sorted(client["id"] for client in expected) == sorted(client.id for client in first_page + last_page)
+    assert last_cursor is None
+
+
+def test_list_by_cursor_must_raise_exception_when_cursor_is_invalid(async_app):
+    with pytest.raises(InvalidCursorException):
+        run(AsyncClientRepository.list_by_cursor(cursor="xpto"))
+
+
+@pytest.mark.parametrize("limit", ["xpto", 0, 1001])
+def test_list_by_cursor_must_raise_exception_when_limit_is_invalid(async_app, limit):
+    with pytest.raises(InvalidLimitException):
+        run(AsyncClientRepository.list_by_cursor(limit=limit))
+
+
+def test_search_must_match_word_prefixes_ignoring_accents(async_app):
+    clients = generate_clients_objects(2)
+    clients[0].name, clients[1].name = "João Silva", "Pedro Souza"
+    db.session.add_all(clients)
+    db.session.commit()
+
+    found = run(AsyncClientRepository.search("joão SIL"))
+
+    assert [clients[0].id] == [client.id for client in found]
+
+
+def test_count_must_return_the_total_and_the_capped_filtered_count(async_app):
+    async_app.config["CLIENT_COUNT_MAX"] = 2
+    expected = _add_clients(3)
+
+    total = run(AsyncClientRepository.count())
+    filtered = run(AsyncClientRepository.count(document=expected[0]["document"]))
+    capped = run(AsyncClientRepository.count(expected[0]["email"].split("@")[1][:3]))
+
+    assert (3, True) == total
+    assert (1, True) == filtered
+    assert (2, False) == capped
+
+
+def test_stream_must_yield_partitions_of_clients(async_app):
+    expected = _add_clients(5)
+
+    async def collect():
+        return [[row.id for row in partition] async for partition in AsyncClientRepository.stream(batch_size=2)]
+
+    partitions = run(collect())
+
+    assert [2, 2, 1] == [len(partition) for partition in partitions]
+    assert sorted(client["id"] for client in expected) == sorted(sum(partitions, []))
+
+
+def test_retrieve_must_return_the_client_and_then_read_it_from_cache(async_app):
+    expected = _add_clients(1)[0]
+
+    client = run(AsyncClientRepository.retrieve(expected["id"]))
+
+    with patch("purchasing_manager.application.adapters.async_client.async_db") as mock_async_db:
+        cached_client = run(AsyncClientRepository.retrieve(expected["id"]))
+
+    assert expected == client.dict == cached_client.dict
+    mock_async_db.session.get.assert_not_called()
+
+
+def test_retrieve_must_return_none_when_client_does_not_exist(async_app):
+    assert run(AsyncClientRepository.retrieve("xpto")) is None
+
+
+def test_create_must_save_the_client(async_app):
+    client = generate_clients_objects(1)[0]
+    expected = client.dict
+
+    run(AsyncClientRepository.create(client))
+
+    assert expected == db.session.get(Client, expected["id"]).dict
+
+
+def test_create_must_raise_duplicate_error_when_document_already_exists(async_app):
+    document = _add_clients(1)[0]["document"]
+    client = generate_clients_objects(1)[0]
+    client.document = document
+
+    with pytest.raises(DuplicateError):
+        run(AsyncClientRepository.create(client))
+
+
+def test_bulk_create_must_return_the_duplicated_clients(async_app):
+    document = _add_clients(1)[0]["document"]
+    clients = generate_clients_objects(3)
+    clients[0].document = document
+
+    duplicates = run(AsyncClientRepository.bulk_create(clients, batch_size=2))
+
+    assert [document] == [client.document for client in duplicates]
+    assert 3 == Client.query.count()
+
+
+def test_upsert_must_create_and_then_update_the_client(async_app):
+    client, other_client = generate_clients_objects(2)
+    other_client.document = client.document
+    document, id = client.document, client.id
+
+    run(AsyncClientRepository.upsert(client))
+    upserted_client = run(AsyncClientRepository.upsert(other_client))
+
+    assert (id, document, other_client.name) == (upserted_client.id, upserted_client.document, upserted_client.name)
+    assert 1 == Client.query.count()
+
+
+def test_bulk_upsert_must_save_all_clients(async_app):
+    run(AsyncClientRepository.bulk_upsert(generate_clients_objects(3), batch_size=2))
+
+    assert 3 == Client.query.count()
+
+
+def test_update_must_return_the_updated_client(async_app):
+    id = _add_clients(1)[0]["id"]
+
+    updated_client = run(AsyncClientRepository.update(Client(id=id, name="new name")))
+
+    assert "New Name" == updated_client.name
+
+
+def test_update_must_raise_not_found_exception(async_app):
+    with pytest.raises(NotFoundException):
+        run(AsyncClientRepository.update(Client(id="xpto", name="new name")))
+
+
+def test_delete_must_remove_the_client(async_app):
+    id = _add_clients(1)[0]["id"]
+
+    run(AsyncClientRepository.delete(id))
+
+    assert 0 == Client.query.count()
+
+
+def test_delete_must_raise_not_found_exception(async_app):
+    with pytest.raises(NotFoundException):
+        run(AsyncClientRepository.delete("xpto"))
+
+
+def test_bulk_delete_must_return_the_number_of_deleted_clients(async_app):
+    ids = [client["id"] for client in _add_clients(3)]
+
+    assert 2 == run(AsyncClientRepository.bulk_delete([*ids[:2], "xpto"], batch_size=2))
+    assert 1 == Client.query.count()
@@ -0,0 +1,309 @@
+import threading
+import time
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+import pytest
+
+from purchasing_manager.application.adapters.cache import (
+    ClientCache,
+    CountCache,
+    InMemoryCacheBackend,
+    RedisCacheBackend,
+    create_cache_backend,
+)
+from purchasing_manager.application.exceptions import (
+    CacheException,
+    ConfigurationNotValid,
+)
+
+CLIENT_VALUES = dict(
+    id="foo",
+    created_dt=datetime(2022, 11, 27, 14, 1, 47),
+    updated_dt=datetime(2022, 11, 27, 14, 1, 47),
+    name="Fulano",
+    document="12345678900",
+    phone="11999887766",
+    email="fulano@example.com",
+)
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request, redis_server):
+    if request.param == "memory":
+        return InMemoryCacheBackend(max_size=10)
+
+    return RedisCacheBackend(redis_server.url)
+
+
+def test_get_many_must_return_the_cached_values(backend):
+    backend.set("foo", "xpto", ttl=30)
+
+    assert ["xpto", None] == backend.get_many(["foo", "bar"])
+
+
+def test_get_many_must_return_none_when_value_is_expired(backend):
+    backend.set("foo", "xpto", ttl=0.001)
+
+    with patch("time.monotonic", return_value=time.monotonic() + 60):
+        assert [None] == backend.get_many(["foo"])
+
+
+def test_delete_must_remove_values(backend):
+    backend.set("foo", "xpto", ttl=30)
+    backend.set("bar", "abc", ttl=30)
+
+    backend.delete("foo", "bar", "xpto")
+
+    assert [None, None] == backend.get_many(["foo", "bar"])
+
+
+def test_incr_must_increment_the_counter(backend):
+    assert 1 == backend.incr("foo", ttl=30)
+    assert 2 == backend.incr("foo", ttl=30)
+    assert ["2"] == backend.get_many(["foo"])
+
+
+def test_in_memory_backend_must_evict_the_least_recently_used_value():
+    backend = InMemoryCacheBackend(max_size=2)
+
+    backend.set("foo", "1", ttl=30)
+    backend.set("bar", "2", ttl=30)
+    backend.get_many(["foo"])
+    backend.set("xpto", "3", ttl=30)
+
+    assert ["1", None, "3"] == backend.get_many(["foo", "bar", "xpto"])
+    assert 2 == len(backend)
+
+
+def test_in_memory_backend_must_not_store_values_when_max_size_is_zero():
+    backend = InMemoryCacheBackend(max_size=0)
+
+    backend.set("foo", "xpto", ttl=30)
+
+    assert [None] == backend.get_many(["foo"])
+
+
+def test_in_memory_backend_must_not_evict_counters():
+    backend = InMemoryCacheBackend(max_size=2)
+
+    backend.incr("foo", ttl=300)
+    backend.set("bar", "1", ttl=30)
+    backend.set("xpto", "2", ttl=30)
+    backend.set("baz", "3", ttl=30)
+
+    assert ["1", None, "2", "3"] == backend.get_many(["foo", "bar", "xpto", "baz"])
+
+
+def test_in_memory_backend_must_purge_expired_counters():
+    backend = InMemoryCacheBackend(max_size=2)
+    backend.incr("foo", ttl=30)
+
+    with patch("time.monotonic", return_value=time.monotonic() + 60):
+        assert 1 == backend.incr("bar", ttl=30)
+
+    assert ["bar"] == list(backend._counters)
+
+
+def test_redis_backend_must_parse_the_url():
+    backend = RedisCacheBackend("redis://:secret@cache.example.com:6380/2")
+
+    assert ("cache.example.com", 6380, 2, "secret") == (backend.host, backend.port, backend.db, backend.password)
+
+
+def test_redis_backend_must_pipeline_incr_and_expire(redis_server):
+    backend = RedisCacheBackend(redis_server.url)
+
+    backend.incr("foo", ttl=30)
+
+    assert [[b"INCR", b"foo"], [b"PEXPIRE", b"foo", b"30000"]] == redis_server.commands
+
+
+def test_redis_backend_must_authenticate_and_select_database(redis_server):
+    backend = RedisCacheBackend(redis_server.url.replace("redis://", "redis://:secret@").replace("/0", "/3"))
+
+    backend.get_many(["foo"])
+
+    assert [[b"AUTH", b"secret"], [b"SELECT", b"3"], [b"MGET", b"foo"]] == redis_server.commands
+
+
+def test_redis_backend_must_raise_cache_exception_when_server_returns_an_error(redis_server):
+    backend = RedisCacheBackend(redis_server.url)
+
+    with pytest.raises(CacheException) as e:
+        backend._execute(["XPTO"])
+
+    assert "ERR unknown command 'XPTO'" == str(e.value)
+
+
+def test_redis_backend_must_drop_the_connection_after_an_error_reply(redis_server):
+    backend = RedisCacheBackend(redis_server.url)
+
+    with pytest.raises(CacheException):
+        backend._execute(["XPTO"], ["SET", "foo", "xpto", "PX", 30000])
+
+    assert backend._idle_connections.empty()
+    assert ["xpto"] == backend.get_many(["foo"])
+
+
+def test_redis_backend_must_reconnect_after_connection_error(redis_server):
+    backend = RedisCacheBackend(redis_server.url)
+    backend.set("foo", "xpto", ttl=30)
+    backend._idle_connections.queue[-1].close()
+
+    with pytest.raises(OSError):
+        backend.get_many(["foo"])
+
+    assert ["xpto"] == backend.get_many(["foo"])
+
+
+def test_redis_backend_must_share_its_connections_between_threads(redis_server):
+    backend = RedisCacheBackend(redis_server.url)
+
+    for _ in range(5):
+        thread = threading.Thread(target=backend.get_many, args=(["foo"],))
+        thread.start()
+        thread.join()
+
+    assert 1 == redis_server.connections
+
+
+def test_redis_backend_must_keep_up_to_max_idle_connections_open(redis_server):
+    backend = RedisCacheBackend(redis_server.url, max_idle_connections=2)
+    connections = [backend._acquire() for _ in range(3)]
+
+    for connection in connections:
+        backend._release(connection)
+
+    assert 2 == backend._idle_connections.qsize()
+    assert -1 == connections[2]._socket.fileno()
+    assert ["OK"] == backend._execute(["PING"])
+
+
+def test_client_cache_must_return_cached_client_when_generation_matches(backend):
+    cache = ClientCache(backend, ttl=30)
+
+    _, stamp = cache.get("foo")
+    cache.set("foo", dict(CLIENT_VALUES), stamp)
+    cached_client, _ = cache.get("foo")
+
+    assert CLIENT_VALUES == cached_client
+    assert dict(hit=1, miss=1, error=0) == cache.stats()
+
+
+def test_client_cache_must_miss_after_invalidate(backend):
+    cache = ClientCache(backend, ttl=30)
+    _, stamp = cache.get("foo")
+    cache.set("foo", dict(CLIENT_VALUES), stamp)
+
+    cache.invalidate("foo")
+
+    assert (None, "0:1") == cache.get("foo")
+
+
+def test_client_cache_must_miss_after_invalidate_all(backend):
+    cache = ClientCache(backend, ttl=30)
+    _, stamp = cache.get("foo")
+    cache.set("foo", dict(CLIENT_VALUES), stamp)
+
+    cache.invalidate_all()
+
+    assert (None, "1:0") == cache.get("foo")
+
+
+def test_client_cache_must_ignore_values_written_with_a_stale_generation(backend):
+    cache = ClientCache(backend, ttl=30)
+    _, stamp = cache.get("foo")
+
+    cache.invalidate("foo")
+    cache.set("foo", dict(CLIENT_VALUES), stamp)
+
+    assert (None, "0:1") == cache.get("foo")
+
+
+def test_client_cache_must_not_serve_a_stale_client_when_the_in_memory_backend_is_full():
+    cache = ClientCache(InMemoryCacheBackend(max_size=3), ttl=30)
+    _, stamp = cache.get("foo")
+
+    cache.invalidate("foo")
+    cache.set("foo", dict(CLIENT_VALUES), stamp)
+    cache.set("bar", dict(CLIENT_VALUES), "0:0")
+    cache.set("xpto", dict(CLIENT_VALUES), "0:0")
+
+    assert (None, "0:1") == cache.get("foo")
+
+
+def test_client_cache_must_not_serve_a_stale_client_after_invalidate_all_when_the_in_memory_backend_is_full():
+    cache = ClientCache(InMemoryCacheBackend(max_size=3), ttl=30)
+    _, stamp = cache.get("foo")
+    cache.set("foo", dict(CLIENT_VALUES), stamp)
+
+    cache.invalidate_all()
+    cache.set("bar", dict(CLIENT_VALUES), "1:0")
+    cache.set("xpto", dict(CLIENT_VALUES), "1:0")
+    cache.set("baz", dict(CLIENT_VALUES), "1:0")
+
+    assert (None, "1:0") == cache.get("foo")
+
+
+@pytest.mark.parametrize("exception", [OSError("Connection refused"), CacheException("ERR")])
+def test_client_cache_must_not_raise_exception_when_backend_fails(exception):
+    backend = Mock()
+    backend.get_many.side_effect = exception
+    backend.set.side_effect = exception
+    backend.incr.side_effect = exception
+    cache = ClientCache(backend, ttl=30)
+
+    assert (None, None) == cache.get("foo")
+    assert dict(hit=0, miss=0, error=1) == cache.stats()
+
+    cache.set("foo", dict(CLIENT_VALUES), "0:0")
+    cache.invalidate("foo")
+    cache.invalidate_all()
+
+
+def test_client_cache_must_not_write_without_generation():
+    backend = Mock()
+    cache = ClientCache(backend, ttl=30)
+
+    cache.set("foo", dict(CLIENT_VALUES), None)
+
+    backend.set.assert_not_called()
+
+
+def test_count_cache_must_return_the_count_by_filters(backend):
+    cache = CountCache(backend, ttl=30)
+
+    cache.set(dict(query=None, filters=dict(name="foo", email="bar")), 10000, False)
+
+    assert (10000, False) == cache.get(dict(filters=dict(email="bar", name="foo"), query=None))
+    assert cache.get(dict(query=None, filters={})) is None
+
+
+@pytest.mark.parametrize("exception", [OSError("Connection refused"), CacheException("ERR")])
+def test_count_cache_must_not_raise_exception_when_backend_fails(exception):
+    backend = Mock()
+    backend.get_many.side_effect = exception
+    backend.set.side_effect = exception
+    cache = CountCache(backend, ttl=30)
+
+    cache.set({}, 1, True)
+
+    assert cache.get({}) is None
+
+
+@pytest.mark.parametrize(["name", "backend_class"], [["memory", InMemoryCacheBackend], ["redis", RedisCacheBackend]])
+def test_create_cache_backend_must_return_the_configured_backend(name, backend_class):
+    config = dict(
+        CLIENT_CACHE_BACKEND=name,
+        CLIENT_CACHE_MAX_SIZE=10,
+        CLIENT_CACHE_REDIS_MAX_IDLE_CONNECTIONS=2,
+        CLIENT_CACHE_REDIS_URL="redis://localhost",
+    )
+
+    assert isinstance(create_cache_backend(config), backend_class)
+
+
+def test_create_cache_backend_must_raise_exception_when_backend_is_invalid():
+    with pytest.raises(ConfigurationNotValid):
+        create_cache_backend(dict(CLIENT_CACHE_BACKEND="xpto"))
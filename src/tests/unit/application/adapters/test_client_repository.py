@@ -1,13 +1,25 @@
 from unittest.mock import Mock, patch
 
 import pytest
+from sqlalchemy import event, null, select, text
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.exc import IntegrityError
 
 from purchasing_manager import db
-from purchasing_manager.application.adapters.client import ClientRepository
+from purchasing_manager.application.adapters.client import (
+    ClientRepository,
+    count_clients_statement,
+    search_clients_statement,
+    update_client_statement,
+    upsert_clients_statement,
+)
+from purchasing_manager.application.adapters.counts import CAPPED, ESTIMATE
 from purchasing_manager.application.exceptions import (
     DatabaseException,
     DuplicateError,
+    InvalidCursorException,
+    InvalidLimitException,
+    InvalidSearchException,
     NotFoundException,
 )
 from purchasing_manager.domain.models.client import Client
@@ -98,6 +110,26 @@ def test_list_clients_with_filters(app, filter, ind_client):
     assert 1 == len(clients)
 
 
+def test_list_clients_with_fields_must_select_only_those_columns(app):
+    clients_obj = generate_clients_objects(2)
+    db.session.add_all(clients_obj)
+    db.session.commit()
+    statements = []
+
+    def _before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        clients = ClientRepository.list(fields=("id", "name"))
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _before_cursor_execute)
+
+    assert sorted((client.id, client.name) for client in clients_obj) == sorted(tuple(row) for row in clients)
+    assert 1 == len(statements)
+    assert "email" not in statements[0]
+
+
 def test_list_clients_no_clients(app):
     clients = ClientRepository.list()
 
@@ -113,6 +145,302 @@ def test_list_clients_raise_exception(app):
     assert message == str(e.value)
 
 
+def test_list_by_cursor_must_walk_through_all_clients_in_order(app):
+    clients_obj = generate_clients_objects(5)
+    expected_response = sorted((client.dict for client in clients_obj), key=lambda c: (c["created_dt"], c["id"]))
+
+    for client in clients_obj:
+        db.session.add(client)
+        db.session.commit()
+
+    result = []
+    cursor = None
+
+    for _ in range(3):
+        clients, cursor = ClientRepository.list_by_cursor(cursor=cursor, limit=2)
+        result.extend(client.dict for client in clients)
+
+    assert expected_response == result
+    assert cursor is None
+
+
+def test_list_by_cursor_must_return_next_cursor_only_when_there_are_more_clients(app):
+    clients_obj = generate_clients_objects(2)
+
+    for client in clients_obj:
+        db.session.add(client)
+        db.session.commit()
+
+    first_page, first_cursor = ClientRepository.list_by_cursor(limit=1)
+    last_page, last_cursor = ClientRepository.list_by_cursor(cursor=first_cursor, limit=1)
+
+    assert 1 == len(first_page)
+    assert first_cursor is not None
+    assert 1 == len(last_page)
+    assert last_cursor is None
+    assert first_page[0].id != last_page[0].id
+
+
+def test_list_by_cursor_with_fields_must_walk_through_all_clients_in_order(app):
+    clients_obj = generate_clients_objects(3)
+    db.session.add_all(clients_obj)
+    db.session.commit()
+    expected_response = [client.name for client in sorted(clients_obj, key=lambda c: (c.created_dt, c.id))]
+
+    first_page, cursor = ClientRepository.list_by_cursor(limit=2, fields=("name",))
+    last_page, last_cursor = ClientRepository.list_by_cursor(cursor=cursor, limit=2, fields=("name",))
+
+    assert expected_response == [client.name for client in first_page + last_page]
+    assert last_cursor is None
+
+
+def test_list_by_cursor_with_filters(app):
+    clients_obj = generate_clients_objects(3)
+    expected_response = [clients_obj[1].dict]
+
+    for client in clients_obj:
+        db.session.add(client)
+        db.session.commit()
+
+    clients, cursor = ClientRepository.list_by_cursor(document=clients_obj[1].document)
+
+    assert expected_response == [client.dict for client in clients]
+    assert cursor is None
+
+
+@pytest.mark.parametrize("cursor", ["xpto", "!!!", "WyJmb28iXQ"])
+def test_list_by_cursor_raise_invalid_cursor_exception(app, cursor):
+    message = "Invalid pagination cursor"
+
+    with pytest.raises(InvalidCursorException) as e:
+        ClientRepository.list_by_cursor(cursor=cursor)
+
+    assert message == str(e.value)
+
+
+@pytest.mark.parametrize("limit", ["xpto", None, 0, -1, 1001])
+def test_list_by_cursor_raise_invalid_limit_exception(app, limit):
+    message = "Invalid limit: send an integer from 1 to 1000"
+
+    with pytest.raises(InvalidLimitException) as e:
+        ClientRepository.list_by_cursor(limit=limit)
+
+    assert message == str(e.value)
+
+
+def test_list_by_cursor_raise_exception(app):
+    message = "Error when trying to retrieve a page of clients from database"
+
+    with patch.object(db.session, "execute", side_effect=Exception("xpto")):
+        with pytest.raises(DatabaseException) as e:
+            ClientRepository.list_by_cursor()
+
+    assert message == str(e.value)
+
+
+def _add_named_clients(*names: str) -> list[Client]:
+    clients = generate_clients_objects(len(names))
+
+    for client, name in zip(clients, names):
+        client.name = name
+
+    db.session.add_all(clients)
+    db.session.commit()
+
+    return clients
+
+
+def test_search_must_match_word_prefixes_of_the_name_ignoring_accents_and_case(app):
+    clients = _add_named_clients("João Silva", "Maria Silveira", "Pedro Souza")
+
+    assert {clients[0].id, clients[1].id} == {client.id for client in ClientRepository.search("SIL")}
+    assert [clients[0].id] == [client.id for client in ClientRepository.search("joao si")]
+    assert [clients[2].id] == [client.id for client in ClientRepository.search("Pédro")]
+    assert [] == ClientRepository.search("ilva")
+
+
+def test_search_must_match_the_email(app):
+    clients = _add_named_clients("João Silva", "Maria Silveira")
+
+    assert [clients[1].id] == [client.id for client in ClientRepository.search(clients[1].email.split("@")[0][:4])]
+
+
+def test_search_must_follow_updates_and_deletes(app):
+    clients = _add_named_clients("João Silva", "Maria Silveira")
+
+    ClientRepository.update(Client(id=clients[0].id, name="Pedro Souza"))
+    ClientRepository.delete(clients[1].id)
+
+    assert [] == ClientRepository.search("silv")
+    assert [clients[0].id] == [client.id for client in ClientRepository.search("souza")]
+
+
+def test_search_must_follow_the_clients_when_their_rowids_change(app):
+    # As a VACUUM may do, or the copy of the table by a batch migration
+    clients = _add_named_clients("João Silva", "Pedro Souza")
+    db.session.execute(text("UPDATE client SET rowid = rowid + 100"))
+    db.session.commit()
+
+    ClientRepository.update(Client(id=clients[1].id, name="Pedro Santos"))
+
+    assert [clients[0].id] == [client.id for client in ClientRepository.search("silva")]
+    assert [clients[1].id] == [client.id for client in ClientRepository.search("santos")]
+    assert [] == ClientRepository.search("souza")
+
+
+def test_search_with_fields_filters_offset_and_limit(app):
+    clients = _add_named_clients("Ana Silva", "Ana Souza", "Ana Santos")
+
+    rows = ClientRepository.search("ana", offset=1, limit=1, fields=("id", "name"))
+    filtered = ClientRepository.search("ana", document=clients[2].document)
+
+    assert 1 == len(rows)
+    assert ("id", "name") == tuple(rows[0]._fields)
+    assert [clients[2].id] == [client.id for client in filtered]
+
+
+@pytest.mark.parametrize("query", ["", "  ", "!!!"])
+def test_search_raise_invalid_search_exception(app, query):
+    with pytest.raises(InvalidSearchException):
+        ClientRepository.search(query)
+
+
+def test_search_raise_exception(app):
+    message = "Error when trying to search clients in database"
+
+    with pytest.raises(DatabaseException) as e:
+        ClientRepository.search("ana", xpto="foo")
+
+    assert message == str(e.value)
+
+
+def test_search_statement_must_match_word_prefixes_with_the_trigram_index_on_postgresql(app):
+    compiled = search_clients_statement("João Sil", None, {}, "postgresql").compile(dialect=postgresql.dialect())
+
+    assert "client.search ~" in str(compiled)
+    assert "ORDER BY word_similarity(" in str(compiled)
+    assert {r"\mjoao", r"\msil", "joao sil"} <= set(compiled.params.values())
+
+
+def test_version_must_return_the_updated_dt_from_database_and_then_from_cache(app):
+    client = _add_named_clients("Ana")[0]
+
+    version = ClientRepository.version(client.id)
+    ClientRepository.retrieve(client.id)
+
+    with patch.object(db.session, "execute") as mock_execute:
+        cached_version = ClientRepository.version(client.id)
+
+    mock_execute.assert_not_called()
+    assert client.updated_dt == version == cached_version
+    assert ClientRepository.version("xpto") is None
+
+
+def test_count_must_read_the_counter_kept_by_inserts_and_deletes(app):
+    app.extensions["client_count_cache"].ttl = 0
+    clients = _add_named_clients("Ana", "Bia", "Carla")
+
+    total = ClientRepository.count()
+    ClientRepository.delete(clients[0].id)
+
+    assert (3, True) == total
+    assert (2, True) == ClientRepository.count()
+
+
+def test_count_with_filters_must_stop_at_the_max_count(app):
+    app.extensions["client_count_cache"].ttl = 0
+    _add_named_clients("Ana Silva", "Ana Souza", "Ana Santos", "Bia Silva")
+
+    app.config["CLIENT_COUNT_MAX"] = 2
+    capped = ClientRepository.count(name="Ana Silva"), ClientRepository.count("ana"), ClientRepository.count("silva")
+    app.config["CLIENT_COUNT_MAX"] = 3
+    exact = ClientRepository.count("ana")
+
+    assert ((1, True), (2, False), (2, True)) == capped
+    assert (3, True) == exact
+
+
+def test_count_must_be_cached(app):
+    _add_named_clients("Ana")
+
+    total = ClientRepository.count()
+    _add_named_clients("Bia")
+
+    assert (1, True) == total
+    assert (1, True) == ClientRepository.count()
+    assert (2, True) == ClientRepository.count("")
+
+
+def test_count_must_fall_back_to_a_capped_count_when_the_estimate_is_missing(app):
+    _add_named_clients("Ana", "Bia")
+
+    with patch(
+        "purchasing_manager.application.adapters.statements.total_count_statement",
+        return_value=(select(null()), ESTIMATE),
+    ):
+        assert (2, True) == ClientRepository.count()
+
+
+def test_count_statement_must_use_the_planner_estimate_on_postgresql_without_filters(app):
+    estimate, estimate_kind = count_clients_statement(None, {}, "postgresql", 10)
+    filtered, filtered_kind = count_clients_statement(None, {"name": "Ana"}, "postgresql", 10)
+
+    assert ESTIMATE == estimate_kind
+    assert "pg_class" in str(estimate)
+    assert CAPPED == filtered_kind
+    assert "LIMIT" in str(filtered.compile(dialect=postgresql.dialect()))
+
+
+def test_count_raise_exception(app):
+    message = "Error when trying to count clients in database"
+
+    with pytest.raises(DatabaseException) as e:
+        ClientRepository.count(xpto="foo")
+
+    assert message == str(e.value)
+
+
+def test_stream_must_yield_clients_in_batches(app):
+    clients_obj = generate_clients_objects(5)
+    expected_response = [client.dict for client in clients_obj]
+
+    for client in clients_obj:
+        db.session.add(client)
+        db.session.commit()
+
+    batches = list(ClientRepository.stream(batch_size=2))
+
+    assert [2, 2, 1] == [len(batch) for batch in batches]
+    assert sorted(expected_response, key=lambda c: c["id"]) == sorted(
+        (Client.as_dict(client) for batch in batches for client in batch), key=lambda c: c["id"]
+    )
+
+
+def test_stream_must_use_a_server_side_cursor_with_filters(app):
+    clients_obj = generate_clients_objects(3)
+
+    for client in clients_obj:
+        db.session.add(client)
+        db.session.commit()
+
+    with patch.object(db.session, "execute", wraps=db.session.execute) as mock_execute:
+        batches = list(ClientRepository.stream(email=clients_obj[2].email))
+
+    statement = mock_execute.call_args.args[0]
+
+    assert statement.get_execution_options()["stream_results"]
+    assert [[clients_obj[2].id]] == [[client.id for client in batch] for batch in batches]
+
+
+def test_stream_raise_exception(app):
+    message = "Error when trying to stream clients from database"
+
+    with pytest.raises(DatabaseException) as e:
+        list(ClientRepository.stream(xpto="foo"))
+
+    assert message == str(e.value)
+
+
 def test_retrieve_client_must_return_with_success(app):
     clients_obj = generate_clients_objects(2)
     expected_response = clients_obj[1].dict
@@ -137,6 +465,66 @@ def test_retrieve_client_must_return_none(app):
     assert client is None
 
 
+def test_retrieve_client_must_use_a_single_primary_key_lookup(app):
+    client = generate_clients_objects(1)[0]
+    expected_response = client.dict
+    db.session.add(client)
+    db.session.commit()
+
+    with patch.object(db.session, "get", wraps=db.session.get) as mock_get:
+        response = ClientRepository.retrieve(expected_response["id"])
+
+    mock_get.assert_called_once_with(Client, expected_response["id"])
+    assert expected_response == response.dict
+
+
+def test_retrieve_client_with_fields_must_select_only_those_columns(app):
+    client = generate_clients_objects(1)[0]
+    db.session.add(client)
+    db.session.commit()
+
+    with patch.object(db.session, "get") as mock_get:
+        response = ClientRepository.retrieve(client.id, fields=("name",))
+
+    mock_get.assert_not_called()
+    assert (client.name,) == tuple(response)
+
+
+def test_retrieve_client_must_return_cached_client_without_querying_database(app):
+    client = generate_clients_objects(1)[0]
+    db.session.add(client)
+    db.session.commit()
+    expected_response = client.dict
+
+    ClientRepository.retrieve(client.id)
+
+    with patch.object(db.session, "get") as mock_get:
+        response = ClientRepository.retrieve(client.id)
+
+    mock_get.assert_not_called()
+    assert expected_response == response.dict
+
+
+@pytest.mark.parametrize("operation", ["update", "delete"])
+def test_update_and_delete_must_invalidate_cached_client(app, operation):
+    client = generate_clients_objects(1)[0]
+    id = client.id
+    db.session.add(client)
+    db.session.commit()
+    cache = app.extensions["client_cache"]
+
+    ClientRepository.retrieve(id)
+
+    assert cache.get(id)[0] is not None
+
+    if operation == "update":
+        ClientRepository.update(Client(id=id, phone="11999887766"))
+    else:
+        ClientRepository.delete(id)
+
+    assert cache.get(id)[0] is None
+
+
 def test_retrieve_client_raise_exception():
     message = "Error when trying to retrieve a client from database"
 
@@ -191,6 +579,138 @@ def test_create_client_raise_exception(app):
     assert 0 == len(ClientRepository().list())
 
 
+def test_bulk_create_must_add_all_clients_in_batches(app):
+    clients = generate_clients_objects(5)
+
+    duplicates = ClientRepository.bulk_create(clients, batch_size=2)
+
+    assert [] == duplicates
+    assert 5 == len(ClientRepository.list())
+
+
+def test_bulk_create_must_return_clients_already_in_database(app):
+    clients = generate_clients_objects(3)
+    db.session.add(clients[1])
+    db.session.commit()
+    duplicated_client = Client(**{**clients[0].dict, "id": clients[1].id, "document": clients[1].document})
+    duplicated_client.created_dt = clients[0].created_dt
+    duplicated_client.updated_dt = clients[0].updated_dt
+
+    duplicates = ClientRepository.bulk_create([clients[0], duplicated_client, clients[2]])
+
+    assert [duplicated_client] == duplicates
+    assert 3 == len(ClientRepository.list())
+
+
+@patch("purchasing_manager.application.adapters.client.ClientRepository._insert_one_by_one")
+def test_bulk_create_must_insert_one_by_one_when_batch_conflicts(mock_insert_one_by_one, app):
+    clients = generate_clients_objects(2)
+    mock_insert_one_by_one.return_value = [clients[1]]
+
+    with patch.object(db.session, "execute", side_effect=IntegrityError(Mock(), Mock(), Mock())):
+        duplicates = ClientRepository.bulk_create(clients)
+
+    mock_insert_one_by_one.assert_called_once_with(clients)
+    assert [clients[1]] == duplicates
+
+
+def test_insert_one_by_one_must_return_duplicated_clients(app):
+    clients = generate_clients_objects(2)
+    db.session.add(clients[0])
+    db.session.commit()
+    duplicated_client = Client(**{**clients[1].dict, "document": clients[0].document})
+    duplicated_client.created_dt = clients[1].created_dt
+    duplicated_client.updated_dt = clients[1].updated_dt
+
+    duplicates = ClientRepository._insert_one_by_one([duplicated_client])
+
+    assert [duplicated_client] == duplicates
+    assert 1 == len(ClientRepository.list())
+
+
+def test_bulk_create_raise_exception(app):
+    message = "Error when trying to save a batch of new clients in database"
+
+    with pytest.raises(DatabaseException) as e:
+        ClientRepository.bulk_create([Mock()])
+
+    assert message == str(e.value)
+    assert 0 == len(ClientRepository.list())
+
+
+def test_upsert_must_create_client_when_document_is_not_in_database(app):
+    client = generate_clients_objects(1)[0]
+    expected_response = client.dict
+
+    response = ClientRepository.upsert(client)
+
+    assert expected_response == response.dict
+    assert 1 == len(ClientRepository.list())
+
+
+def test_upsert_must_update_client_when_document_is_already_in_database(app):
+    clients = generate_clients_objects(2)
+    old_client = clients[0].dict
+    db.session.add(clients[0])
+    db.session.commit()
+    new_client = clients[1]
+    new_client.document = old_client["document"]
+
+    response = ClientRepository.upsert(new_client)
+
+    assert old_client["id"] == response.id
+    assert old_client["created_dt"] == str(response.created_dt)
+    assert (new_client.name, new_client.phone, new_client.email) == (response.name, response.phone, response.email)
+    assert 1 == len(ClientRepository.list())
+
+
+def test_upsert_raise_exception(app):
+    client = generate_clients_objects(1)[0]
+    client.name = None
+    message = f"Error when trying to upsert a client with document '{client.document}' in database"
+
+    with pytest.raises(DatabaseException) as e:
+        ClientRepository.upsert(client)
+
+    assert message == str(e.value)
+
+
+def test_upsert_statement_must_use_on_conflict_do_update(app):
+    client = generate_clients_objects(1)[0]
+
+    statement = str(upsert_clients_statement([client.dict]).compile(dialect=postgresql.dialect()))
+
+    assert "ON CONFLICT (document) DO UPDATE SET" in statement
+    assert "name = excluded.name" in statement
+    assert "updated_dt = excluded.updated_dt" in statement
+    assert "id = excluded.id" not in statement
+
+
+def test_bulk_upsert_must_create_and_update_clients_in_batches(app):
+    clients = generate_clients_objects(4)
+    db.session.add(clients[0])
+    db.session.commit()
+    updated_client = Client(**{**generate_clients_objects(1)[0].dict, "document": clients[0].document})
+    updated_client.created_dt, updated_client.updated_dt = clients[1].created_dt, clients[1].updated_dt
+
+    ClientRepository.bulk_upsert([updated_client, *clients[1:]], batch_size=2)
+
+    documents = {client.document: client for client in ClientRepository.list()}
+
+    assert 4 == len(documents)
+    assert clients[0].id == documents[clients[0].document].id
+    assert updated_client.name == documents[clients[0].document].name
+
+
+def test_bulk_upsert_raise_exception(app):
+    message = "Error when trying to upsert a batch of clients in database"
+
+    with pytest.raises(DatabaseException) as e:
+        ClientRepository.bulk_upsert([Mock()])
+
+    assert message == str(e.value)
+
+
 @pytest.mark.parametrize(
     "attrs_to_update",
     [[], ["name"], ["phone"], ["email"], ["name", "phone"], ["phone", "email"], ["name", "phone", "email"]],
@@ -235,6 +755,53 @@ def test_update_client_must_update_with_success(attrs_to_update, app):
         assert old_client["email"] != response.email
 
 
+def test_update_client_must_issue_a_single_update_statement(app):
+    client = generate_clients_objects(1)[0]
+    id = client.id
+    db.session.add(client)
+    db.session.commit()
+    statements = []
+
+    def _before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement.split()[0])
+
+    event.listen(db.engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        ClientRepository.update(Client(id=id, phone="11999887766"))
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _before_cursor_execute)
+
+    assert ["UPDATE", "SELECT"] == statements
+
+
+def test_update_client_must_use_returning_when_dialect_supports_it(app):
+    client = generate_clients_objects(1)[0]
+    row = Mock(_mapping=client.dict)
+
+    with patch.object(db.engine.dialect, "full_returning", True), patch.object(db.session, "execute") as mock_execute:
+        mock_execute.return_value.one_or_none.return_value = row
+        response = ClientRepository.update(Client(id=client.id, phone="11999887766"))
+
+    statement = mock_execute.call_args.args[0]
+
+    mock_execute.assert_called_once()
+    assert statement._returning
+    assert client.dict == response.dict
+
+
+def test_update_statement_must_normalise_name_and_return_the_row(app):
+    client = Client(id="xpto", name="fulano beltrano", email="fulano@example.com")
+
+    compiled = (
+        update_client_statement(client).returning(*Client.__table__.columns).compile(dialect=postgresql.dialect())
+    )
+
+    assert str(compiled).startswith("UPDATE client SET updated_dt=")
+    assert "WHERE client.id = %(id_1)s RETURNING client.id" in str(compiled)
+    assert "Fulano Beltrano" == compiled.params["name"]
+    assert "phone" not in compiled.params
+
+
 def test_update_client_raise_not_found_exception_when_client_is_not_found(app):
     message = "Client not found"
     client = generate_clients_objects(1)[0]
@@ -281,6 +848,25 @@ def test_delete_client_must_delete_successfully(app):
     assert 0 == len(ClientRepository.list())
 
 
+def test_delete_client_must_issue_a_single_delete_statement(app):
+    client = generate_clients_objects(1)[0]
+    id = client.id
+    db.session.add(client)
+    db.session.commit()
+    statements = []
+
+    def _before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement.split()[0])
+
+    event.listen(db.engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        ClientRepository.delete(id)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _before_cursor_execute)
+
+    assert ["DELETE"] == statements
+
+
 def test_delete_client_must_raise_not_found_exception_when_client_is_not_in_database(app):
     clients = generate_clients_objects(3)
     message = "Client not found"
@@ -298,9 +884,9 @@ def test_delete_client_must_raise_not_found_exception_when_client_is_not_in_data
     assert 2 == len(ClientRepository.list())
 
 
-@patch("purchasing_manager.db.session.delete")
-def test_delete_client_must_raise_database_exception_when_some_unknown_exception_is_raised(mock_delete, app):
-    mock_delete.side_effect = Exception("It's not a bug. It's feature")
+@patch("purchasing_manager.db.session.execute")
+def test_delete_client_must_raise_database_exception_when_some_unknown_exception_is_raised(mock_execute, app):
+    mock_execute.side_effect = Exception("It's not a bug. It's feature")
     client = generate_clients_objects(1)[0]
     message = f"Error when trying to delete a client with id '{client.id}' in database"
 
@@ -311,3 +897,42 @@ def test_delete_client_must_raise_database_exception_when_some_unknown_exception
         ClientRepository.delete(client.id)
 
     assert message == str(e.value)
+
+
+def test_bulk_delete_must_delete_clients_in_batches(app):
+    clients = generate_clients_objects(5)
+    ids = [client.id for client in clients]
+
+    for client in clients:
+        db.session.add(client)
+        db.session.commit()
+
+    with patch.object(db.session, "execute", wraps=db.session.execute) as mock_execute:
+        deleted = ClientRepository.bulk_delete([*ids[:4], "xpto"], batch_size=2)
+
+    assert 4 == deleted
+    assert 3 == mock_execute.call_count
+    assert [ids[4]] == [client.id for client in ClientRepository.list()]
+
+
+def test_bulk_delete_must_invalidate_cached_clients(app):
+    client = generate_clients_objects(1)[0]
+    id = client.id
+    db.session.add(client)
+    db.session.commit()
+    cache = app.extensions["client_cache"]
+
+    ClientRepository.retrieve(id)
+    ClientRepository.bulk_delete([id])
+
+    assert cache.get(id)[0] is None
+    assert ClientRepository.retrieve(id) is None
+
+
+def test_bulk_delete_raise_exception(app):
+    message = "Error when trying to delete a batch of clients in database"
+
+    with pytest.raises(DatabaseException) as e:
+        ClientRepository.bulk_delete([Mock()])
+
+    assert message == str(e.value)
@@ -0,0 +1,83 @@
+import json
+from collections import namedtuple
+
+import pytest
+
+from purchasing_manager.application import serializers
+from purchasing_manager.application.serializers import (
+    ModelSerializer,
+    RawJSON,
+    client_serializer,
+    dumps,
+    dumps_page,
+)
+from purchasing_manager.domain.models.client import Client
+from tests.doubles.stub import generate_clients_objects
+
+
+def test_client_serializer_must_encode_the_same_document_as_the_client_dict():
+    client = generate_clients_objects(1)[0]
+
+    response = client_serializer.dumps(client)
+
+    assert isinstance(response, RawJSON)
+    assert client.dict == json.loads(response)
+    assert list(client.dict) == list(json.loads(response))
+
+
+def test_client_serializer_must_escape_strings():
+    client = generate_clients_objects(1)[0]
+    client.name = 'João "Zé"\n\\'
+
+    assert 'João "Zé"\n\\' == json.loads(client_serializer.dumps(client))["name"]
+
+
+def test_client_serializer_must_encode_rows_and_none_values():
+    Row = namedtuple("Row", client_serializer.fields)
+    client = generate_clients_objects(1)[0]
+    row = Row(*[getattr(client, field) for field in client_serializer.fields])._replace(email=None)
+
+    assert {**client.dict, "email": None} == json.loads(client_serializer.dumps(row))
+
+
+def test_client_serializer_must_encode_lists_and_lines():
+    clients = generate_clients_objects(3)
+
+    assert [client.dict for client in clients] == json.loads(client_serializer.dumps_many(clients))
+    assert b"[]" == client_serializer.dumps_many([])
+    assert [client.dict for client in clients] == [
+        json.loads(line) for line in client_serializer.lines(clients).splitlines()
+    ]
+
+
+def test_dumps_page_must_wrap_the_clients_and_the_cursor():
+    clients = generate_clients_objects(2)
+
+    response = dumps_page(client_serializer, clients, None)
+
+    assert dict(clients=[client.dict for client in clients], next_cursor=None) == json.loads(response)
+
+
+def test_model_serializer_must_encode_only_the_chosen_fields():
+    client = generate_clients_objects(1)[0]
+
+    serializer = ModelSerializer.from_model(Client, ["name"])
+
+    assert dict(name=client.name) == json.loads(serializer.dumps(client))
+
+
+@pytest.mark.parametrize("backend", ["orjson", "json"])
+def test_dumps_must_encode_with_the_chosen_backend(backend):
+    assert b'{"message":"ok","items":[1,null]}' == dumps(dict(message="ok", items=[1, None]), backend=backend)
+
+
+def test_dumps_must_fall_back_to_the_stdlib_when_orjson_is_missing(monkeypatch):
+    monkeypatch.setattr(serializers, "orjson", None)
+
+    assert b'{"message":"ok"}' == dumps(dict(message="ok"))
+
+
+def test_dumps_must_return_raw_json_as_it_is():
+    document = RawJSON(b'{"id":"1"}')
+
+    assert document is dumps(document)
@@ -1,3 +1,6 @@
+import io
+import json
+from datetime import datetime
 from http import HTTPStatus
 from unittest.mock import patch
 
@@ -5,6 +8,9 @@ import pytest
 
 from purchasing_manager.application.exceptions import (
     DuplicateError,
+    InvalidAttributeException,
+    InvalidCursorException,
+    InvalidSearchException,
     MissingAttributeException,
     NotFoundException,
 )
@@ -23,6 +29,30 @@ def test_get_clients_return_a_list_of_clients(mock_list):
 
     response = ClientUseCases().get_clients()
 
+    assert expected_response == json.loads(response[0])
+
+
+@patch("purchasing_manager.application.adapters.client.ClientRepository.list")
+def test_get_clients_must_select_and_return_only_the_chosen_fields(mock_list):
+    clients = generate_clients_objects(2)
+    mock_list.return_value = clients
+
+    response = ClientUseCases().get_clients(fields=" name, id,name", limit="2")
+
+    mock_list.assert_called_once_with(fields=("name", "id"), limit="2")
+    assert [dict(name=client.name, id=client.id) for client in clients] == json.loads(response[0])
+
+
+@pytest.mark.parametrize("method", ["get_clients", "get_clients_page"])
+@patch("purchasing_manager.application.adapters.client.ClientRepository.list_by_cursor")
+@patch("purchasing_manager.application.adapters.client.ClientRepository.list")
+def test_get_clients_must_return_bad_request_when_fields_are_invalid(mock_list, mock_list_by_cursor, method):
+    expected_response = dict(message="Invalid fields: xpto, foo"), HTTPStatus.BAD_REQUEST
+
+    response = getattr(ClientUseCases(), method)(fields="id,xpto,foo")
+
+    mock_list.assert_not_called()
+    mock_list_by_cursor.assert_not_called()
     assert expected_response == response
 
 
@@ -49,6 +79,131 @@ def test_get_clients_raises_exception(mock_list):
     assert message == str(e.value)
 
 
+@patch("purchasing_manager.application.adapters.client.ClientRepository.list_by_cursor")
+@patch("purchasing_manager.application.adapters.client.ClientRepository.list")
+def test_get_clients_return_a_page_of_clients_when_cursor_is_sent(mock_list, mock_list_by_cursor):
+    clients = generate_clients_objects(2)
+    mock_list_by_cursor.return_value = clients, "next"
+
+    expected_response = dict(clients=[client.dict for client in clients], next_cursor="next")
+
+    response = ClientUseCases().get_clients(cursor="", limit="2", offset="10")
+
+    mock_list.assert_not_called()
+    mock_list_by_cursor.assert_called_once_with(cursor=None, fields=None, limit="2")
+    assert expected_response == json.loads(response[0])
+
+
+@patch("purchasing_manager.application.adapters.client.ClientRepository.list_by_cursor")
+def test_get_clients_page_return_not_found(mock_list_by_cursor):
+    mock_list_by_cursor.return_value = [], None
+
+    expected_response = NOT_FOUND_MESSAGE, HTTPStatus.NOT_FOUND
+
+    response = ClientUseCases().get_clients_page(cursor="abc")
+
+    mock_list_by_cursor.assert_called_once_with(cursor="abc", fields=None)
+    assert expected_response == response
+
+
+@patch("purchasing_manager.application.adapters.client.ClientRepository.list_by_cursor")
+def test_get_clients_page_return_bad_request_when_cursor_is_invalid(mock_list_by_cursor):
+    mock_list_by_cursor.side_effect = InvalidCursorException("Invalid pagination cursor")
+
+    expected_response = dict(message="Invalid pagination cursor"), HTTPStatus.BAD_REQUEST
+
+    response = ClientUseCases().get_clients_page(cursor="xpto")
+
+    assert expected_response == response
+
+
+@patch("purchasing_manager.application.adapters.client.ClientRepository.search")
+@patch("purchasing_manager.application.adapters.client.ClientRepository.list_by_cursor")
+def test_get_clients_must_search_when_q_is_sent(mock_list_by_cursor, mock_search):
+    clients = generate_clients_objects(2)
+    mock_search.return_value = clients
+
+    response = ClientUseCases().get_clients(q="joao", cursor="", fields="id", limit="2")
+
+    mock_list_by_cursor.assert_not_called()
+    mock_search.assert_called_once_with("joao", fields=("id",), limit="2")
+    assert [dict(id=client.id) for client in clients] == json.loads(response[0])
+
+
+@patch("purchasing_manager.application.adapters.client.ClientRepository.count")
+@patch("purchasing_manager.application.adapters.client.ClientRepository.search")
+def test_get_clients_must_send_the_total_count_of_the_filters_when_count_is_sent(mock_search, mock_count):
+    clients = generate_clients_objects(2)
+    mock_search.return_value = clients
+    mock_count.return_value = 10000, False
+
+    response, status, headers = ClientUseCases().get_clients(
+        q="joao", email="foo", fields="id", offset="2", limit="2", count="true"
+    )
+
+    mock_search.assert_called_once_with("joao", fields=("id",), email="foo", offset="2", limit="2")
+    mock_count.assert_called_once_with(query="joao", email="foo")
+    assert [dict(id=client.id) for client in clients] == json.loads(response)
+    assert HTTPStatus.OK == status
+    assert {"X-Total-Count": "10000", "X-Total-Count-Exact": "false"}.items() <= headers.items()
+
+
+@pytest.mark.parametrize("count", ["false", "0", ""])
+@patch("purchasing_manager.application.adapters.client.ClientRepository.count")
+@patch("purchasing_manager.application.adapters.client.ClientRepository.list")
+def test_get_clients_must_not_count_when_count_is_not_true(mock_list, mock_count, count):
+    mock_list.return_value = generate_clients_objects(1)
+
+    ClientUseCases().get_clients(count=count)
+
+    mock_list.assert_called_once_with(fields=None)
+    mock_count.assert_not_called()
+
+
+@patch("purchasing_manager.application.adapters.client.ClientRepository.count")
+@patch("purchasing_manager.application.adapters.client.ClientRepository.list")
+def test_get_clients_must_not_count_when_the_list_fails(mock_list, mock_count):
+    mock_list.return_value = []
+
+    response = ClientUseCases().get_clients(count="true")
+
+    mock_count.assert_not_called()
+    assert (NOT_FOUND_MESSAGE, HTTPStatus.NOT_FOUND) == response
+
+
+@patch("purchasing_manager.application.adapters.client.ClientRepository.search")
+def test_search_clients_return_not_found(mock_search):
+    mock_search.return_value = []
+
+    response = ClientUseCases().search_clients(q="joao")
+
+    assert (NOT_FOUND_MESSAGE, HTTPStatus.NOT_FOUND) == response
+
+
+@patch("purchasing_manager.application.adapters.client.ClientRepository.search")
+def test_search_clients_return_bad_request_when_query_is_invalid(mock_search):
+    message = "Invalid search: send at least one letter or digit"
+    mock_search.side_effect = InvalidSearchException(message)
+
+    response = ClientUseCases().search_clients(q="!!")
+
+    assert (dict(message=message), HTTPStatus.BAD_REQUEST) == response
+
+
+@patch("purchasing_manager.application.adapters.client.ClientRepository.stream")
+def test_export_must_yield_a_ndjson_chunk_per_batch(mock_stream):
+    clients = generate_clients_objects(3)
+    mock_stream.return_value = iter([clients[:2], clients[2:]])
+
+    response = list(ClientUseCases().export(document="xpto"))
+
+    mock_stream.assert_called_once_with(document="xpto")
+    assert 2 == len(response)
+    assert [client.dict for client in clients] == [
+        json.loads(line) for chunk in response for line in chunk.splitlines()
+    ]
+
+
 @patch("purchasing_manager.application.adapters.client.ClientRepository.retrieve")
 def test_retrieve_return_a_client(mock_retrieve):
     client = generate_clients_objects(1)[0]
@@ -56,7 +211,108 @@ def test_retrieve_return_a_client(mock_retrieve):
 
     response = ClientUseCases().retrieve("foo")
 
-    assert client.dict == response
+    assert client.dict == json.loads(response[0])
+
+
+@patch("purchasing_manager.application.adapters.client.ClientRepository.retrieve")
+def test_retrieve_with_fields_must_return_only_the_chosen_fields(mock_retrieve):
+    client = generate_clients_objects(1)[0]
+    mock_retrieve.return_value = client
+
+    response = ClientUseCases().retrieve("foo", fields="phone")
+
+    mock_retrieve.assert_called_once_with("foo", fields=("phone",))
+    assert dict(phone=client.phone) == json.loads(response[0])
+
+
+@patch("purchasing_manager.application.adapters.client.ClientRepository.version")
+@patch("purchasing_manager.application.adapters.client.ClientRepository.retrieve")
+def test_retrieve_must_send_a_strong_etag_by_version_and_fields(mock_retrieve, mock_version):
+    client = generate_clients_objects(1)[0]
+    mock_retrieve.return_value = client
+
+    _, status, headers = ClientUseCases().retrieve(client.id)
+    _, _, fields_headers = ClientUseCases().retrieve(client.id, fields="phone")
+    client.updated_dt = datetime(2026, 10, 18, 12, 30)
+    _, _, updated_headers = ClientUseCases().retrieve(client.id)
+
+    mock_version.assert_not_called()
+    assert HTTPStatus.OK == status
+    assert headers["ETag"].startswith('"')
+    assert 3 == len({headers["ETag"], fields_headers["ETag"], updated_headers["ETag"]})
+
+
+@patch("purchasing_manager.application.adapters.client.ClientRepository.version")
+@patch("purchasing_manager.application.adapters.client.ClientRepository.retrieve")
+def test_retrieve_must_return_not_modified_from_the_version_when_the_etag_matches(mock_retrieve, mock_version):
+    client = generate_clients_objects(1)[0]
+    mock_retrieve.return_value = client
+    mock_version.return_value = client.updated_dt
+    _, _, headers = ClientUseCases().retrieve(client.id)
+    mock_retrieve.reset_mock()
+
+    response = ClientUseCases().retrieve(client.id, if_none_match=f'"xpto", W/{headers["ETag"]}')
+
+    mock_version.assert_called_once_with(client.id)
+    mock_retrieve.assert_not_called()
+    assert (b"", HTTPStatus.NOT_MODIFIED, headers) == response
+
+
+@patch("purchasing_manager.application.adapters.client.ClientRepository.version")
+@patch("purchasing_manager.application.adapters.client.ClientRepository.retrieve")
+def test_retrieve_must_return_the_client_when_the_etag_is_stale(mock_retrieve, mock_version):
+    client = generate_clients_objects(1)[0]
+    mock_retrieve.return_value = client
+    mock_version.return_value = client.updated_dt
+
+    response, status, headers = ClientUseCases().retrieve(client.id, if_none_match='"stale"')
+
+    assert client.dict == json.loads(response)
+    assert HTTPStatus.OK == status
+    assert '"stale"' != headers["ETag"]
+
+
+@patch("purchasing_manager.application.serializers.ModelSerializer.dumps_many")
+@patch("purchasing_manager.application.adapters.client.ClientRepository.list")
+def test_get_clients_must_return_not_modified_before_serializing_when_the_etag_matches(mock_list, mock_dumps_many):
+    mock_list.return_value = generate_clients_objects(2)
+    mock_dumps_many.return_value = b"[]"
+    _, _, headers = ClientUseCases().get_clients()
+    mock_dumps_many.reset_mock()
+
+    response = ClientUseCases().get_clients(if_none_match=headers["ETag"])
+
+    mock_dumps_many.assert_not_called()
+    assert headers["ETag"].startswith('W/"')
+    assert (b"", HTTPStatus.NOT_MODIFIED, headers) == response
+
+
+@patch("purchasing_manager.application.adapters.client.ClientRepository.list")
+def test_get_clients_must_send_a_weak_etag_of_the_body_when_the_fields_leave_the_version_out(mock_list):
+    clients = generate_clients_objects(2)
+    mock_list.return_value = clients
+
+    _, _, headers = ClientUseCases().get_clients(fields="name")
+    clients[0].name = "Fulano"
+    _, _, renamed_headers = ClientUseCases().get_clients(fields="name")
+    not_modified = ClientUseCases().get_clients(fields="name", if_none_match=renamed_headers["ETag"])
+
+    assert headers["ETag"] != renamed_headers["ETag"]
+    assert HTTPStatus.NOT_MODIFIED == not_modified[1]
+
+
+@patch("purchasing_manager.application.adapters.client.ClientRepository.list_by_cursor")
+def test_get_clients_page_must_change_the_etag_when_a_next_page_appears(mock_list_by_cursor):
+    clients = generate_clients_objects(2)
+    mock_list_by_cursor.return_value = clients, None
+    _, _, headers = ClientUseCases().get_clients_page(cursor="abc")
+    mock_list_by_cursor.return_value = clients, "next"
+
+    response, status, next_headers = ClientUseCases().get_clients_page(cursor="abc", if_none_match=headers["ETag"])
+
+    assert HTTPStatus.OK == status
+    assert "next" == json.loads(response)["next_cursor"]
+    assert headers["ETag"] != next_headers["ETag"]
 
 
 @patch("purchasing_manager.application.adapters.client.ClientRepository.retrieve")
@@ -88,11 +344,11 @@ def test_create_must_create_with_success_and_return_201(mock_create, mock_create
 
     mock_create_client_object.return_value = client
 
-    response = ClientUseCases().create(**client.dict)
+    response, status = ClientUseCases().create(**client.dict)
 
     mock_create_client_object.assert_called_once_with(**client.dict)
     mock_create.assert_called_once_with(client)
-    assert expected_response == response
+    assert expected_response == (json.loads(response), status)
 
 
 @patch("purchasing_manager.application.use_cases.client.ClientUseCases._create_client_object")
@@ -137,6 +393,210 @@ def test_create_must_raise_exception_when_some_unknown_exception_is_raised(mock_
     assert message == str(e.value)
 
 
+def _bulk_payload(clients):
+    return [
+        dict(full_name=client.name, document=client.document, phone=client.phone, email=client.email)
+        for client in clients
+    ]
+
+
+@patch("purchasing_manager.application.adapters.client.ClientRepository.bulk_create")
+def test_bulk_create_must_return_the_result_of_each_client(mock_bulk_create, app):
+    clients = generate_clients_objects(3)
+    payload = _bulk_payload(clients)
+    payload.insert(1, dict(document="12345678900"))
+    payload.append(dict(payload[0]))
+    mock_bulk_create.side_effect = lambda new_clients, batch_size: [new_clients[1]]
+
+    response, status = ClientUseCases().bulk_create(payload)
+
+    created_documents = [client.document for client in mock_bulk_create.call_args.args[0]]
+
+    assert HTTPStatus.OK == status
+    assert [client.document for client in clients] == created_documents
+    assert (2, 2, 1) == (response["created"], response["duplicated"], response["invalid"])
+    assert ["created", "invalid", "duplicated", "created", "duplicated"] == [
+        result["status"] for result in response["results"]
+    ]
+    assert list(range(5)) == [result["index"] for result in response["results"]]
+    assert "Missing the following attribute: 'full_name'" == response["results"][1]["message"]
+    assert mock_bulk_create.call_args.args[0][0].id == response["results"][0]["id"]
+
+
+@patch("purchasing_manager.application.adapters.client.ClientRepository.bulk_create")
+def test_bulk_create_must_return_invalid_for_the_clients_with_attributes_of_the_wrong_type(mock_bulk_create, app):
+    clients = generate_clients_objects(2)
+    payload = _bulk_payload(clients)
+    payload.insert(1, dict(payload[1], full_name=123))
+    payload.append("xpto")
+    mock_bulk_create.side_effect = lambda new_clients, batch_size: []
+
+    response, status = ClientUseCases().bulk_create(payload)
+
+    assert HTTPStatus.OK == status
+    assert (2, 0, 2) == (response["created"], response["duplicated"], response["invalid"])
+    assert ["created", "invalid", "created", "invalid"] == [result["status"] for result in response["results"]]
+    assert "The following attribute must be a string: 'full_name'" == response["results"][1]["message"]
+
+
+@pytest.mark.parametrize("payload", [dict(full_name="Ciclano"), "xpto"])
+@patch("purchasing_manager.application.adapters.client.ClientRepository.bulk_create")
+def test_bulk_create_must_return_bad_request_when_payload_is_not_a_list(mock_bulk_create, app, payload):
+    expected_response = dict(message="The payload must be a list of clients"), HTTPStatus.BAD_REQUEST
+
+    response = ClientUseCases().bulk_create(payload)
+
+    mock_bulk_create.assert_not_called()
+    assert expected_response == response
+
+
+@patch("purchasing_manager.application.adapters.client.ClientRepository.bulk_create")
+def test_bulk_create_must_return_bad_request_when_payload_is_too_large(mock_bulk_create, app):
+    app.config["CLIENT_BULK_MAX_ITEMS"] = 2
+    expected_response = dict(message="The payload can't have more than 2 clients"), HTTPStatus.BAD_REQUEST
+
+    response = ClientUseCases().bulk_create(_bulk_payload(generate_clients_objects(3)))
+
+    mock_bulk_create.assert_not_called()
+    assert expected_response == response
+
+
+def _csv_file(rows):
+    lines = ["full_name,document,phone,email", *(",".join(row) for row in rows)]
+    return io.StringIO("\n".join(lines) + "\n")
+
+
+@patch("purchasing_manager.application.adapters.client.ClientRepository.bulk_create")
+def test_import_csv_must_return_a_summary_with_line_numbers(mock_bulk_create, app):
+    clients = generate_clients_objects(4)
+    rows = [[client.name, client.document, client.phone, client.email] for client in clients]
+    rows.insert(1, ["Ciclano", "12345678900", "", "ciclano@example.com"])
+    rows.append(rows[0])
+    stored_documents = set()
+
+    def _bulk_create(new_clients, batch_size):
+        duplicates = [client for client in new_clients if client.document in stored_documents | {clients[3].document}]
+        stored_documents.update(client.document for client in new_clients)
+        return duplicates
+
+    mock_bulk_create.side_effect = _bulk_create
+
+    response, status = ClientUseCases().import_csv(_csv_file(rows), chunk_size=3)
+
+    chunks = [[client.document for client in call.args[0]] for call in mock_bulk_create.call_args_list]
+
+    assert HTTPStatus.OK == status
+    assert [
+        [clients[0].document, clients[1].document],
+        [clients[2].document, clients[3].document, clients[0].document],
+    ] == chunks
+    assert (3, 2, 1) == (response["inserted"], response["duplicated"], response["invalid"])
+    assert [
+        dict(line=3, status="invalid", message="Missing the following attribute: 'phone'"),
+        dict(line=6, status="duplicated", message="User already added in database"),
+        dict(line=7, status="duplicated", message="User already added in database"),
+    ] == response["errors"]
+
+
+@patch("purchasing_manager.application.adapters.client.ClientRepository.bulk_create")
+def test_import_csv_must_limit_the_reported_errors(mock_bulk_create, app):
+    app.config["CLIENT_IMPORT_MAX_REPORTED_ERRORS"] = 1
+    mock_bulk_create.return_value = []
+
+    response, _ = ClientUseCases().import_csv(_csv_file([["Ciclano"], ["Beltrano"]]))
+
+    assert 2 == response["invalid"]
+    assert [2] == [error["line"] for error in response["errors"]]
+
+
+@patch("purchasing_manager.application.adapters.client.ClientRepository.bulk_create")
+def test_import_csv_must_return_bad_request_when_columns_are_missing(mock_bulk_create, app):
+    expected_response = dict(message="Missing the following columns: phone, email"), HTTPStatus.BAD_REQUEST
+
+    response = ClientUseCases().import_csv(io.StringIO("full_name,document\nCiclano,12345678900\n"))
+
+    mock_bulk_create.assert_not_called()
+    assert expected_response == response
+
+
+@patch("purchasing_manager.application.adapters.client.ClientRepository.upsert")
+def test_upsert_must_return_the_upserted_client(mock_upsert):
+    client = generate_clients_objects(1)[0]
+    mock_upsert.return_value = client
+    kwargs = dict(full_name=client.name, phone=client.phone, email=client.email)
+
+    response = ClientUseCases().upsert(client.document, **kwargs)
+
+    sent_client = mock_upsert.call_args.args[0]
+
+    assert client.dict == json.loads(response)
+    assert (client.name.title(), client.document) == (sent_client.name, sent_client.document)
+
+
+@patch("purchasing_manager.application.adapters.client.ClientRepository.upsert")
+def test_upsert_must_return_bad_request_when_some_attribute_is_missing(mock_upsert):
+    expected_response = dict(message="Missing the following attribute: 'phone'"), HTTPStatus.BAD_REQUEST
+
+    response = ClientUseCases().upsert("12345678900", full_name="Ciclano")
+
+    mock_upsert.assert_not_called()
+    assert expected_response == response
+
+
+@patch("purchasing_manager.application.adapters.client.ClientRepository.bulk_upsert")
+def test_bulk_upsert_must_return_the_result_of_each_client(mock_bulk_upsert, app):
+    clients = generate_clients_objects(2)
+    payload = _bulk_payload(clients)
+    payload.append(dict(payload[0], full_name="Ciclano"))
+    payload.append(dict(full_name="Beltrano"))
+
+    response, status = ClientUseCases().bulk_upsert(payload)
+
+    upserted_clients = mock_bulk_upsert.call_args.args[0]
+
+    assert HTTPStatus.OK == status
+    assert (3, 1) == (response["upserted"], response["invalid"])
+    assert ["upserted", "upserted", "upserted", "invalid"] == [result["status"] for result in response["results"]]
+    assert [clients[0].document, clients[1].document] == [client.document for client in upserted_clients]
+    assert "Ciclano" == upserted_clients[0].name
+
+
+@patch("purchasing_manager.application.adapters.client.ClientRepository.bulk_upsert")
+def test_bulk_upsert_must_return_invalid_for_the_clients_with_attributes_of_the_wrong_type(mock_bulk_upsert, app):
+    clients = generate_clients_objects(2)
+    payload = _bulk_payload(clients)
+    payload.insert(1, dict(payload[1], document="12345678900", phone=11999887766))
+    payload.append(["xpto"])
+
+    response, status = ClientUseCases().bulk_upsert(payload)
+
+    assert HTTPStatus.OK == status
+    assert (2, 2) == (response["upserted"], response["invalid"])
+    assert ["upserted", "invalid", "upserted", "invalid"] == [result["status"] for result in response["results"]]
+    assert "The following attribute must be a string: 'phone'" == response["results"][1]["message"]
+    assert [client.document for client in clients] == [client.document for client in mock_bulk_upsert.call_args.args[0]]
+
+
+@patch("purchasing_manager.application.adapters.client.ClientRepository.upsert")
+def test_upsert_must_return_bad_request_when_some_attribute_is_not_a_string(mock_upsert):
+    expected_response = dict(message="The following attribute must be a string: 'full_name'"), HTTPStatus.BAD_REQUEST
+
+    response = ClientUseCases().upsert("12345678900", full_name=123, phone="11999887766", email="test@example.com")
+
+    mock_upsert.assert_not_called()
+    assert expected_response == response
+
+
+@patch("purchasing_manager.application.adapters.client.ClientRepository.bulk_upsert")
+def test_bulk_upsert_must_return_bad_request_when_payload_is_not_a_list(mock_bulk_upsert, app):
+    expected_response = dict(message="The payload must be a list of clients"), HTTPStatus.BAD_REQUEST
+
+    response = ClientUseCases().bulk_upsert({})
+
+    mock_bulk_upsert.assert_not_called()
+    assert expected_response == response
+
+
 @patch("purchasing_manager.application.use_cases.client.ClientUseCases._get_attribute_or_raise_exception")
 def test_create_client_must_return_a_valid_client_object(mock_get_attr):
     mock_get_attr.return_value = "test"
@@ -180,6 +640,16 @@ def test_get_attribute_raises_exception(kwargs):
     assert message == str(e.value)
 
 
+@pytest.mark.parametrize("value", [123, None, ["Ciclano"], dict(name="Ciclano")])
+def test_get_attribute_raises_exception_when_attribute_is_not_a_string(value):
+    message = "The following attribute must be a string: 'full_name'"
+
+    with pytest.raises(InvalidAttributeException) as e:
+        ClientUseCases._get_attribute_or_raise_exception("full_name", full_name=value)
+
+    assert message == str(e.value)
+
+
 @pytest.mark.parametrize(
     "kwargs",
     [
@@ -202,7 +672,7 @@ def test_update_must_update_success_and_return_dict(mock_update, mock_delete_fie
     mock_get_attr.assert_called_once_with("id", **default_kwargs)
     mock_delete_fields.assert_called_once_with(*["created_dt", "updated_dt", "document"], **default_kwargs)
     mock_update.assert_called_once()
-    assert client.dict == response
+    assert client.dict == json.loads(response)
 
 
 @patch("purchasing_manager.application.use_cases.client.ClientUseCases._get_attribute_or_raise_exception")
@@ -301,3 +771,31 @@ def test_delete_must_raise_exception_when_some_unknown_exception_is_raise(mock_d
 
     mock_delete.assert_called_once_with("test")
     assert message == str(e.value)
+
+
+@patch("purchasing_manager.application.adapters.client.ClientRepository.bulk_delete")
+def test_bulk_delete_must_return_the_number_of_deleted_clients(mock_bulk_delete, app):
+    mock_bulk_delete.return_value = 1
+    expected_response = dict(deleted=1, not_found=1), HTTPStatus.OK
+
+    response = ClientUseCases().bulk_delete(["foo", "bar", "foo"])
+
+    mock_bulk_delete.assert_called_once_with(["foo", "bar"])
+    assert expected_response == response
+
+
+@pytest.mark.parametrize(
+    ["payload", "message"],
+    [
+        [dict(id="foo"), "The payload must be a list of clients"],
+        [["foo", 1], "The payload must be a list of client ids"],
+    ],
+)
+@patch("purchasing_manager.application.adapters.client.ClientRepository.bulk_delete")
+def test_bulk_delete_must_return_bad_request_when_payload_is_invalid(mock_bulk_delete, app, payload, message):
+    expected_response = dict(message=message), HTTPStatus.BAD_REQUEST
+
+    response = ClientUseCases().bulk_delete(payload)
+
+    mock_bulk_delete.assert_not_called()
+    assert expected_response == response
@@ -0,0 +1,25 @@
+from unittest.mock import Mock
+
+import pytest
+
+from purchasing_manager.domain.ports.cache import CacheBackendABC
+
+
+def test_get_many_must_raises_exception():
+    with pytest.raises(NotImplementedError):
+        CacheBackendABC().get_many(Mock())
+
+
+def test_set_must_raises_exception():
+    with pytest.raises(NotImplementedError):
+        CacheBackendABC().set(Mock(), Mock(), Mock())
+
+
+def test_delete_must_raises_exception():
+    with pytest.raises(NotImplementedError):
+        CacheBackendABC().delete(Mock())
+
+
+def test_incr_must_raises_exception():
+    with pytest.raises(NotImplementedError):
+        CacheBackendABC().incr(Mock(), Mock())
@@ -10,16 +10,51 @@ def test_list_must_raises_exception():
         ClientRepositoryABC.list()
 
 
+def test_list_by_cursor_must_raises_exception():
+    with pytest.raises(NotImplementedError):
+        ClientRepositoryABC.list_by_cursor()
+
+
+def test_count_must_raises_exception():
+    with pytest.raises(NotImplementedError):
+        ClientRepositoryABC.count()
+
+
+def test_stream_must_raises_exception():
+    with pytest.raises(NotImplementedError):
+        ClientRepositoryABC.stream()
+
+
 def test_retrieve_must_raises_exception():
     with pytest.raises(NotImplementedError):
         ClientRepositoryABC.retrieve(Mock())
 
 
+def test_version_must_raises_exception():
+    with pytest.raises(NotImplementedError):
+        ClientRepositoryABC.version(Mock())
+
+
 def test_create_must_raises_exception():
     with pytest.raises(NotImplementedError):
         ClientRepositoryABC.create(Mock())
 
 
+def test_bulk_create_must_raises_exception():
+    with pytest.raises(NotImplementedError):
+        ClientRepositoryABC.bulk_create(Mock())
+
+
+def test_upsert_must_raises_exception():
+    with pytest.raises(NotImplementedError):
+        ClientRepositoryABC.upsert(Mock())
+
+
+def test_bulk_upsert_must_raises_exception():
+    with pytest.raises(NotImplementedError):
+        ClientRepositoryABC.bulk_upsert(Mock())
+
+
 def test_update_must_raises_exception():
     with pytest.raises(NotImplementedError):
         ClientRepositoryABC.update(Mock())
@@ -28,3 +63,8 @@ def test_update_must_raises_exception():
 def test_delete_must_raises_exception():
     with pytest.raises(NotImplementedError):
         ClientRepositoryABC.delete(Mock())
+
+
+def test_bulk_delete_must_raises_exception():
+    with pytest.raises(NotImplementedError):
+        ClientRepositoryABC.bulk_delete(Mock())
@@ -0,0 +1,46 @@
+import os
+
+from purchasing_manager import create_app, create_asgi_app
+from purchasing_manager.config import BaseConfig
+
+
+def _rules(app) -> set[str]:
+    return {rule.rule for rule in app.url_map.iter_rules()}
+
+
+def test_create_app_must_not_register_migrate_outside_the_cli(monkeypatch):
+    os.environ["DEPLOY_ENV"] = "Testing"
+    monkeypatch.delenv("FLASK_RUN_FROM_CLI", raising=False)
+
+    assert "migrate" not in create_app().extensions
+
+
+def test_create_app_must_register_migrate_in_the_cli(monkeypatch):
+    os.environ["DEPLOY_ENV"] = "Testing"
+    monkeypatch.setenv("FLASK_RUN_FROM_CLI", "true")
+
+    assert "migrate" in create_app().extensions
+
+
+def test_create_app_must_register_migrate_without_lazy_startup(monkeypatch):
+    os.environ["DEPLOY_ENV"] = "Testing"
+    monkeypatch.delenv("FLASK_RUN_FROM_CLI", raising=False)
+    monkeypatch.setattr(BaseConfig, "LAZY_STARTUP", False)
+
+    assert "migrate" in create_app().extensions
+
+
+def test_create_app_must_register_the_apis_and_their_docs():
+    os.environ["DEPLOY_ENV"] = "Testing"
+
+    rules = _rules(create_app())
+
+    assert {"/api/client", "/api/docs/swagger", "/api/client/docs/swagger", "/api/swagger.json"} <= rules
+
+
+def test_create_asgi_app_must_not_register_the_apis():
+    os.environ["DEPLOY_ENV"] = "Testing"
+
+    rules = _rules(create_asgi_app().app)
+
+    assert not any(rule.startswith("/api") for rule in rules)
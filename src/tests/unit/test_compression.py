@@ -0,0 +1,119 @@
+import gzip
+import zlib
+
+import pytest
+from flask import Response
+
+from purchasing_manager.compression import (
+    COMPRESSORS,
+    GzipCompressor,
+    ResponseCompression,
+    compress_chunks,
+    create_compression,
+)
+
+CONFIG = dict(
+    COMPRESSION_ENABLED=True,
+    COMPRESSION_MIN_SIZE=100,
+    COMPRESSION_GZIP_LEVEL=6,
+    COMPRESSION_BROTLI_LEVEL=4,
+    COMPRESSION_ZSTD_LEVEL=3,
+)
+
+
+@pytest.fixture
+def compression():
+    return ResponseCompression({"br": (GzipCompressor, 6), "gzip": (GzipCompressor, 6)}, min_size=100)
+
+
+@pytest.mark.parametrize(
+    ["accept_encoding", "encoding"],
+    [
+        ["gzip, br", "br"],
+        ["gzip;q=1, br;q=0.5", "gzip"],
+        ["br;q=0, *", "gzip"],
+        ["identity", None],
+        ["", None],
+        [None, None],
+    ],
+)
+def test_negotiate_must_prefer_the_client_quality_and_then_the_server_order(compression, accept_encoding, encoding):
+    assert encoding == compression.negotiate(accept_encoding)
+
+
+def test_start_must_skip_bodies_smaller_than_the_min_size(compression):
+    headers = {"Content-Type": "application/json"}
+
+    assert compression.start(200, headers, "gzip", 99) is None
+    assert {"Content-Type": "application/json", "Vary": "Accept-Encoding"} == headers
+
+
+@pytest.mark.parametrize(
+    ["status", "headers"],
+    [
+        [200, {"Content-Type": "image/png"}],
+        [200, {"Content-Type": "application/json", "Content-Encoding": "gzip"}],
+        [304, {"Content-Type": "application/json"}],
+    ],
+)
+def test_start_must_skip_the_responses_which_are_not_compressible(compression, status, headers):
+    assert compression.start(status, dict(headers), "gzip", 1000) is None
+
+
+def test_start_must_set_the_encoding_headers_and_weaken_the_etag(compression):
+    headers = {"Content-Type": "application/json", "Content-Length": "1000", "ETag": '"foo"', "Vary": "Origin"}
+
+    compressor = compression.start(200, headers, "gzip", 1000)
+
+    assert isinstance(compressor, GzipCompressor)
+    assert dict(headers) == {
+        "Content-Type": "application/json",
+        "ETag": 'W/"foo"',
+        "Vary": "Origin, Accept-Encoding",
+        "Content-Encoding": "gzip",
+    }
+
+
+def test_compress_chunks_must_flush_each_chunk_so_it_can_be_decoded_right_away():
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    chunks = compress_chunks(GzipCompressor(6), iter(["foo\n", b"bar\n"]))
+
+    decoded = [decompressor.decompress(next(chunks)), decompressor.decompress(next(chunks))]
+    decompressor.decompress(next(chunks))
+
+    assert [b"foo\n", b"bar\n"] == decoded
+    assert decompressor.eof
+
+
+def test_process_response_must_compress_whole_and_streamed_responses(compression):
+    body = b'{"name": "Fulano"}' * 100
+    response = compression.process_response(Response(body, mimetype="application/json"), "gzip")
+    streamed = compression.process_response(Response(iter([body, body]), mimetype="application/x-ndjson"), "gzip")
+
+    assert "gzip" == response.headers["Content-Encoding"]
+    assert body == gzip.decompress(response.get_data())
+    assert len(response.get_data()) == int(response.headers["Content-Length"])
+    assert "Content-Length" not in streamed.headers
+    assert body * 2 == gzip.decompress(b"".join(streamed.response))
+
+
+def test_create_compression_must_only_offer_the_installed_encodings_when_enabled():
+    enabled = create_compression(CONFIG)
+    disabled = create_compression({**CONFIG, "COMPRESSION_ENABLED": False})
+
+    assert list(COMPRESSORS) == list(enabled.encodings)
+    assert (GzipCompressor, 6) == enabled.encodings["gzip"]
+    assert disabled.negotiate("gzip") is None
+
+
+@pytest.mark.parametrize(["encoding", "module"], [["br", "brotli"], ["zstd", "zstandard"]])
+def test_compressors_must_stream_the_optional_encodings(encoding, module):
+    library = pytest.importorskip(module)
+    compressor = COMPRESSORS[encoding][0](3)
+
+    data = b"".join(compress_chunks(compressor, iter([b"foo\n" * 100, b"bar\n" * 100])))
+
+    if encoding == "br":
+        assert b"foo\n" * 100 + b"bar\n" * 100 == library.decompress(data)
+    else:
+        assert b"foo\n" * 100 + b"bar\n" * 100 == library.ZstdDecompressor().decompressobj().decompress(data)
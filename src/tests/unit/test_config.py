@@ -4,10 +4,20 @@ from unittest.mock import Mock
 import pytest
 
 from purchasing_manager.application.exceptions import ConfigurationNotValid
-from purchasing_manager.config import set_app_config
+from purchasing_manager.config import _engine_options, set_app_config
 
 
 def test_app_config_must_raises_exception_when_mode_is_not_found():
     with pytest.raises(ConfigurationNotValid):
         os.environ["DEPLOY_ENV"] = "Xpto"
         set_app_config(Mock())
+
+
+def test_engine_options_must_be_overridden_by_env(monkeypatch):
+    monkeypatch.setenv("SQLALCHEMY_POOL_SIZE", "20")
+    monkeypatch.setenv("SQLALCHEMY_POOL_PRE_PING", "false")
+    monkeypatch.setenv("SQLALCHEMY_POOL_TIMEOUT", "2.5")
+
+    options = _engine_options(pool_size=5, pool_pre_ping=True, pool_recycle=1800)
+
+    assert dict(pool_size=20, pool_pre_ping=False, pool_timeout=2.5, pool_recycle=1800) == options
@@ -0,0 +1,122 @@
+import io
+import logging
+from unittest.mock import Mock, patch
+
+import pytest
+from flask import Flask, g
+
+from purchasing_manager.config import _route_rates
+from purchasing_manager.logs import (
+    LazyPropsFilter,
+    LogPipeline,
+    RequestLogSampler,
+    SampledRequestFilter,
+)
+
+
+@pytest.fixture
+def pipeline():
+    pipeline = LogPipeline(io.StringIO())
+
+    yield pipeline
+
+    pipeline.stop()
+
+
+def _logger(name: str, handler: logging.Handler, level: int = logging.INFO) -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(level)
+
+    return logger
+
+
+def test_pipeline_must_write_the_formatted_records_from_the_listener_thread(pipeline):
+    logger = _logger("test-pipeline", pipeline.handler(logging.Formatter("%(levelname)s %(message)s %(table)s")))
+    pipeline.start()
+
+    logger.info("Hello %s", "world", extra={"table": "client"})
+    pipeline.stop()
+
+    assert "INFO Hello world client\n" == pipeline.stream.getvalue()
+
+
+def test_pipeline_must_start_a_new_listener_after_a_fork(pipeline):
+    logger = _logger("test-pipeline-fork", pipeline.handler(logging.Formatter("%(message)s")))
+    pipeline.start()
+    old_queue = pipeline.queue
+
+    pipeline._restart_after_fork()
+    logger.info("after fork")
+    pipeline.stop()
+
+    assert pipeline.queue is not old_queue
+    assert pipeline.handlers[0].queue is pipeline.queue
+    assert "after fork\n" == pipeline.stream.getvalue()
+
+
+def test_lazy_props_must_only_be_built_for_emitted_records():
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter("%(message)s %(props)s"))
+    handler.addFilter(LazyPropsFilter())
+    logger = _logger("test-lazy-props", handler, level=logging.WARNING)
+    props = Mock(return_value={"table": "client"})
+
+    logger.info("filtered out", extra={"props": props})
+    props.assert_not_called()
+
+    logger.warning("emitted", extra={"props": props})
+    props.assert_called_once_with()
+    assert "emitted {'table': 'client'}\n" == stream.getvalue()
+
+
+@pytest.mark.parametrize(
+    ["random_value", "route", "expected"],
+    [[0.5, "/api/client", False], [0.05, "/api/client", True], [0.99, "/api/healthz", True]],
+)
+def test_sampler_must_use_the_rate_of_the_route(random_value, route, expected):
+    sampler = RequestLogSampler(1.0, {"/api/client": 0.1})
+
+    with patch("purchasing_manager.logs.random.random", return_value=random_value):
+        assert expected == sampler.sample(route)
+
+
+def test_sampled_request_filter_must_drop_the_records_of_requests_out_of_the_sample():
+    record = logging.LogRecord("request", logging.INFO, __file__, 1, "request", None, None)
+
+    with Flask(__name__).test_request_context():
+        g.log_sampled = False
+        assert not SampledRequestFilter().filter(record)
+
+    assert SampledRequestFilter().filter(record)
+
+
+def test_route_rates_must_parse_the_rate_of_each_route():
+    assert {"/api/client": 0.01, "/api/client/<uuid:id>": 0.5} == _route_rates(
+        "/api/client=0.01, /api/client/<uuid:id>=0.5"
+    )
+
+
+@patch("purchasing_manager.logger")
+def test_request_logs_must_follow_the_sample_except_for_server_errors(mock_logger, app, api_client):
+    app.extensions["request_log_sampler"].rate = 0
+
+    api_client.get("/api/healthz")
+    mock_logger.info.assert_not_called()
+
+    with patch("purchasing_manager.presentation.views.api.Index.get", side_effect=Exception("Oh no")):
+        api_client.get("/api/healthz")
+
+    assert ["Request response"] == [call.args[0] for call in mock_logger.info.call_args_list]
+
+
+@patch("purchasing_manager.logger")
+def test_response_log_must_have_the_database_time_and_statements(mock_logger, api_client):
+    api_client.get("/api/client")
+
+    props = mock_logger.info.call_args.kwargs["extra"]["props"]
+
+    assert 1 == props["db_statements"]
+    assert props["db_time_ms"] >= 0
@@ -0,0 +1,177 @@
+import json
+import os
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from purchasing_manager import db
+from purchasing_manager.metrics import (
+    MetricsRegistry,
+    RequestStats,
+    current_request_stats,
+    instrument_engines,
+    server_timing,
+    start_request_stats,
+)
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+def test_registry_must_render_counters_and_gauges_in_the_prometheus_format(registry):
+    requests = registry.counter("requests_total", "Requests", ["route"])
+    in_flight = registry.gauge("in_flight", "In flight")
+
+    requests.inc(route="/a")
+    requests.inc(2, route='/b"\n')
+    in_flight.inc()
+    in_flight.inc()
+    in_flight.dec()
+
+    assert (
+        "# HELP in_flight In flight\n"
+        "# TYPE in_flight gauge\n"
+        "in_flight 1\n"
+        "# HELP requests_total Requests\n"
+        "# TYPE requests_total counter\n"
+        'requests_total{route="/a"} 1\n'
+        'requests_total{route="/b\\"\\n"} 2\n'
+    ) == registry.render()
+
+
+def test_histogram_must_render_cumulative_buckets_sum_and_count(registry):
+    latency = registry.histogram("latency_seconds", "Latency", ["route"], buckets=(0.1, 1.0, float("inf")))
+
+    for value in (0.05, 0.5, 0.7, 3.0):
+        latency.observe(value, route="/a")
+
+    assert [
+        'latency_seconds_bucket{route="/a",le="0.1"} 1',
+        'latency_seconds_bucket{route="/a",le="1.0"} 3',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+        'latency_seconds_sum{route="/a"} 4.25',
+        'latency_seconds_count{route="/a"} 4',
+    ] == registry.render().splitlines()[2:]
+
+
+def test_registry_must_not_register_the_same_metric_twice(registry):
+    registry.counter("requests_total", "Requests")
+
+    with pytest.raises(ValueError):
+        registry.gauge("requests_total", "Requests")
+
+
+def test_registry_must_merge_the_snapshots_of_every_process(tmp_path):
+    def _process_registry(requests: int, in_flight: int) -> MetricsRegistry:
+        registry = MetricsRegistry(str(tmp_path))
+        registry.counter("requests_total", "Requests").inc(requests)
+        registry.gauge("in_flight", "In flight").inc(in_flight)
+        registry.histogram("latency_seconds", "Latency", buckets=(1.0, float("inf"))).observe(0.5)
+
+        return registry
+
+    dead_worker = _process_registry(requests=2, in_flight=5)
+    dead_worker.flush()
+    os.replace(tmp_path / f"{os.getpid()}.json", tmp_path / "999999999.json")
+
+    rendered = _process_registry(requests=3, in_flight=1).render()
+
+    assert "requests_total 5" in rendered
+    assert "in_flight 1" in rendered
+    assert 'latency_seconds_bucket{le="1.0"} 2' in rendered
+    assert "latency_seconds_count 2" in rendered
+
+
+def test_registry_must_flush_at_most_once_per_interval(tmp_path):
+    registry = MetricsRegistry(str(tmp_path), flush_interval=60)
+    counter = registry.counter("requests_total", "Requests")
+
+    registry.maybe_flush()
+    counter.inc()
+    registry.maybe_flush()
+
+    assert '"samples": []' in (tmp_path / f"{os.getpid()}.json").read_text()
+
+
+def test_registry_must_write_whole_snapshots_when_threads_flush_at_once(tmp_path):
+    registry = MetricsRegistry(str(tmp_path))
+    counter = registry.counter("requests_total", "Requests", ["route"])
+    errors = []
+
+    def flush():
+        try:
+            for index in range(50):
+                counter.inc(route=f"/{index}")
+                registry.flush()
+                json.loads((tmp_path / f"{os.getpid()}.json").read_text())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=flush) for _ in range(4)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert [] == errors
+    assert [f"{os.getpid()}.json"] == [path.name for path in tmp_path.iterdir()]
+
+
+def test_registry_must_flush_without_requests(tmp_path):
+    registry = MetricsRegistry(str(tmp_path), flush_interval=0.05)
+    counter = registry.counter("requests_total", "Requests")
+
+    registry.maybe_flush()
+    counter.inc()
+    time.sleep(0.3)
+
+    assert "requests_total 1" in registry.render()
+    assert [[[], 1]] == json.loads((tmp_path / f"{os.getpid()}.json").read_text())["requests_total"]["samples"]
+
+
+def test_request_stats_must_sum_the_statements_of_the_request(app):
+    stats = start_request_stats()
+
+    db.session.execute("SELECT 1")
+    db.session.execute("SELECT 2")
+
+    assert stats is current_request_stats()
+    assert 2 == stats.statements
+    assert stats.db_time > 0
+
+
+def test_server_timing_must_return_the_db_time_statements_and_total_time():
+    stats = RequestStats()
+    stats.db_time = 0.0123
+    stats.statements = 3
+
+    assert 'db;dur=12.30;desc="statements: 3", total;dur=45.60' == server_timing(stats, 0.0456)
+
+
+@patch("purchasing_manager.metrics.slow_query_logger")
+def test_slow_queries_must_be_logged_with_redacted_parameters(slow_query_logger, app):
+    instrument_engines(0)
+
+    try:
+        db.session.execute("SELECT :document, :age", {"document": "12345678900", "age": 30})
+    finally:
+        instrument_engines(app.config["SLOW_QUERY_THRESHOLD"])
+
+    props = slow_query_logger.warning.call_args.kwargs["extra"]["props"]
+
+    assert "SELECT ?, ?" == props["statement"]
+    assert ["str", "int"] == props["parameters"]
+    assert "12345678900" not in str(props)
+
+
+@patch("purchasing_manager.metrics.slow_query_logger")
+def test_fast_queries_must_not_be_logged(slow_query_logger, app):
+    db.session.execute("SELECT 1")
+
+    slow_query_logger.warning.assert_not_called()
@@ -0,0 +1,98 @@
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import insert
+
+from purchasing_manager import create_app, db
+from purchasing_manager.application.adapters.client import ClientRepository
+from purchasing_manager.application.exceptions import DatabaseException
+from purchasing_manager.config import TestingConfig
+from purchasing_manager.domain.models.client import Client
+from purchasing_manager.routing import use_primary
+from tests.doubles.stub import generate_clients_objects
+
+DATABASES = ["primary", "replica_0", "replica_1"]
+
+
+@pytest.fixture
+def replica_app(tmp_path, monkeypatch):
+    os.environ["DEPLOY_ENV"] = "Testing"
+    monkeypatch.setattr(TestingConfig, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'primary.db'}")
+    monkeypatch.setattr(
+        TestingConfig,
+        "SQLALCHEMY_REPLICA_URIS",
+        [f"sqlite:///{tmp_path / 'replica_0.db'}", f"sqlite:///{tmp_path / 'replica_1.db'}"],
+    )
+
+    app = create_app()
+    app.app_context().push()
+
+    # Each database gets one client named after it, so the tests can tell which one answered a read
+    for bind, client in zip([None, "replica_0", "replica_1"], generate_clients_objects(3)):
+        engine = db.get_engine(app, bind=bind)
+        Client.metadata.create_all(engine)
+
+        with engine.begin() as connection:
+            values = {column.name: getattr(client, column.name) for column in Client.__table__.columns}
+            connection.execute(insert(Client.__table__), {**values, "name": bind or "primary"})
+
+    yield app
+
+    db.session.remove()
+
+
+def _read() -> str:
+    names = [client.name for client in ClientRepository.list()]
+    db.session.remove()
+
+    return names[0]
+
+
+def test_reads_must_go_to_the_replicas_in_round_robin(replica_app):
+    assert ["replica_0", "replica_1", "replica_0"] == [_read() for _ in range(3)]
+
+
+def test_reads_after_a_write_must_stay_on_the_primary(replica_app):
+    ClientRepository.create(generate_clients_objects(1)[0])
+
+    assert ["primary"] == [client.name for client in ClientRepository.list(limit=1)]
+
+
+def test_use_primary_must_send_reads_to_the_primary(replica_app):
+    use_primary()
+
+    assert "primary" == _read()
+
+
+def test_force_primary_header_must_send_reads_to_the_primary(replica_app):
+    with replica_app.test_request_context(headers={"X-Read-From-Primary": "true"}):
+        replica_app.preprocess_request()
+
+        assert ["primary"] == [client.name for client in ClientRepository.list()]
+
+
+def test_unhealthy_replica_must_be_skipped_until_retry_after(replica_app, tmp_path):
+    replica_app.config["SQLALCHEMY_BINDS"]["replica_0"] = f"sqlite:///{tmp_path / 'missing' / 'replica_0.db'}"
+
+    with pytest.raises(DatabaseException):
+        _read()
+
+    db.session.remove()
+    assert ["replica_1", "replica_1"] == [_read() for _ in range(2)]
+
+    retry_at = replica_app.config["SQLALCHEMY_REPLICA_RETRY_AFTER"] + 1
+
+    with patch("time.monotonic", return_value=time.monotonic() + retry_at):
+        with pytest.raises(DatabaseException):
+            _read()
+
+
+def test_reads_must_go_to_the_primary_when_every_replica_is_unhealthy(replica_app):
+    router = replica_app.extensions["replica_router"]
+
+    for bind_key in router.bind_keys:
+        router.mark_unhealthy(bind_key)
+
+    assert "primary" == _read()
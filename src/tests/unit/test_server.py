@@ -0,0 +1,72 @@
+import os
+from unittest.mock import Mock
+
+import pytest
+
+from purchasing_manager import db
+from purchasing_manager.application.exceptions import ConfigurationNotValid
+from purchasing_manager.server import (
+    clear_metrics_directory,
+    dispose_engines,
+    gunicorn_settings,
+    worker_exit,
+)
+
+
+def test_gunicorn_settings_must_derive_the_gthread_workers_from_the_cpus():
+    settings = gunicorn_settings({}, cpus=4)
+
+    assert ("gthread", 9, 4) == (settings["worker_class"], settings["workers"], settings["threads"])
+    assert (True, 10000, 1000) == (settings["preload_app"], settings["max_requests"], settings["max_requests_jitter"])
+
+
+def test_gunicorn_settings_must_run_one_gevent_worker_by_cpu():
+    settings = gunicorn_settings(dict(SERVER_WORKER_CLASS="gevent"), cpus=4)
+
+    assert ("gevent", 4, 1, 100) == (
+        settings["worker_class"],
+        settings["workers"],
+        settings["threads"],
+        settings["worker_connections"],
+    )
+
+
+def test_gunicorn_settings_must_be_overridden_by_env():
+    environ = dict(SERVER_BIND="127.0.0.1:8000", SERVER_WORKERS="3", SERVER_THREADS="8", SERVER_MAX_REQUESTS="500")
+
+    settings = gunicorn_settings(environ, cpus=4)
+
+    assert ("127.0.0.1:8000", 3, 8) == (settings["bind"], settings["workers"], settings["threads"])
+    assert (500, 50) == (settings["max_requests"], settings["max_requests_jitter"])
+
+
+def test_gunicorn_settings_must_raise_exception_when_worker_class_is_not_supported():
+    with pytest.raises(ConfigurationNotValid):
+        gunicorn_settings(dict(SERVER_WORKER_CLASS="eventlet"), cpus=4)
+
+
+def test_dispose_engines_must_recreate_the_pool(app):
+    pool = db.engine.pool
+
+    dispose_engines(app)
+
+    assert pool is not db.engine.pool
+
+
+def test_clear_metrics_directory_must_remove_the_snapshots(tmp_path):
+    directory = tmp_path / "metrics"
+    directory.mkdir()
+    (directory / "123.json").write_text("{}")
+
+    clear_metrics_directory(str(directory))
+
+    assert [] == list(directory.iterdir())
+
+
+def test_worker_exit_must_flush_the_metrics(app, tmp_path):
+    app.extensions["metrics"].directory = str(tmp_path)
+    server = Mock(app=Mock(wsgi=Mock(return_value=app)))
+
+    worker_exit(server, Mock())
+
+    assert (tmp_path / f"{os.getpid()}.json").exists()